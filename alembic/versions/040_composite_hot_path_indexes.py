@@ -0,0 +1,85 @@
+"""Composite indexes for hot query shapes (merges open heads)
+
+Revision ID: 040_composite_indexes
+Revises: 031_add_notification_devices, 039_attendance_reminder_audit, 9f06d62572a7
+Create Date: 2026-10-16
+
+Multi-column indexes matching the filters used by punch in/out, the pending
+approval queue, subordinate lookups, holiday ranges, comp-off credits, WFH
+lookups, device fan-out and audit history. Where a query always filters on one
+status value the PostgreSQL index is partial (WHERE ...); SQLite gets the full
+index. ix_notification_devices_user_id is replaced by (user_id, is_active).
+
+Run: alembic upgrade head
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision: str = "040_composite_indexes"
+down_revision: Union[str, None] = (
+    "031_add_notification_devices",
+    "039_attendance_reminder_audit",
+    "9f06d62572a7",
+)
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns, PostgreSQL partial-index predicate or None)
+INDEXES = [
+    ("ix_attendance_sessions_employee_date_status", "attendance_sessions", ["employee_id", "work_date", "status"], None),
+    ("ix_leave_requests_status_applied_at", "leave_requests", ["status", "applied_at"], "status = 'PENDING'"),
+    ("ix_employees_manager_active", "employees", ["reporting_manager_id", "active"], "active = true"),
+    ("ix_holidays_active_date", "holidays", ["active", "date"], None),
+    ("ix_compoff_ledger_employee_type_expires", "compoff_ledger", ["employee_id", "entry_type", "expires_on"], None),
+    ("ix_wfh_requests_employee_status_date", "wfh_requests", ["employee_id", "status", "request_date"], None),
+    ("ix_notification_devices_user_active", "notification_devices", ["user_id", "is_active"], "is_active = true"),
+    ("ix_audit_logs_entity", "audit_logs", ["entity_type", "entity_id", "created_at"], None),
+]
+
+# Single-column index made redundant by a composite above (same leading column)
+REPLACED_INDEXES = [
+    ("ix_notification_devices_user_id", "notification_devices", ["user_id"]),
+]
+
+
+def _schema(bind):
+    # For SQLite, schema is None; for PostgreSQL, use default schema
+    return None if bind.engine.name == "sqlite" else "public"
+
+
+def table_exists(bind, table_name):
+    return inspect(bind).has_table(table_name, schema=_schema(bind))
+
+
+def index_exists(bind, table_name, index_name):
+    indexes = inspect(bind).get_indexes(table_name, schema=_schema(bind))
+    return any(idx["name"] == index_name for idx in indexes)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for name, table, columns, pg_where in INDEXES:
+        if not table_exists(bind, table) or index_exists(bind, table, name):
+            continue
+        kwargs = {}
+        if pg_where:
+            kwargs["postgresql_where"] = sa.text(pg_where)
+        op.create_index(name, table, columns, **kwargs)
+
+    for name, table, _ in REPLACED_INDEXES:
+        if table_exists(bind, table) and index_exists(bind, table, name):
+            op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for name, table, columns in REPLACED_INDEXES:
+        if table_exists(bind, table) and not index_exists(bind, table, name):
+            op.create_index(name, table, columns)
+
+    for name, table, _, _ in reversed(INDEXES):
+        if table_exists(bind, table) and index_exists(bind, table, name):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,68 @@
+"""Add employee_hierarchy_closure (materialized reporting tree) and backfill it
+
+Revision ID: 041_hierarchy_closure
+Revises: 040_composite_indexes
+Create Date: 2026-10-16
+
+One row per (ancestor, descendant) pair plus a depth-0 row per employee. The
+application keeps it current on employee writes; to recompute later run
+python scripts/rebuild_hierarchy_closure.py
+
+Run: alembic upgrade head
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "041_hierarchy_closure"
+down_revision: Union[str, None] = "040_composite_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _closure_rows(parents):
+    """(ancestor_id, descendant_id, depth) for every employee; an edge closing a cycle is dropped"""
+    ancestors = {}
+    for start in parents:
+        path, on_path = [], set()
+        node = start
+        while node is not None and node not in ancestors and node not in on_path:
+            on_path.add(node)
+            path.append(node)
+            node = parents.get(node)
+        for employee_id in reversed(path):
+            manager_id = parents.get(employee_id)
+            if manager_id in ancestors:
+                ancestors[employee_id] = [manager_id] + ancestors[manager_id]
+            else:
+                ancestors[employee_id] = []
+    for employee_id, chain in ancestors.items():
+        yield {"ancestor_id": employee_id, "descendant_id": employee_id, "depth": 0}
+        for depth, ancestor_id in enumerate(chain, start=1):
+            yield {"ancestor_id": ancestor_id, "descendant_id": employee_id, "depth": depth}
+
+
+def upgrade() -> None:
+    closure = op.create_table(
+        "employee_hierarchy_closure",
+        sa.Column("ancestor_id", sa.Integer(), sa.ForeignKey("employees.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("descendant_id", sa.Integer(), sa.ForeignKey("employees.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+    )
+    op.create_index(
+        "ix_employee_hierarchy_closure_descendant",
+        "employee_hierarchy_closure",
+        ["descendant_id", "ancestor_id"],
+    )
+
+    bind = op.get_bind()
+    parents = dict(bind.execute(sa.text("SELECT id, reporting_manager_id FROM employees")).fetchall())
+    rows = list(_closure_rows(parents))
+    if rows:
+        op.bulk_insert(closure, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_employee_hierarchy_closure_descendant", table_name="employee_hierarchy_closure")
+    op.drop_table("employee_hierarchy_closure")
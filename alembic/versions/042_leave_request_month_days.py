@@ -0,0 +1,78 @@
+"""Add leave_request_month_days (computed_days_by_month as rows) and backfill it
+
+Revision ID: 042_leave_month_days
+Revises: 041_hierarchy_closure
+Create Date: 2026-10-16
+
+One row per (leave request, "YYYY-MM" month) with the days of that month, so
+the monthly cap check and monthly analytics are a SUM ... GROUP BY month. The
+application keeps it current on leave writes; to recompute later run
+python scripts/rebuild_leave_month_days.py
+
+Run: alembic upgrade head
+"""
+import json
+from decimal import Decimal, InvalidOperation
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "042_leave_month_days"
+down_revision: Union[str, None] = "041_hierarchy_closure"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows per INSERT during the backfill
+_CHUNK = 2000
+
+
+def _month_rows(leave_id, by_month_json):
+    """Rows for one leave request; unparseable JSON yields none"""
+    try:
+        by_month = json.loads(by_month_json)
+        return [
+            {"leave_request_id": leave_id, "month": str(month), "days": Decimal(str(days))}
+            for month, days in by_month.items()
+            if Decimal(str(days)) != 0
+        ]
+    except (ValueError, TypeError, AttributeError, InvalidOperation):
+        return []
+
+
+def upgrade() -> None:
+    month_days = op.create_table(
+        "leave_request_month_days",
+        sa.Column(
+            "leave_request_id",
+            sa.Integer(),
+            sa.ForeignKey("leave_requests.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("days", sa.Numeric(5, 2), nullable=False),
+        sa.PrimaryKeyConstraint("leave_request_id", "month"),
+    )
+    op.create_index(
+        "ix_leave_request_month_days_month",
+        "leave_request_month_days",
+        ["month", "leave_request_id"],
+    )
+
+    bind = op.get_bind()
+    leaves = bind.execute(sa.text(
+        "SELECT id, computed_days_by_month FROM leave_requests "
+        "WHERE computed_days_by_month IS NOT NULL"
+    )).fetchall()
+    chunk = []
+    for leave_id, by_month_json in leaves:
+        chunk.extend(_month_rows(leave_id, by_month_json))
+        if len(chunk) >= _CHUNK:
+            op.bulk_insert(month_days, chunk)
+            chunk = []
+    if chunk:
+        op.bulk_insert(month_days, chunk)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_leave_request_month_days_month", table_name="leave_request_month_days")
+    op.drop_table("leave_request_month_days")
@@ -0,0 +1,77 @@
+"""Reject overlapping full-day leaves in the database
+
+Revision ID: 043_leave_overlap_exclusion
+Revises: 042_leave_month_days
+Create Date: 2026-10-16
+
+Full-day PENDING/APPROVED leave requests of one employee may not overlap.
+The application checks this before inserting, but two concurrent applies can
+both pass that check. PostgreSQL gets a daterange GiST exclusion constraint
+(needs btree_gist for the employee_id equality); SQLite gets BEFORE
+INSERT/UPDATE triggers. Existing overlapping rows must be cancelled or
+rejected first: the upgrade stops and lists them.
+
+Run: alembic upgrade head
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "043_leave_overlap_exclusion"
+down_revision: Union[str, None] = "042_leave_month_days"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NAME = "leave_requests_no_overlap"
+CANDIDATE = "duration = 'FULL_DAY' AND status IN ('PENDING', 'APPROVED')"
+
+
+def _sqlite_trigger(event, columns="", exclude_self=""):
+    return (
+        f"CREATE TRIGGER {NAME}_{event.lower()} "
+        f"BEFORE {event}{columns} ON leave_requests "
+        "WHEN NEW.duration = 'FULL_DAY' AND NEW.status IN ('PENDING', 'APPROVED') "
+        f"BEGIN SELECT RAISE(ABORT, '{NAME}') WHERE EXISTS ("
+        f"SELECT 1 FROM leave_requests WHERE employee_id = NEW.employee_id AND {CANDIDATE} "
+        f"AND from_date <= NEW.to_date AND to_date >= NEW.from_date{exclude_self}); END"
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    conflicts = bind.execute(sa.text(
+        "SELECT a.id, b.id FROM leave_requests a JOIN leave_requests b "
+        "ON a.employee_id = b.employee_id AND a.id < b.id "
+        "AND a.from_date <= b.to_date AND b.from_date <= a.to_date "
+        "WHERE a.duration = 'FULL_DAY' AND a.status IN ('PENDING', 'APPROVED') "
+        "AND b.duration = 'FULL_DAY' AND b.status IN ('PENDING', 'APPROVED') "
+        "LIMIT 20"
+    )).fetchall()
+    if conflicts:
+        pairs = ", ".join(f"{a}/{b}" for a, b in conflicts)
+        raise RuntimeError(
+            f"Overlapping full-day PENDING/APPROVED leave requests (id pairs): {pairs}. "
+            "Cancel or reject one of each pair, then re-run the upgrade."
+        )
+
+    if bind.dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        op.execute(
+            f"ALTER TABLE leave_requests ADD CONSTRAINT {NAME} "
+            "EXCLUDE USING gist (employee_id WITH =, daterange(from_date, to_date, '[]') WITH &&) "
+            f"WHERE ({CANDIDATE})"
+        )
+    elif bind.dialect.name == "sqlite":
+        op.execute(_sqlite_trigger("INSERT"))
+        op.execute(_sqlite_trigger(
+            "UPDATE", " OF employee_id, from_date, to_date, status, duration", " AND id != NEW.id"
+        ))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute(f"ALTER TABLE leave_requests DROP CONSTRAINT IF EXISTS {NAME}")
+    elif bind.dialect.name == "sqlite":
+        op.execute(f"DROP TRIGGER IF EXISTS {NAME}_insert")
+        op.execute(f"DROP TRIGGER IF EXISTS {NAME}_update")
@@ -0,0 +1,44 @@
+"""Indexes for keyset-paginated leave lists and delta sync
+
+Revision ID: 044_leave_list_keyset_indexes
+Revises: 043_leave_overlap_exclusion
+Create Date: 2026-10-16
+
+Leave lists page on (applied_at, id) instead of returning every row, and
+mobile clients fetch only rows with updated_at at or after their last sync.
+
+Run: alembic upgrade head
+"""
+from typing import Sequence, Union
+from alembic import op
+from sqlalchemy import inspect
+
+revision: str = "044_leave_list_keyset_indexes"
+down_revision: Union[str, None] = "043_leave_overlap_exclusion"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, columns) on leave_requests
+INDEXES = [
+    ("ix_leave_requests_applied_at_id", ["applied_at", "id"]),
+    ("ix_leave_requests_updated_at", ["updated_at"]),
+]
+
+
+def _index_names(bind):
+    schema = None if bind.engine.name == "sqlite" else "public"
+    return {idx["name"] for idx in inspect(bind).get_indexes("leave_requests", schema=schema)}
+
+
+def upgrade() -> None:
+    existing = _index_names(op.get_bind())
+    for name, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, "leave_requests", columns)
+
+
+def downgrade() -> None:
+    existing = _index_names(op.get_bind())
+    for name, _ in reversed(INDEXES):
+        if name in existing:
+            op.drop_index(name, table_name="leave_requests")
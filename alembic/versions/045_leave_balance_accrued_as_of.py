@@ -0,0 +1,39 @@
+"""Accrual snapshot date on leave balances
+
+Revision ID: 045_leave_balance_accrued_as_of
+Revises: 044_leave_list_keyset_indexes
+Create Date: 2026-10-16
+
+leave_balances.accrued_as_of records the date the persisted `accrued` value
+was computed for. Balance reads no longer recompute and write the wallet;
+they use the snapshot and bring it forward in memory when it is older than
+the current month. Existing rows start as NULL (treated as never computed)
+until the next accrual run or wallet write.
+
+Run: alembic upgrade head
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision: str = "045_leave_balance_accrued_as_of"
+down_revision: Union[str, None] = "044_leave_list_keyset_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_column(bind) -> bool:
+    schema = None if bind.engine.name == "sqlite" else "public"
+    return any(c["name"] == "accrued_as_of" for c in inspect(bind).get_columns("leave_balances", schema=schema))
+
+
+def upgrade() -> None:
+    if not _has_column(op.get_bind()):
+        op.add_column("leave_balances", sa.Column("accrued_as_of", sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    if _has_column(op.get_bind()):
+        with op.batch_alter_table("leave_balances") as batch:
+            batch.drop_column("accrued_as_of")
@@ -0,0 +1,47 @@
+"""Add accrual_runs (bulk monthly accrual checkpoint)
+
+Revision ID: 046_accrual_runs
+Revises: 045_leave_balance_accrued_as_of
+Create Date: 2026-10-16
+
+One row per (year, month) accrual run. The bulk engine writes balances in
+chunks of employees ordered by id and advances last_employee_id in the same
+commit as each chunk, so a failed run resumes where it stopped.
+
+Run: alembic upgrade head
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "046_accrual_runs"
+down_revision: Union[str, None] = "045_leave_balance_accrued_as_of"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "accrual_runs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("status", sa.Enum("RUNNING", "COMPLETED", "FAILED", name="accrualrunstatus"), nullable=False),
+        sa.Column("chunk_size", sa.Integer(), nullable=False),
+        sa.Column("last_employee_id", sa.Integer(), nullable=True),
+        sa.Column("credited_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("chunks_done", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("started_by", sa.Integer(), sa.ForeignKey("employees.id"), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint("year", "month", name="uq_accrual_runs_year_month"),
+    )
+    op.create_index("ix_accrual_runs_id", "accrual_runs", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_accrual_runs_id", table_name="accrual_runs")
+    op.drop_table("accrual_runs")
+    if op.get_bind().engine.name != "sqlite":
+        sa.Enum(name="accrualrunstatus").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,105 @@
+"""Add employee_leave_balance_view (admin balance grid read model) and backfill it
+
+Revision ID: 047_leave_balance_view
+Revises: 046_accrual_runs
+Create Date: 2026-10-16
+
+One row per wallet leave_balances row with employee code/name/department/
+active, allocated = opening + accrued + carry_forward, and eligible_from
+(join_date + 6 months for PL/FL). The application refreshes rows in the same
+transaction as balance and employee writes; to recompute later run
+python scripts/rebuild_balance_view.py
+
+Run: alembic upgrade head
+"""
+import calendar
+from datetime import date
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "047_leave_balance_view"
+down_revision: Union[str, None] = "046_accrual_runs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_WALLET_TYPES = ("CL", "SL", "PL", "RH", "FL")
+_GATED_TYPES = ("PL", "FL")
+
+
+def _six_months_after(d: date) -> date:
+    month = d.month + 6
+    year = d.year + (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return date(year, month, min(d.day, calendar.monthrange(year, month)[1]))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    table = op.create_table(
+        "employee_leave_balance_view",
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("employees.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("leave_type", sa.String(10), nullable=False),  # same type as leave_balances.leave_type
+        sa.Column("emp_code", sa.String(), nullable=False),
+        sa.Column("employee_name", sa.String(), nullable=False),
+        sa.Column("department_id", sa.Integer(), nullable=True),
+        sa.Column("active", sa.Boolean(), nullable=False),
+        sa.Column("opening", sa.Numeric(5, 2), nullable=False),
+        sa.Column("accrued", sa.Numeric(5, 2), nullable=False),
+        sa.Column("used", sa.Numeric(5, 2), nullable=False),
+        sa.Column("remaining", sa.Numeric(5, 2), nullable=False),
+        sa.Column("carry_forward", sa.Numeric(5, 2), nullable=False),
+        sa.Column("allocated", sa.Numeric(6, 2), nullable=False),
+        sa.Column("eligible_from", sa.Date(), nullable=True),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.PrimaryKeyConstraint("employee_id", "year", "leave_type"),
+    )
+    op.create_index(
+        "ix_employee_leave_balance_view_year_dept",
+        "employee_leave_balance_view",
+        ["year", "department_id", "leave_type", "employee_id"],
+    )
+    op.create_index(
+        "ix_employee_leave_balance_view_year_type",
+        "employee_leave_balance_view",
+        ["year", "leave_type", "employee_id"],
+    )
+
+    rows = bind.execute(sa.text(
+        "SELECT b.employee_id, b.year, b.leave_type, b.opening, b.accrued, b.used, b.remaining, b.carry_forward, "
+        "e.emp_code, e.name, e.department_id, e.active, e.join_date "
+        "FROM leave_balances b JOIN employees e ON e.id = b.employee_id"
+    )).mappings().all()
+    backfill = []
+    for r in rows:
+        lt = str(r["leave_type"])
+        if lt not in _WALLET_TYPES:
+            continue
+        join_date = r["join_date"]
+        if isinstance(join_date, str):
+            join_date = date.fromisoformat(join_date)
+        backfill.append({
+            "employee_id": r["employee_id"],
+            "year": r["year"],
+            "leave_type": lt,
+            "emp_code": r["emp_code"],
+            "employee_name": r["name"],
+            "department_id": r["department_id"],
+            "active": bool(r["active"]),
+            "opening": r["opening"],
+            "accrued": r["accrued"],
+            "used": r["used"],
+            "remaining": r["remaining"],
+            "carry_forward": r["carry_forward"],
+            "allocated": r["opening"] + r["accrued"] + r["carry_forward"],
+            "eligible_from": _six_months_after(join_date) if lt in _GATED_TYPES else None,
+        })
+    if backfill:
+        op.bulk_insert(table, backfill)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_employee_leave_balance_view_year_type", table_name="employee_leave_balance_view")
+    op.drop_index("ix_employee_leave_balance_view_year_dept", table_name="employee_leave_balance_view")
+    op.drop_table("employee_leave_balance_view")
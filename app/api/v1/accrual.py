@@ -1,7 +1,7 @@
 """
 Accrual management endpoints (HR-only)
 """
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlalchemy.orm import Session
 from app.core.deps import get_db, require_roles, get_current_user
@@ -16,6 +16,8 @@ router = APIRouter()
 async def run_accrual_endpoint(
     month: str = Query(None, description="Month in YYYY-MM format (e.g., 2026-02). Omit to run full year."),
     year: int = Query(None, description="Year only (e.g., 2026). Use with month omitted to run all 12 months (idempotent)."),
+    chunk_size: Optional[int] = Query(None, ge=1, le=10000, description="Employees per upsert chunk (default ACCRUAL_CHUNK_SIZE)"),
+    resume: bool = Query(True, description="Continue an unfinished run for the month from its checkpoint"),
     db: Session = Depends(get_db),
     current_user: Employee = Depends(require_roles(Role.ADMIN))
 ):
@@ -26,6 +28,10 @@ async def run_accrual_endpoint(
     Option B: POST /api/v1/accrual/run?year=2026 — run all months 1..12 for 2026 (full year allocation, pro-rata for joiners).
     
     Policy: PL=5, CL=6, SL=7 per year. Monthly accrual +1 CL, +1 PL; SL annual grant pro-rated. PL usable after 6 months.
+
+    Balances are written in chunks, each committed with the month's checkpoint; the response
+    lists per-chunk timings and errors. A run stops at the first failing chunk (status FAILED)
+    and the next call for that month resumes after the last written employee.
     """
     if month:
         try:
@@ -41,11 +47,13 @@ async def run_accrual_endpoint(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid month: {month}. Use YYYY-MM (e.g., 2026-02)"
             )
-        result = run_monthly_accrual(db=db, year=year_val, month=month_num, actor_id=current_user.id)
+        result = run_monthly_accrual(
+            db=db, year=year_val, month=month_num, actor_id=current_user.id, chunk_size=chunk_size, resume=resume
+        )
     elif year is not None:
         results = []
         for m in range(1, 13):
-            r = run_monthly_accrual(db=db, year=year, month=m, actor_id=current_user.id)
+            r = run_monthly_accrual(db=db, year=year, month=m, actor_id=current_user.id, chunk_size=chunk_size, resume=resume)
             results.append(r)
         result = {
             "year": year,
@@ -4,9 +4,11 @@ from app.api.v1.admin import attendance as admin_attendance
 from app.api.v1.admin import leaves as admin_leaves
 from app.api.v1.admin import wfh as admin_wfh
 from app.api.v1.admin import users as admin_users
+from app.api.v1.admin import db as admin_db
 
 admin_router = APIRouter(prefix="/admin", tags=["admin"])
 admin_router.include_router(admin_attendance.router, prefix="/attendance", tags=["admin-attendance"])
 admin_router.include_router(admin_leaves.router, prefix="/leaves", tags=["admin-leaves"])
 admin_router.include_router(admin_wfh.router, prefix="/wfh", tags=["admin-wfh"])
 admin_router.include_router(admin_users.router, prefix="/users", tags=["admin-users"])
+admin_router.include_router(admin_db.router, prefix="/db", tags=["admin-db"])
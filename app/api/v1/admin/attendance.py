@@ -7,7 +7,7 @@ punch_in_device_id, punch_out_device_id, punch_in_source, punch_out_source.
 import json
 from datetime import date
 from typing import Optional, List, Any
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 import logging
 from sqlalchemy.orm import Session
 
@@ -22,6 +22,7 @@ from app.schemas.attendance import (
     AdminSessionCreateRequest,
 )
 from app.services import attendance_session_service as svc
+from app.services.visibility_scope import request_visibility_scope
 
 router = APIRouter()
 _log = logging.getLogger(__name__)
@@ -78,6 +79,7 @@ def _session_to_admin_dto(s: AttendanceSession) -> AdminSessionDto:
 
 @router.get("/today", response_model=List[AdminSessionDto])
 async def admin_today(
+    request: Request,
     department_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None, description="OPEN, CLOSED, AUTO_CLOSED, SUSPICIOUS"),
     q: Optional[str] = Query(None, description="Search by name or emp_code"),
@@ -90,12 +92,14 @@ async def admin_today(
         department_id=department_id,
         status_filter=status,
         q=q,
+        scope=request_visibility_scope(request, db, current_user),
     )
     return [_session_to_admin_dto(s) for s in sessions]
 
 
 @router.get("", response_model=AdminSessionListResponse)
 async def admin_list(
+    request: Request,
     from_date: date = Query(..., alias="from"),
     to_date: date = Query(..., alias="to"),
     employee_id: Optional[int] = Query(None),
@@ -112,6 +116,7 @@ async def admin_list(
         employee_id=employee_id,
         department_id=department_id,
         status_filter=status,
+        scope=request_visibility_scope(request, db, current_user),
     )
     items = [_session_to_admin_dto(s) for s in sessions]
     return AdminSessionListResponse(items=items, total=len(items))
@@ -0,0 +1,54 @@
+"""
+Admin database diagnostics (ADMIN only)
+"""
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core.deps import require_roles
+from app.core.config import settings
+from app.db.session import async_pool_metrics, pool_metrics, replica_pool_metrics
+from app.db.slow_query_log import slow_query_log
+from app.models.employee import Employee, Role
+
+router = APIRouter()
+
+
+@router.get("/pool")
+def pool_stats(
+    current_user: Employee = Depends(require_roles(Role.ADMIN)),
+):
+    """
+    Connection pool metrics for this worker (primary, async, and replica if
+    configured): in-use, idle and overflow connections, checkout wait
+    percentiles (ms) and pool timeouts.
+    """
+    metrics = [pool_metrics, async_pool_metrics, replica_pool_metrics]
+    return {"pools": [m.snapshot() for m in metrics if m is not None]}
+
+
+@router.get("/slow-queries")
+def slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: Literal["total_ms", "max_ms", "count"] = Query("total_ms"),
+    current_user: Employee = Depends(require_roles(Role.ADMIN)),
+):
+    """
+    Slowest statement fingerprints seen by this worker (statements at or above
+    SLOW_QUERY_MS): count, total/avg/max ms, parameter shape, calling function
+    and, with SLOW_QUERY_EXPLAIN, the captured plan.
+    """
+    return {
+        "threshold_ms": settings.SLOW_QUERY_MS,
+        "explain": settings.SLOW_QUERY_EXPLAIN,
+        "queries": slow_query_log.top(limit=limit, order_by=order_by),
+    }
+
+
+@router.delete("/slow-queries")
+def reset_slow_queries(
+    current_user: Employee = Depends(require_roles(Role.ADMIN)),
+):
+    """Clear this worker's slow-query log"""
+    slow_query_log.clear()
+    return {"cleared": True}
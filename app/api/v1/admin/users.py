@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 from app.core.deps import get_db, require_roles, get_current_user
 from app.models.employee import Employee, Role
 from app.schemas.auth import AdminResetPasswordRequest
-from app.core.security import validate_strong_password, hash_password
+from app.core.security import validate_strong_password, hash_password_async
 from app.services.audit_service import log_audit
 import secrets
 import string
@@ -60,7 +60,7 @@ async def admin_reset_password_endpoint(
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ve))
         temp_password = None
     
-    target.password_hash = hash_password(new_password)
+    target.password_hash = await hash_password_async(new_password)
     target.must_change_password = True
     target.password_changed_at = None
     db.add(target)
@@ -14,7 +14,7 @@ from typing import Optional, List
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db, require_admin_attendance
+from app.core.deps import get_db, get_read_db, require_admin_attendance
 from app.models.employee import Employee
 from app.models.wfh import WFHRequest, WFHStatus
 from app.models.employee import Employee as Emp
@@ -24,7 +24,7 @@ from app.schemas.wfh import (
     AdminWfhBalancesResponse,
     AdminWfhTransactionOut,
 )
-from app.services.policy_validator import get_or_create_policy_settings
+from app.services.policy_cache import policy_cache
 
 router = APIRouter()
 
@@ -43,7 +43,7 @@ async def admin_wfh_balances(
     Remaining is entitled - used.
     """
     # Get WFH policy for the year
-    settings = get_or_create_policy_settings(db, year)
+    settings = policy_cache.get(db, year)
     entitled_days: int = getattr(settings, "wfh_max_days", 12)
 
     start = date(year, 1, 1)
@@ -107,7 +107,7 @@ async def admin_wfh_transactions(
     employee_id: int = Query(..., description="Employee ID"),
     year: Optional[int] = Query(None, description="Filter by year (e.g. 2026)"),
     limit: int = Query(100, le=500),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Employee = Depends(require_admin_attendance),
 ):
     """
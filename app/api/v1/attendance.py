@@ -7,9 +7,12 @@ import logging
 from datetime import date
 from typing import Optional, Any, Dict
 from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_db, get_read_db, get_async_db, get_current_user
+from app.db.unit_of_work import unit_of_work
 from app.models.employee import Employee
+from app.services.visibility_scope import HIERARCHY_RANK, request_visibility_scope
 from app.schemas.attendance import (
     PunchInRequest,
     PunchOutRequest,
@@ -27,6 +30,7 @@ from app.services.attendance_session_service import (
     punch_in as session_punch_in,
     punch_out as session_punch_out,
     get_today_session,
+    get_today_session_async,
     list_my_sessions,
 )
 from app.utils.datetime_utils import now_utc, iso_8601_utc, iso_ist, to_ist
@@ -109,7 +113,7 @@ async def tz_check():
 async def punch_in_endpoint(
     request: Request,
     body: Optional[SessionPunchInRequest] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user),
 ):
     """
@@ -145,23 +149,28 @@ async def punch_in_endpoint(
         punch_in_device_id,
     )
 
-    session = session_punch_in(
-        db=db,
-        employee_id=current_user.id,
-        source=payload.source,
-        punch_in_ip=punch_in_ip,
-        punch_in_device_id=punch_in_device_id,
-        punch_in_geo=punch_in_geo,
-        is_mocked=payload.is_mocked,
-    )
-    return SessionDto.model_validate(session)
+    def _punch_in(sync_db: Session) -> SessionDto:
+        # Session, event, daily summary and audit commit together
+        with unit_of_work(sync_db):
+            session = session_punch_in(
+                db=sync_db,
+                employee_id=current_user.id,
+                source=payload.source,
+                punch_in_ip=punch_in_ip,
+                punch_in_device_id=punch_in_device_id,
+                punch_in_geo=punch_in_geo,
+                is_mocked=payload.is_mocked,
+            )
+        return SessionDto.model_validate(session)
+
+    return await db.run_sync(_punch_in)
 
 
 @router.post("/punch-out", response_model=SessionDto)
 async def punch_out_endpoint(
     request: Request,
     body: Optional[SessionPunchOutRequest] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user),
 ):
     """
@@ -194,25 +203,29 @@ async def punch_out_endpoint(
         punch_out_device_id,
     )
 
-    session = session_punch_out(
-        db=db,
-        employee_id=current_user.id,
-        source=payload.source,
-        punch_out_ip=punch_out_ip,
-        punch_out_device_id=punch_out_device_id,
-        punch_out_geo=punch_out_geo,
-        is_mocked=payload.is_mocked,
-    )
-    return SessionDto.model_validate(session)
+    def _punch_out(sync_db: Session) -> SessionDto:
+        with unit_of_work(sync_db):
+            session = session_punch_out(
+                db=sync_db,
+                employee_id=current_user.id,
+                source=payload.source,
+                punch_out_ip=punch_out_ip,
+                punch_out_device_id=punch_out_device_id,
+                punch_out_geo=punch_out_geo,
+                is_mocked=payload.is_mocked,
+            )
+        return SessionDto.model_validate(session)
+
+    return await db.run_sync(_punch_out)
 
 
 @router.get("/today", response_model=Optional[SessionDto])
 async def today_endpoint(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user),
 ):
     """Get today's attendance session for the current user (Asia/Kolkata work date)."""
-    session = get_today_session(db, current_user.id)
+    session = await get_today_session_async(db, current_user.id)
     return SessionDto.model_validate(session) if session else None
 
 
@@ -261,6 +274,7 @@ async def streak_endpoint(
 
 @router.get("/today-scope", response_model=SessionListResponse)
 async def today_scope_endpoint(
+    request: Request,
     employee_id: Optional[int] = Query(None, description="Filter by specific employee ID"),
     db: Session = Depends(get_db),
     current_user: Employee = Depends(get_current_user),
@@ -275,15 +289,14 @@ async def today_scope_endpoint(
     
     Returns today's attendance sessions list + total count.
     """
-    from app.services.leave_service import get_role_rank, get_subordinate_ids
     from app.services.attendance_session_service import get_today_session, _get_sessions_for_employees
     from app.utils.datetime_utils import get_work_date
     
     today = get_work_date()
-    current_user_rank = get_role_rank(db, current_user)
+    scope = request_visibility_scope(request, db, current_user)
     
     # Apply role-based scoping
-    if current_user_rank <= 3:
+    if scope.all:
         # ADMIN/MD/VP: can view all employees
         if employee_id:
             # Filter by specific employee if requested
@@ -292,14 +305,12 @@ async def today_scope_endpoint(
         else:
             # Get all sessions for today
             from app.services.attendance_session_service import admin_list_today
-            sessions = admin_list_today(db, current_user)
-    elif current_user_rank == 4:
+            sessions = admin_list_today(db, current_user, scope=scope)
+    elif scope.role_rank == HIERARCHY_RANK:
         # MANAGER: can view only direct reportees
-        subordinate_ids = get_subordinate_ids(db, current_user.id)
-        
         if employee_id:
             # Validate that requested employee is within manager's scope
-            if employee_id not in subordinate_ids and employee_id != current_user.id:
+            if not scope.can_see(employee_id):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Access denied. You can only view attendance of your direct reportees."
@@ -307,6 +318,7 @@ async def today_scope_endpoint(
             session = get_today_session(db, employee_id)
             sessions = [session] if session else []
         else:
+            subordinate_ids = sorted(scope.subordinate_ids)
             # Get sessions for all direct reportees today
             if not subordinate_ids:
                 sessions = []
@@ -390,10 +402,11 @@ async def list_attendance_endpoint(
 
 @router.get("/list-sessions", response_model=SessionListResponse)
 async def list_sessions_endpoint(
+    request: Request,
     from_date: date = Query(..., alias="from", description="Start date (YYYY-MM-DD)"),
     to_date: date = Query(..., alias="to", description="End date (YYYY-MM-DD)"),
     employee_id: Optional[int] = Query(None, description="Filter by specific employee ID"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Employee = Depends(get_current_user),
 ):
     """
@@ -406,8 +419,7 @@ async def list_sessions_endpoint(
     
     Returns attendance sessions list + total count.
     """
-    from app.services.leave_service import get_role_rank, get_subordinate_ids
-    from app.services.attendance_session_service import list_my_sessions
+    from app.services.attendance_session_service import list_my_sessions, _get_sessions_for_employees
     
     # Validate date range
     if from_date > to_date:
@@ -416,10 +428,10 @@ async def list_sessions_endpoint(
             detail="from_date must be less than or equal to to_date"
         )
     
-    current_user_rank = get_role_rank(db, current_user)
+    scope = request_visibility_scope(request, db, current_user)
     
     # Apply role-based scoping
-    if current_user_rank <= 3:
+    if scope.all:
         # ADMIN/MD/VP: can view all employees
         if employee_id:
             # Filter by specific employee if requested
@@ -428,20 +440,19 @@ async def list_sessions_endpoint(
             # Get all sessions for all employees in date range
             # This requires a new service function or we can use admin_list with proper scoping
             from app.services.attendance_session_service import admin_list
-            sessions = admin_list(db, current_user, from_date, to_date, employee_id=employee_id)
-    elif current_user_rank == 4:
+            sessions = admin_list(db, current_user, from_date, to_date, employee_id=employee_id, scope=scope)
+    elif scope.role_rank == HIERARCHY_RANK:
         # MANAGER: can view only direct reportees
-        subordinate_ids = get_subordinate_ids(db, current_user.id)
-        
         if employee_id:
             # Validate that requested employee is within manager's scope
-            if employee_id not in subordinate_ids and employee_id != current_user.id:
+            if not scope.can_see(employee_id):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Access denied. You can only view attendance of your direct reportees."
                 )
             sessions = list_my_sessions(db, employee_id, from_date, to_date)
         else:
+            subordinate_ids = sorted(scope.subordinate_ids)
             # Get sessions for all direct reportees
             if not subordinate_ids:
                 sessions = []
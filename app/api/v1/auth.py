@@ -6,15 +6,16 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.core.deps import get_db, get_current_user
 from app.core.security import (
-    verify_password, 
+    verify_password_async,
     create_access_token, 
     create_refresh_token,
     validate_strong_password, 
-    hash_password,
+    hash_password_async,
     decode_token
 )
 from app.core.config import settings
 from app.models.employee import Employee
+from app.services.role_registry import fallback_rank, role_registry
 from app.schemas.auth import LoginRequest, TokenResponse, ChangePasswordRequest, RefreshTokenRequest
 
 router = APIRouter()
@@ -52,29 +53,17 @@ async def login_mobile(
             detail="No password set for this account"
         )
     
-    if not verify_password(login_data.password, employee.password_hash):
+    if not await verify_password_async(login_data.password, employee.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid employee code or password"
         )
     
     # Get role_rank
-    from app.models.role import RoleModel
-    role_rank_map = {
-        "ADMIN": 1,
-        "MD": 2,
-        "VP": 3,
-        "MANAGER": 4,
-        "HR": 5,
-        "EMPLOYEE": 99
-    }
     try:
-        role_model = db.query(RoleModel).filter(
-            RoleModel.name == employee.role
-        ).first()
-        role_rank = role_model.role_rank if role_model else role_rank_map.get(employee.role, 99)
+        role_rank = role_registry.rank_for(db, employee.role)
     except Exception:
-        role_rank = role_rank_map.get(employee.role, 99)
+        role_rank = fallback_rank(employee.role)
     
     # Create access token
     token_data = {
@@ -143,29 +132,17 @@ async def login(
             detail="No password set for this account"
         )
     
-    if not verify_password(login_data.password, employee.password_hash):
+    if not await verify_password_async(login_data.password, employee.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid employee code or password"
         )
     
     # Get role_rank from roles table
-    from app.models.role import RoleModel
-    role_rank_map = {
-        "ADMIN": 1,
-        "MD": 2,
-        "VP": 3,
-        "MANAGER": 4,
-        "HR": 5,
-        "EMPLOYEE": 99
-    }
     try:
-        role_model = db.query(RoleModel).filter(
-            RoleModel.name == employee.role
-        ).first()
-        role_rank = role_model.role_rank if role_model else role_rank_map.get(employee.role, 99)
+        role_rank = role_registry.rank_for(db, employee.role)
     except Exception:
-        role_rank = role_rank_map.get(employee.role, 99)
+        role_rank = fallback_rank(employee.role)
     
     # Restrict admin panel login to role_rank 1-4 only (ADMIN, MD, VP, MANAGER)
     # Commented out for development/testing - allows all roles to login
@@ -242,7 +219,7 @@ async def change_password(
     if not user or user.password_hash is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     
-    if not verify_password(payload.current_password, user.password_hash):
+    if not await verify_password_async(payload.current_password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Current password is incorrect")
     
     try:
@@ -250,7 +227,7 @@ async def change_password(
     except ValueError as ve:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ve))
     
-    user.password_hash = hash_password(new_pw)
+    user.password_hash = await hash_password_async(new_pw)
     user.password_changed_at = datetime.utcnow()
     user.must_change_password = False
     db.add(user)
@@ -3,19 +3,24 @@ Health check endpoint
 """
 from fastapi import APIRouter
 from app.core.constants import SYSTEM_CREDIT
+from app.core.security import run_hashing_self_test
 
 router = APIRouter()
 
 
 @router.get("/health")
-async def health_check():
+def health_check():
     """
     Health check endpoint
     
-    Returns service status and attribution.
+    Returns service status and attribution. The first call also runs the password
+    hashing self-test (deferred from import time); later calls reuse its result.
+    Plain def so that one-time test runs in the threadpool.
     """
+    backends = run_hashing_self_test()
     return {
-        "status": "ok",
+        "status": "ok" if any(backends.values()) else "degraded",
         "service": "acs-hrms-backend",
-        "credit": SYSTEM_CREDIT
+        "credit": SYSTEM_CREDIT,
+        "hashing": backends,
     }
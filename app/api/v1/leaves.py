@@ -1,18 +1,24 @@
 """
 Leave endpoints
 """
-from datetime import date
+from datetime import date, datetime
 from typing import Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_async_db, get_current_user
+from app.db.unit_of_work import unit_of_work
 from app.models.employee import Employee
 from app.models.leave import WALLET_LEAVE_TYPES
 from app.schemas.leave import (
     LeaveApplyRequest,
     LeaveOut,
+    LeaveQuoteRequest,
+    LeaveQuoteResponse,
     LeaveListResponse,
     LeaveListItemOut,
+    LeaveBulkActionRequest,
+    LeaveBulkActionResponse,
     ApprovalActionRequest,
     RejectActionRequest,
     CancelActionRequest,
@@ -22,11 +28,14 @@ from app.schemas.leave import (
     BalanceSummaryItemOut,
     BalanceTypeOut,
 )
+from app.services.visibility_scope import request_visibility_scope
 from app.services.leave_service import (
     apply_leave,
+    quote_leaves,
     list_leaves,
     approve_leave,
     reject_leave,
+    bulk_leave_action,
     cancel_leave,
     list_pending_for_approver
 )
@@ -38,16 +47,21 @@ router = APIRouter()
 @router.get("/balance/me", response_model=BalanceMeResponse)
 async def balance_me(
     year: int = Query(..., description="Calendar year (e.g. 2026)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user),
 ):
     """
     Get current user's leave balances for the year.
     Returns total_entitlement, opening, accrued, used, remaining, eligible (PL only), notes.
     """
-    balances = wallet.get_wallet_balances(db, current_user.id, year)
-    employee = current_user
-    acc = wallet.compute_accrual(db, employee, year)
+    def _load(sync_db: Session):
+        employee = sync_db.get(Employee, current_user.id)
+        return (
+            wallet.get_wallet_balances(sync_db, current_user.id, year),
+            wallet.compute_accrual(sync_db, employee, year),
+        )
+
+    balances, acc = await db.run_sync(_load)
     items = []
     balances_dict = {}
     for b in balances:
@@ -86,12 +100,18 @@ async def balance_me(
 @router.get("/balance/summary/me", response_model=BalanceSummaryMeResponse)
 async def balance_summary_me(
     year: int = Query(..., description="Calendar year (e.g. 2026)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user),
 ):
     """Shorter balance summary for current user."""
-    balances = wallet.get_wallet_balances(db, current_user.id, year)
-    acc = wallet.compute_accrual(db, current_user, year)
+    def _load(sync_db: Session):
+        employee = sync_db.get(Employee, current_user.id)
+        return (
+            wallet.get_wallet_balances(sync_db, current_user.id, year),
+            wallet.compute_accrual(sync_db, employee, year),
+        )
+
+    balances, acc = await db.run_sync(_load)
     items = []
     for b in balances:
         if b.leave_type not in WALLET_LEAVE_TYPES:
@@ -111,7 +131,7 @@ async def balance_summary_me(
 @router.post("/apply", response_model=LeaveOut, status_code=201)
 async def apply_leave_endpoint(
     leave_data: LeaveApplyRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user)
 ):
     """
@@ -126,43 +146,81 @@ async def apply_leave_endpoint(
     - Overlap prevention (no overlap with PENDING/APPROVED leaves)
     - Day calculation excludes Sundays and holidays
     """
-    leave_request = apply_leave(
-        db=db,
-        employee_id=current_user.id,
-        leave_type=leave_data.leave_type,
-        from_date=leave_data.from_date,
-        to_date=leave_data.to_date,
-        reason=leave_data.reason,
-        duration=leave_data.duration,
-        half_day_session=leave_data.half_day_session,
-        override_policy=getattr(leave_data, 'override_policy', False),
-        override_remark=getattr(leave_data, 'override_remark', None),
-        current_user=current_user
-    )
-    
-    return leave_request
+    def _apply(sync_db: Session) -> LeaveOut:
+        # Wallet init, insert and audit commit together
+        with unit_of_work(sync_db):
+            leave_request = apply_leave(
+                db=sync_db,
+                employee_id=current_user.id,
+                leave_type=leave_data.leave_type,
+                from_date=leave_data.from_date,
+                to_date=leave_data.to_date,
+                reason=leave_data.reason,
+                duration=leave_data.duration,
+                half_day_session=leave_data.half_day_session,
+                override_policy=getattr(leave_data, 'override_policy', False),
+                override_remark=getattr(leave_data, 'override_remark', None),
+                current_user=current_user
+            )
+        # Serialize inside run_sync so lazy relationships load on the sync facade
+        return LeaveOut.model_validate(leave_request)
+
+    return await db.run_sync(_apply)
+
+
+@router.post("/quote", response_model=LeaveQuoteResponse)
+async def quote_leaves_endpoint(
+    quote_data: LeaveQuoteRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Employee = Depends(get_current_user)
+):
+    """
+    Price many candidate leaves for the current user without applying them
+    (calendar pickers). Each candidate runs the same validations and day
+    calculation as /apply; violations are reported per candidate instead of
+    failing the request. Nothing is created, committed or audited.
+    """
+    def _quote(sync_db: Session) -> LeaveQuoteResponse:
+        try:
+            items = quote_leaves(
+                sync_db,
+                current_user.id,
+                [c.model_dump() for c in quote_data.candidates],
+            )
+        finally:
+            sync_db.rollback()
+        return LeaveQuoteResponse(items=items)
+
+    return await db.run_sync(_quote)
 
 
 @router.post("/{leave_request_id}/cancel", response_model=LeaveOut)
 async def cancel_leave_endpoint(
     leave_request_id: int,
     cancel_data: CancelActionRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user)
 ):
-    leave_request = cancel_leave(
-        db=db,
-        leave_request_id=leave_request_id,
-        actor=current_user,
-        remark=cancel_data.remark
-    )
-    return leave_request
+    def _cancel(sync_db: Session) -> LeaveOut:
+        leave_request = cancel_leave(
+            db=sync_db,
+            leave_request_id=leave_request_id,
+            actor=current_user,
+            remark=cancel_data.remark
+        )
+        return LeaveOut.model_validate(leave_request)
+
+    return await db.run_sync(_cancel)
 
 @router.get("/my", response_model=LeaveListResponse)
 async def list_my_leaves_endpoint(
+    request: Request,
     from_date: Optional[date] = Query(None, alias="from", description="Start date filter (YYYY-MM-DD)"),
     to_date: Optional[date] = Query(None, alias="to", description="End date filter (YYYY-MM-DD)"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size; omit to return every row"),
+    updated_since: Optional[datetime] = Query(None, description="Only leaves changed at or after this time (delta sync)"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user)
 ):
     """
@@ -170,25 +228,37 @@ async def list_my_leaves_endpoint(
     Cancelled leaves return status=CANCELLED with cancel_remark, cancelled_by, cancelled_at.
     Never returns PENDING for a leave that was cancelled (status is CANCELLED).
     """
-    leave_requests = list_leaves(
-        db=db,
-        current_user=current_user,
-        from_date=from_date,
-        to_date=to_date,
-        employee_id=current_user.id,  # only own leaves
-    )
-    return LeaveListResponse(
-        items=[LeaveListItemOut.from_orm(req) for req in leave_requests],
-        total=len(leave_requests)
-    )
+    def _list(sync_db: Session) -> LeaveListResponse:
+        leave_requests, next_cursor = list_leaves(
+            db=sync_db,
+            current_user=current_user,
+            from_date=from_date,
+            to_date=to_date,
+            employee_id=current_user.id,  # only own leaves
+            scope=request_visibility_scope(request, sync_db, current_user),
+            cursor=cursor,
+            limit=limit,
+            updated_since=updated_since,
+        )
+        return LeaveListResponse(
+            items=[LeaveListItemOut.from_orm(req) for req in leave_requests],
+            total=len(leave_requests),
+            next_cursor=next_cursor,
+        )
+
+    return await db.run_sync(_list)
 
 
 @router.get("/list", response_model=LeaveListResponse)
 async def list_leaves_endpoint(
+    request: Request,
     from_date: Optional[date] = Query(None, alias="from", description="Start date filter (YYYY-MM-DD)"),
     to_date: Optional[date] = Query(None, alias="to", description="End date filter (YYYY-MM-DD)"),
     employee_id: Optional[int] = Query(None, description="Employee ID filter (for HR/Manager)"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size; omit to return every row"),
+    updated_since: Optional[datetime] = Query(None, description="Only leaves changed at or after this time (delta sync)"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user)
 ):
     """
@@ -200,25 +270,32 @@ async def list_leaves_endpoint(
     
     Requires valid JWT token.
     """
-    leave_requests = list_leaves(
-        db=db,
-        current_user=current_user,
-        from_date=from_date,
-        to_date=to_date,
-        employee_id=employee_id
-    )
-    
-    return LeaveListResponse(
-        items=[LeaveListItemOut.from_orm(req) for req in leave_requests],
-        total=len(leave_requests)
-    )
+    def _list(sync_db: Session) -> LeaveListResponse:
+        leave_requests, next_cursor = list_leaves(
+            db=sync_db,
+            current_user=current_user,
+            from_date=from_date,
+            to_date=to_date,
+            employee_id=employee_id,
+            scope=request_visibility_scope(request, sync_db, current_user),
+            cursor=cursor,
+            limit=limit,
+            updated_since=updated_since,
+        )
+        return LeaveListResponse(
+            items=[LeaveListItemOut.from_orm(req) for req in leave_requests],
+            total=len(leave_requests),
+            next_cursor=next_cursor,
+        )
+
+    return await db.run_sync(_list)
 
 
 @router.post("/{leave_request_id}/approve", response_model=LeaveOut)
 async def approve_leave_endpoint(
     leave_request_id: int,
     approval_data: ApprovalActionRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user)
 ):
     """
@@ -238,21 +315,24 @@ async def approve_leave_endpoint(
     Approval is controlled by reporting hierarchy, not department boundaries.
     Requires valid JWT token.
     """
-    leave_request = approve_leave(
-        db=db,
-        leave_request_id=leave_request_id,
-        approver=current_user,
-        remarks=approval_data.remarks
-    )
-    
-    return leave_request
+    def _approve(sync_db: Session) -> LeaveOut:
+        with unit_of_work(sync_db):
+            leave_request = approve_leave(
+                db=sync_db,
+                leave_request_id=leave_request_id,
+                approver=current_user,
+                remarks=approval_data.remarks
+            )
+        return LeaveOut.model_validate(leave_request)
+
+    return await db.run_sync(_approve)
 
 
 @router.post("/{leave_request_id}/reject", response_model=LeaveOut)
 async def reject_leave_endpoint(
     leave_request_id: int,
     reject_data: RejectActionRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user)
 ):
     """
@@ -271,19 +351,58 @@ async def reject_leave_endpoint(
     Rejection is controlled by reporting hierarchy, not department boundaries.
     Requires valid JWT token.
     """
-    leave_request = reject_leave(
-        db=db,
-        leave_request_id=leave_request_id,
-        approver=current_user,
-        remarks=reject_data.remarks
-    )
+    def _reject(sync_db: Session) -> LeaveOut:
+        leave_request = reject_leave(
+            db=sync_db,
+            leave_request_id=leave_request_id,
+            approver=current_user,
+            remarks=reject_data.remarks
+        )
+        return LeaveOut.model_validate(leave_request)
+
+    return await db.run_sync(_reject)
+
+
+@router.post("/bulk-action", response_model=LeaveBulkActionResponse)
+async def bulk_leave_action_endpoint(
+    request: Request,
+    action_data: LeaveBulkActionRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Employee = Depends(get_current_user)
+):
+    """
+    Approve or reject many pending leave requests at once (month-end queue)
     
-    return leave_request
+    Same authority, policy and wallet rules as the single-item approve/reject
+    endpoints. Authority is resolved once from the approver's scope; all
+    decisions commit in one transaction. An item that fails (not found, not
+    PENDING, outside the approver's hierarchy, policy violation) is reported
+    with its status and detail and does not block the others. Employees are
+    notified with one push after the commit.
+    Requires valid JWT token.
+    """
+    def _bulk(sync_db: Session) -> LeaveBulkActionResponse:
+        items = bulk_leave_action(
+            db=sync_db,
+            leave_request_ids=action_data.leave_request_ids,
+            action=action_data.action,
+            approver=current_user,
+            remarks=action_data.remarks,
+            scope=request_visibility_scope(request, sync_db, current_user),
+        )
+        succeeded = sum(1 for item in items if item["ok"])
+        return LeaveBulkActionResponse(items=items, succeeded=succeeded, failed=len(items) - succeeded)
+
+    return await db.run_sync(_bulk)
 
 
 @router.get("/pending", response_model=LeaveListResponse)
 async def list_pending_leaves_endpoint(
-    db: Session = Depends(get_db),
+    request: Request,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size; omit to return every row"),
+    updated_since: Optional[datetime] = Query(None, description="Only leaves changed at or after this time (delta sync)"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user)
 ):
     """
@@ -297,9 +416,19 @@ async def list_pending_leaves_endpoint(
     Visibility is controlled by reporting hierarchy, not department boundaries.
     Requires valid JWT token.
     """
-    pending_requests = list_pending_for_approver(db=db, current_user=current_user)
-    
-    return LeaveListResponse(
-        items=[LeaveListItemOut.from_orm(req) for req in pending_requests],
-        total=len(pending_requests)
-    )
+    def _list(sync_db: Session) -> LeaveListResponse:
+        pending_requests, next_cursor = list_pending_for_approver(
+            db=sync_db,
+            current_user=current_user,
+            scope=request_visibility_scope(request, sync_db, current_user),
+            cursor=cursor,
+            limit=limit,
+            updated_since=updated_since,
+        )
+        return LeaveListResponse(
+            items=[LeaveListItemOut.from_orm(req) for req in pending_requests],
+            total=len(pending_requests),
+            next_cursor=next_cursor,
+        )
+
+    return await db.run_sync(_list)
@@ -2,11 +2,12 @@ from typing import Optional
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, Request, Response
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date, datetime
 import os
 import re
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_async_db, get_current_user
 from app.models.employee import Employee
 from app.services.r2_storage import get_r2_storage_service
 
@@ -18,9 +19,14 @@ class ProfileUpdate(BaseModel):
     dob: Optional[date] = None
 
 
+async def _get_own_employee(db: AsyncSession, employee_id: int) -> Optional[Employee]:
+    result = await db.execute(select(Employee).where(Employee.id == employee_id))
+    return result.scalars().first()
+
+
 @router.put("/profile")
-async def update_profile(payload: ProfileUpdate, db: Session = Depends(get_db), current_user: Employee = Depends(get_current_user)):
-    e = db.query(Employee).filter(Employee.id == current_user.id).first()
+async def update_profile(payload: ProfileUpdate, db: AsyncSession = Depends(get_async_db), current_user: Employee = Depends(get_current_user)):
+    e = await _get_own_employee(db, current_user.id)
     if not e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
     if payload.name is not None:
@@ -28,19 +34,18 @@ async def update_profile(payload: ProfileUpdate, db: Session = Depends(get_db),
     if payload.dob is not None:
         e.dob = payload.dob
     db.add(e)
-    db.commit()
-    db.refresh(e)
+    await db.commit()
     return {"ok": True}
 
 
 @router.post("/photo")
 @router.post("/profile-photo")
-async def upload_profile_photo(file: UploadFile = File(...), db: Session = Depends(get_db), current_user: Employee = Depends(get_current_user)):
+async def upload_profile_photo(file: UploadFile = File(...), db: AsyncSession = Depends(get_async_db), current_user: Employee = Depends(get_current_user)):
     """Upload profile photo to Cloudflare R2"""
     import logging
     logger = logging.getLogger(__name__)
     
-    e = db.query(Employee).filter(Employee.id == current_user.id).first()
+    e = await _get_own_employee(db, current_user.id)
     if not e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
     
@@ -90,8 +95,7 @@ async def upload_profile_photo(file: UploadFile = File(...), db: Session = Depen
         e.photo_key = object_key
         e.profile_photo_updated_at = datetime.utcnow()
         db.add(e)
-        db.commit()
-        db.refresh(e)
+        await db.commit()
         
         logger.info(f"Photo uploaded successfully: {object_key}")
         
@@ -125,14 +129,14 @@ async def upload_profile_photo(file: UploadFile = File(...), db: Session = Depen
 @router.get("/profile-photo")
 async def get_profile_photo(
     v: Optional[str] = None,  # Cache-busting version parameter
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: Employee = Depends(get_current_user)
 ):
     """Retrieve profile photo from Cloudflare R2"""
     import logging
     logger = logging.getLogger(__name__)
     
-    e = db.query(Employee).filter(Employee.id == current_user.id).first()
+    e = await _get_own_employee(db, current_user.id)
     if not e or not e.photo_key:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
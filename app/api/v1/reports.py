@@ -1,17 +1,21 @@
 """
 Reports and exports endpoints
+
+Report rows are read through get_read_db (replica when configured); the
+REPORT_EXPORT audit row is written through a separate primary session.
 """
 from datetime import date
 from typing import Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_db, get_read_db, get_current_user
 from app.models.employee import Employee
 from app.services.report_service import (
     get_attendance_rows,
     get_leave_rows,
     get_compoff_rows
 )
+from app.services.visibility_scope import request_visibility_scope
 from app.utils.csv_export import stream_csv
 from app.services.audit_service import log_audit
 
@@ -20,11 +24,13 @@ router = APIRouter()
 
 @router.get("/attendance.csv")
 async def export_attendance_csv(
+    request: Request,
     from_date: date = Query(..., alias="from", description="Start date (YYYY-MM-DD)"),
     to_date: date = Query(..., alias="to", description="End date (YYYY-MM-DD)"),
     employee_id: Optional[int] = Query(None, description="Filter by employee ID"),
     department_id: Optional[int] = Query(None, description="Filter by department ID (HR only)"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    audit_db: Session = Depends(get_db),
     current_user: Employee = Depends(get_current_user)
 ):
     """
@@ -48,7 +54,8 @@ async def export_attendance_csv(
         from_date=from_date,
         to_date=to_date,
         employee_id=employee_id,
-        department_id=department_id
+        department_id=department_id,
+        scope=request_visibility_scope(request, db, current_user),
     )
     
     # Generate filename
@@ -56,7 +63,7 @@ async def export_attendance_csv(
     
     # Log audit
     log_audit(
-        db=db,
+        db=audit_db,
         actor_id=current_user.id,
         action="REPORT_EXPORT",
         entity_type="report",
@@ -91,13 +98,15 @@ async def export_attendance_csv(
 
 @router.get("/leaves.csv")
 async def export_leaves_csv(
+    request: Request,
     from_date: date = Query(..., alias="from", description="Start date (YYYY-MM-DD)"),
     to_date: date = Query(..., alias="to", description="End date (YYYY-MM-DD)"),
     employee_id: Optional[int] = Query(None, description="Filter by employee ID"),
     department_id: Optional[int] = Query(None, description="Filter by department ID (HR only)"),
     status: Optional[str] = Query(None, description="Filter by status (PENDING, APPROVED, REJECTED)"),
     leave_type: Optional[str] = Query(None, description="Filter by leave type (CL, PL, SL, etc.)"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    audit_db: Session = Depends(get_db),
     current_user: Employee = Depends(get_current_user)
 ):
     """
@@ -127,7 +136,8 @@ async def export_leaves_csv(
         employee_id=employee_id,
         department_id=department_id,
         status_filter=status,
-        leave_type_filter=leave_type
+        leave_type_filter=leave_type,
+        scope=request_visibility_scope(request, db, current_user),
     )
     
     # Generate filename
@@ -135,7 +145,7 @@ async def export_leaves_csv(
     
     # Log audit
     log_audit(
-        db=db,
+        db=audit_db,
         actor_id=current_user.id,
         action="REPORT_EXPORT",
         entity_type="report",
@@ -178,10 +188,12 @@ async def export_leaves_csv(
 
 @router.get("/compoff.csv")
 async def export_compoff_csv(
+    request: Request,
     from_date: date = Query(..., alias="from", description="Start date (YYYY-MM-DD)"),
     to_date: date = Query(..., alias="to", description="End date (YYYY-MM-DD)"),
     employee_id: Optional[int] = Query(None, description="Filter by employee ID"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    audit_db: Session = Depends(get_db),
     current_user: Employee = Depends(get_current_user)
 ):
     """
@@ -203,7 +215,8 @@ async def export_compoff_csv(
         current_user=current_user,
         from_date=from_date,
         to_date=to_date,
-        employee_id=employee_id
+        employee_id=employee_id,
+        scope=request_visibility_scope(request, db, current_user),
     )
     
     # Generate filename
@@ -211,7 +224,7 @@ async def export_compoff_csv(
     
     # Log audit
     log_audit(
-        db=db,
+        db=audit_db,
         actor_id=current_user.id,
         action="REPORT_EXPORT",
         entity_type="report",
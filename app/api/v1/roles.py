@@ -10,6 +10,7 @@ from app.core.deps import get_db, require_roles
 from app.models.employee import Employee, Role
 from app.schemas.role import RoleCreate, RoleUpdate, RoleOut
 from app.services.role_service import create_role, list_roles, get_role, update_role
+from app.services.role_registry import role_registry
 
 
 router = APIRouter()
@@ -42,6 +43,16 @@ async def list_roles_endpoint(
     return list_roles(db, active_only=active_only)
 
 
+@router.get("/registry/stats")
+async def role_registry_stats_endpoint(
+    current_user: Employee = Depends(require_roles(Role.ADMIN)),
+):
+    """
+    In-process role registry counters (version, hits, misses) for this worker (Admin only).
+    """
+    return role_registry.stats()
+
+
 @router.patch("/{role_id}", response_model=RoleOut)
 async def update_role_endpoint(
     role_id: int,
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_db, get_read_db, get_current_user
 from app.models.employee import Employee
 from app.schemas.wfh import (
     WFHApplyRequest,
@@ -105,7 +105,7 @@ async def list_wfh_requests_endpoint(
     status: Optional[str] = Query(None, description="PENDING, APPROVED, REJECTED, CANCELLED"),
     department_id: Optional[int] = Query(None, description="Filter by department ID"),
     employee_id: Optional[int] = Query(None, description="Filter by employee (HR/ADMIN scope only)"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Employee = Depends(get_current_user),
 ):
     """
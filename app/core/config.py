@@ -38,6 +38,91 @@ class Settings(BaseSettings):
         description="If True, reject punch-in/out with 403 when is_mocked=True; if False, allow but mark session SUSPICIOUS",
     )
     
+    # Optional read replica for list/report/export endpoints (get_read_db)
+    DATABASE_REPLICA_URL: Optional[str] = Field(
+        default=None,
+        description="Read-only replica URL; unset = all reads go to DATABASE_URL",
+    )
+    READ_YOUR_WRITES_SECONDS: float = Field(
+        default=5.0,
+        ge=0,
+        description="After a caller's write, route their reads to the primary for this long",
+    )
+
+    # Database connection pool (applies to the sync and async engines)
+    DB_POOL_SIZE: int = Field(default=5, ge=1, description="Connections kept open in the pool")
+    DB_MAX_OVERFLOW: int = Field(default=10, ge=0, description="Extra connections allowed above DB_POOL_SIZE")
+    DB_POOL_TIMEOUT: float = Field(default=30.0, gt=0, description="Seconds to wait for a free connection")
+    DB_POOL_RECYCLE: int = Field(
+        default=1800,
+        ge=-1,
+        description="Recycle connections older than this many seconds (-1 = never)",
+    )
+    DB_POOL_PRE_PING: bool = Field(default=True, description="Test connections on checkout")
+
+    # Per-request SQL statistics (Server-Timing header, N+1 warnings)
+    QUERY_STATS_ENABLED: bool = Field(default=True, description="Count statements and DB time per request")
+    N_PLUS_ONE_THRESHOLD: int = Field(
+        default=5,
+        ge=2,
+        description="Log a probable N+1 when one statement shape repeats this often in a request",
+    )
+
+    # Slow-query log (GET /admin/db/slow-queries)
+    SLOW_QUERY_MS: float = Field(default=200.0, ge=0, description="Log statements at least this slow (ms); 0 disables")
+    SLOW_QUERY_EXPLAIN: bool = Field(
+        default=False,
+        description="Capture the plan of each slow SELECT fingerprint (EXPLAIN on PostgreSQL, EXPLAIN QUERY PLAN on SQLite)",
+    )
+    SLOW_QUERY_MAX_FINGERPRINTS: int = Field(default=500, ge=1, description="Distinct slow statements kept per worker")
+
+    # Password hashing cost parameters (defaults match argon2-cffi / bcrypt library defaults)
+    ARGON2_TIME_COST: int = Field(default=3, ge=1, description="Argon2 iterations (time cost)")
+    ARGON2_MEMORY_COST_KIB: int = Field(default=65536, ge=8, description="Argon2 memory cost in KiB")
+    ARGON2_PARALLELISM: int = Field(default=4, ge=1, description="Argon2 lanes (parallelism)")
+    BCRYPT_ROUNDS: int = Field(default=12, ge=4, le=31, description="Bcrypt log2 work factor")
+    PASSWORD_HASH_WORKERS: int = Field(
+        default=0,
+        ge=0,
+        description="Threads in the password hashing pool (0 = number of CPU cores)",
+    )
+
+    # Authenticated principal cache (token -> caller snapshot); 0 entries disables it
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = Field(default=10000, ge=0, description="Max cached tokens (LRU)")
+    PRINCIPAL_CACHE_TTL_SECONDS: int = Field(
+        default=300,
+        ge=1,
+        description="Max seconds a principal snapshot is reused (never beyond token exp)",
+    )
+
+    # Policy settings snapshots per year; updates in this process invalidate immediately
+    POLICY_CACHE_TTL_SECONDS: int = Field(
+        default=300,
+        ge=1,
+        description="Max seconds a cached policy year is reused (bounds staleness after updates in other workers)",
+    )
+
+    # Role name -> rank registry; role writes in this process invalidate immediately
+    ROLE_REGISTRY_TTL_SECONDS: int = Field(
+        default=300,
+        ge=1,
+        description="Max seconds the loaded role ranks are reused (bounds staleness after edits elsewhere)",
+    )
+
+    # Work calendar (per-year holiday/event day flags); writes in this process invalidate immediately
+    WORK_CALENDAR_TTL_SECONDS: int = Field(
+        default=300,
+        ge=1,
+        description="Max seconds a cached year is reused (bounds staleness after writes in other workers)",
+    )
+
+    # Bulk monthly accrual: employees per upsert + checkpoint commit
+    ACCRUAL_CHUNK_SIZE: int = Field(
+        default=500,
+        ge=1,
+        description="Employees written per chunk by the monthly accrual run (each chunk commits with its checkpoint)",
+    )
+
     # Version (can be git SHA or semver)
     VERSION: Optional[str] = Field(default=None, description="Application version (git SHA or semver)")
     
@@ -65,6 +150,11 @@ class Settings(BaseSettings):
             "FCM_SERVICE_ACCOUNT_PATH",
         ),
     )
+    PUSH_SEND_WORKERS: int = Field(
+        default=4,
+        ge=1,
+        description="Threads that send push notifications off the request path",
+    )
     
     # Initial admin bootstrap settings
     INITIAL_ADMIN_EMAIL: str = Field(
@@ -80,9 +170,6 @@ class Settings(BaseSettings):
     _project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     _env_file = os.path.join(_project_root, ".env")
     
-    # Debug: print env file location
-    print(f"--- LOADING ENV FROM: {_env_file} ---")
-    
     model_config = SettingsConfigDict(env_file=_env_file, env_file_encoding="utf-8", extra="forbid")
     
     @field_validator("APP_ENV")
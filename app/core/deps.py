@@ -1,37 +1,39 @@
 """
 Dependencies and guards for FastAPI endpoints
 """
-from typing import Generator, List
+from typing import List
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.db.session import SessionLocal
+from app.db.session import get_db, get_read_db, get_async_db  # noqa: F401  (re-exported for endpoints)
 from app.core.security import decode_token
+from app.core.principal_cache import Principal, principal_cache
 from app.models.employee import Employee, Role
-from app.models.role import RoleModel
 
 
 security = HTTPBearer()
 
 
-def get_db() -> Generator:
-    """Dependency for getting database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-async def get_current_user(
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> Employee:
+) -> Principal:
     """
     Get current authenticated user from JWT token
+
+    Returns an immutable Principal snapshot (id, emp_code, role, role_rank,
+    department_id, active, reporting_manager_id), served from the principal cache
+    when the same token was seen recently, so repeat requests do not touch the DB.
+    Endpoints that need other Employee columns must load the row themselves.
+
+    Plain def (not async def): FastAPI runs it in the threadpool, so the blocking
+    Employee lookup and pool checkout on a cache miss never stall the event loop.
     """
     token = credentials.credentials
+
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
     
     try:
         payload = decode_token(token)
@@ -65,7 +67,19 @@ async def get_current_user(
             detail="Inactive user"
         )
     
-    return employee
+    from app.services.leave_service import get_role_rank
+
+    principal = Principal(
+        id=employee.id,
+        emp_code=employee.emp_code,
+        role=employee.role,
+        role_rank=get_role_rank(db, employee),
+        department_id=employee.department_id,
+        active=employee.active,
+        reporting_manager_id=employee.reporting_manager_id,
+    )
+    principal_cache.put(token, principal, payload.get("exp"))
+    return principal
 
 
 def require_roles(*allowed_roles: Role):
@@ -77,16 +91,13 @@ def require_roles(*allowed_roles: Role):
         async def hr_endpoint(user: Employee = Depends(require_roles(Role.HR))):
             ...
     """
-    def role_checker(current_user: Employee = Depends(get_current_user), db: Session = Depends(get_db)) -> Employee:
+    def role_checker(current_user: Principal = Depends(get_current_user)) -> Principal:
         # Allow ADMIN superuser access regardless of required roles
         if current_user.role == Role.ADMIN:
             return current_user
         
         # Check if user has role rank 1 (ADMIN equivalent)
-        role_model = db.query(RoleModel).filter(
-            func.lower(RoleModel.name) == func.lower(current_user.role)
-        ).first()
-        if role_model and role_model.role_rank == 1:
+        if current_user.role_rank == 1:
             return current_user
         
         if current_user.role not in allowed_roles:
@@ -98,14 +109,12 @@ def require_roles(*allowed_roles: Role):
     return role_checker
 
 
-def require_admin_attendance(current_user: Employee = Depends(get_current_user), db: Session = Depends(get_db)) -> Employee:
+def require_admin_attendance(current_user: Principal = Depends(get_current_user)) -> Principal:
     """
     Allow access based on role-rank hierarchy (ADMIN/MD/VP: all; MANAGER: direct reportees; EMPLOYEE: none).
     Uses the same role-based scoping as leaves.
     """
-    from app.services.leave_service import get_role_rank
-    
-    current_user_rank = get_role_rank(db, current_user)
+    current_user_rank = current_user.role_rank
     
     # ADMIN, MD, VP (role_rank <= 3) can access all attendance
     if current_user_rank <= 3:
@@ -0,0 +1,65 @@
+"""
+ASGI middleware
+"""
+from app.core.config import settings
+from app.db import query_stats
+from app.db.read_routing import recent_writers
+
+# Methods that never write; everything else counts as a write when it succeeds
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReadYourWritesMiddleware:
+    """Record callers whose mutating request succeeded so get_read_db keeps them on the primary"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in _SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                for name, value in scope.get("headers", []):
+                    if name == b"authorization":
+                        recent_writers.mark(value.decode("latin-1"))
+                        break
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class QueryStatsMiddleware:
+    """
+    Count SQL statements and DB time per request.
+
+    Adds `Server-Timing: db;dur=<ms>;desc="<n> queries"` to every response and logs
+    statement shapes repeated N_PLUS_ONE_THRESHOLD+ times as probable N+1.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = query_stats.begin_request()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            query_stats.end_request(token)
+            query_stats.log_probable_n_plus_one(
+                stats, f"{scope['method']} {scope['path']}", settings.N_PLUS_ONE_THRESHOLD
+            )
@@ -0,0 +1,106 @@
+"""
+Principal cache for authenticated requests
+
+Maps a bearer token (by SHA-256 hash) to a compact, immutable snapshot of the
+caller so repeat requests with the same token need no DB round-trip to identify
+the user. Entries never outlive the token's `exp` claim and are evicted when the
+employee or their role changes.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable snapshot of the authenticated employee (what guards and services read)"""
+    id: int
+    emp_code: str
+    role: str
+    role_rank: int
+    department_id: Optional[int]
+    active: bool
+    reporting_manager_id: Optional[int]
+
+
+class PrincipalCache:
+    """Thread-safe bounded LRU of token hash -> (Principal, expires_at)"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Principal, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Principal]:
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            principal, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return principal
+
+    def put(self, token: str, principal: Principal, token_exp: Optional[float]) -> None:
+        """Cache principal until min(now + TTL, token exp). Tokens without exp are not cached."""
+        if self.max_entries <= 0 or token_exp is None:
+            return
+        expires_at = min(time.time() + self.ttl_seconds, float(token_exp))
+        if expires_at <= time.time():
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (principal, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def evict_employee(self, employee_id: int) -> int:
+        """Drop every cached token belonging to employee_id. Returns number evicted."""
+        with self._lock:
+            keys = [k for k, (p, _) in self._entries.items() if p.id == employee_id]
+            for k in keys:
+                del self._entries[k]
+        return len(keys)
+
+    def evict_role(self, role: str) -> int:
+        """Drop every cached token whose principal has this role (case-insensitive)."""
+        role_lower = role.lower()
+        with self._lock:
+            keys = [k for k, (p, _) in self._entries.items() if p.role.lower() == role_lower]
+            for k in keys:
+                del self._entries[k]
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
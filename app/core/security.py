@@ -1,12 +1,14 @@
 """
 Security utilities for authentication and authorization
 """
+import asyncio
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-import bcrypt
 from app.core.config import settings
 from app.core.constants import SYSTEM_CREDIT
 
@@ -16,31 +18,19 @@ logger = logging.getLogger(__name__)
 # Simple direct implementation to avoid passlib Windows issues
 # We'll implement our own hashing functions that use the underlying libraries directly
 
-# Track available backends
+# Track available backends (import only; the live self-test runs lazily, see run_hashing_self_test)
 argon2_available = False
 bcrypt_available = False
 
-# Test backends at startup
 try:
-    import argon2
-    # Test argon2
-    hasher = argon2.PasswordHasher()
-    test_hash = hasher.hash("test")
-    verified = hasher.verify(test_hash, "test")
-    if verified:
-        argon2_available = True
-        logger.info("Argon2 backend is available")
+    import argon2  # noqa: F401
+    argon2_available = True
 except Exception as e:
     logger.warning(f"Argon2 backend not available: {e}")
 
 try:
-    import bcrypt
-    # Test bcrypt
-    test_hash = bcrypt.hashpw(b"test", bcrypt.gensalt())
-    verified = bcrypt.checkpw(b"test", test_hash)
-    if verified:
-        bcrypt_available = True
-        logger.info("Bcrypt backend is available")
+    import bcrypt  # noqa: F401
+    bcrypt_available = True
 except Exception as e:
     logger.warning(f"Bcrypt backend not available: {e}")
 
@@ -50,20 +40,47 @@ if not argon2_available and not bcrypt_available:
     logger.critical(error_msg)
     raise RuntimeError(error_msg)
 
-logger.info(f"Available backends - Argon2: {argon2_available}, Bcrypt: {bcrypt_available}")
+# Result of the one-time hash/verify round-trip (None until /health or a caller runs it)
+_self_test_result: Optional[Dict[str, bool]] = None
 
 # Create simple passlib context for basic compatibility
 # We'll use it only for scheme detection, not actual hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Argon2 hasher configured from settings (built once; PasswordHasher is thread-safe)
+_argon2_hasher = None
+
+# Bounded pool for hashing/verification. argon2-cffi and bcrypt release the GIL while
+# hashing, so threads give real parallelism without blocking the event loop.
+_hash_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_argon2_hasher():
+    global _argon2_hasher
+    if _argon2_hasher is None:
+        import argon2
+        _argon2_hasher = argon2.PasswordHasher(
+            time_cost=settings.ARGON2_TIME_COST,
+            memory_cost=settings.ARGON2_MEMORY_COST_KIB,
+            parallelism=settings.ARGON2_PARALLELISM,
+        )
+    return _argon2_hasher
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        workers = settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+        _hash_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+        logger.info("Password hashing pool started with %s workers", workers)
+    return _hash_executor
+
 
 def hash_password(password: str) -> str:
     """Hash a password using available backend (argon2 preferred, bcrypt fallback)"""
     if argon2_available:
         try:
-            import argon2
-            hasher = argon2.PasswordHasher()
-            return hasher.hash(password)
+            return _get_argon2_hasher().hash(password)
         except Exception as e:
             logger.warning(f"Argon2 hashing failed, falling back to bcrypt: {e}")
     
@@ -74,11 +91,17 @@ def hash_password(password: str) -> str:
         if len(password_bytes) > 72:
             # Truncate to 72 bytes for bcrypt compatibility
             password_bytes = password_bytes[:72]
-        return bcrypt.hashpw(password_bytes, bcrypt.gensalt()).decode('utf-8')
+        return bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode('utf-8')
     
     raise RuntimeError("No hashing backends available")
 
 
+async def hash_password_async(password: str) -> str:
+    """hash_password on the hashing pool; use from async def endpoints."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_hash_executor(), hash_password, password)
+
+
 def validate_password(password: str) -> str:
     """
     Validate and normalize password for hashing
@@ -164,9 +187,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     # Try argon2 first
     if argon2_available and hashed_password.startswith('$argon2'):
         try:
-            import argon2
-            hasher = argon2.PasswordHasher()
-            return hasher.verify(hashed_password, plain_password)
+            # Cost parameters are read from the hash itself, so old hashes still verify
+            return _get_argon2_hasher().verify(hashed_password, plain_password)
         except Exception:
             # If argon2 verification fails, try bcrypt
             pass
@@ -189,6 +211,12 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the hashing pool; use from async def endpoints."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_hash_executor(), verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: Dict, expires_minutes: Optional[int] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -241,6 +269,40 @@ def decode_token(token: str) -> Dict:
         raise ValueError("Invalid token")
 
 
+def run_hashing_self_test() -> Dict[str, bool]:
+    """
+    Hash and verify a throwaway password with each importable backend (once per process).
+
+    Deferred from import time to keep cold start fast; /health triggers it. A backend
+    that fails the round-trip is disabled so hash_password falls back to the other.
+    """
+    global _self_test_result, argon2_available, bcrypt_available
+    if _self_test_result is not None:
+        return _self_test_result
+
+    argon2_ok = False
+    if argon2_available:
+        try:
+            hasher = _get_argon2_hasher()
+            argon2_ok = hasher.verify(hasher.hash("test"), "test")
+        except Exception as e:
+            logger.warning(f"Argon2 backend self-test failed: {e}")
+
+    bcrypt_ok = False
+    if bcrypt_available:
+        try:
+            import bcrypt
+            bcrypt_ok = bcrypt.checkpw(b"test", bcrypt.hashpw(b"test", bcrypt.gensalt(rounds=4)))
+        except Exception as e:
+            logger.warning(f"Bcrypt backend self-test failed: {e}")
+
+    argon2_available = argon2_ok
+    bcrypt_available = bcrypt_ok
+    logger.info(f"Available backends - Argon2: {argon2_ok}, Bcrypt: {bcrypt_ok}")
+    _self_test_result = {"argon2": argon2_ok, "bcrypt": bcrypt_ok}
+    return _self_test_result
+
+
 def check_hashing_backend() -> Dict[str, str]:
     """
     Runtime check for hashing backend availability
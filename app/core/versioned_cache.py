@@ -0,0 +1,69 @@
+"""
+Versioned TTL cache
+
+The building block behind the process-wide caches (role registry, policy
+snapshots, work calendar): a keyed map of loaded values, each reused until it
+is invalidated in this process or its TTL passes (writes by other workers).
+
+Loads run outside the lock, so a slow query never blocks readers of other
+keys. invalidate() bumps the version; a load that started before the bump does
+not install its (possibly stale) result.
+"""
+import threading
+import time
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class VersionedCache(Generic[V]):
+    """Thread-safe key -> (loaded_at, value) map with hit/miss counters"""
+
+    def __init__(self, ttl_seconds: Callable[[], float]):
+        # Read on every lookup so settings changes (and test overrides) apply at once
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, V]] = {}
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, load: Callable[[], V]) -> V:
+        """Cached value for key, else load() (installed unless invalidated meanwhile)"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and now - cached[0] < self._ttl_seconds():
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+            version = self.version
+        value = load()
+        with self._lock:
+            if self.version == version:
+                self._entries[key] = (now, value)
+        return value
+
+    def peek(self, key: Hashable) -> Optional[V]:
+        """Loaded value for key (even if expired) without counting a hit; None if absent"""
+        with self._lock:
+            cached = self._entries.get(key)
+        return cached[1] if cached is not None else None
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key (or every key) so the next lookup reloads it"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self.version += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,87 @@
+"""
+Keyset (cursor) pagination on a (timestamp, id) sort key
+
+Pages are cut with WHERE (ts, id) < / > (last ts, last id) instead of OFFSET,
+so a page costs the same at any depth and rows inserted while a client pages
+never shift or duplicate items. The cursor handed to clients is opaque:
+url-safe base64 of the last row's key.
+
+SQLite stores DateTime values as text, and server-default timestamps have no
+fractional part while bound parameters always do; both sides are compared as
+julianday() there so equal instants compare equal. PostgreSQL compares the
+column directly and can use the (ts, id) index. changed_since() applies the
+same comparison to delta-sync filters.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, and_, func, literal, or_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(ts: datetime, row_id: int) -> str:
+    raw = json.dumps([ts.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """(ts, id) from a cursor; 400 if it was not produced by encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ts, row_id = json.loads(raw)
+        return datetime.fromisoformat(ts), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _comparable(query: Query, ts_column, value: datetime):
+    """(column, bound value) expressions under which equal instants compare equal"""
+    if query.session.get_bind().dialect.name == "sqlite":
+        return func.julianday(ts_column), func.julianday(literal(value, DateTime()))
+    return ts_column, literal(value, DateTime(timezone=True))
+
+
+def changed_since(query: Query, ts_column, since: datetime) -> Query:
+    """Filter `query` to rows whose ts_column is at or after `since`"""
+    ts_key, since_key = _comparable(query, ts_column, since)
+    return query.filter(ts_key >= since_key)
+
+
+def paginate(
+    query: Query,
+    ts_column,
+    id_column,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    descending: bool = False,
+) -> Tuple[list, Optional[str]]:
+    """
+    Order `query` by (ts_column, id_column), resume after `cursor` and return
+    (rows, next_cursor). next_cursor is None on the last page. Without a limit
+    every remaining row is returned.
+    """
+    if cursor:
+        last_ts, last_id = decode_cursor(cursor)
+        ts_key, last_key = _comparable(query, ts_column, last_ts)
+        if descending:
+            query = query.filter(or_(ts_key < last_key, and_(ts_key == last_key, id_column < last_id)))
+        else:
+            query = query.filter(or_(ts_key > last_key, and_(ts_key == last_key, id_column > last_id)))
+
+    if descending:
+        query = query.order_by(ts_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(ts_column.asc(), id_column.asc())
+
+    if limit is None:
+        return query.all(), None
+    # One extra row tells whether another page exists
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, ts_column.key), getattr(last, id_column.key))
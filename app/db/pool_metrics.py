@@ -0,0 +1,137 @@
+"""
+Connection pool metrics
+
+PoolMetrics attaches to an engine's pool through SQLAlchemy pool events
+(connect / checkout / checkin / invalidate) and tracks in-use and overflow
+counts. Checkout wait time is recorded by InstrumentedQueuePool (sync engines)
+and InstrumentedAsyncAdaptedQueuePool (async engines), which time each blocking
+checkout (including the ones that end in a QueuePool timeout).
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Rolling window of recent checkout waits used for the percentiles
+_WAIT_WINDOW = 1000
+
+
+def percentile(ordered, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence (0.0 if empty)"""
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[idx]
+
+
+class PoolMetrics:
+    """Counters for one engine's pool (thread-safe)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._engine: Optional[Engine] = None
+        self._waits_ms: Deque[float] = deque(maxlen=_WAIT_WINDOW)
+        self.connects_total = 0
+        self.checkouts_total = 0
+        self.checkins_total = 0
+        self.invalidations_total = 0
+        self.timeouts_total = 0
+        self.max_wait_ms = 0.0
+
+    def attach(self, engine: Engine) -> "PoolMetrics":
+        pool = engine.pool
+        self._engine = engine
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+        event.listen(pool, "invalidate", self._on_invalidate)
+        if isinstance(pool, InstrumentedQueuePool):
+            pool.metrics = self
+        return self
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects_total += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.checkouts_total += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.checkins_total += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations_total += 1
+
+    def record_wait(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self._waits_ms.append(wait_ms)
+            if wait_ms > self.max_wait_ms:
+                self.max_wait_ms = wait_ms
+            if timed_out:
+                self.timeouts_total += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self._engine.pool if self._engine is not None else None
+        with self._lock:
+            waits = sorted(self._waits_ms)
+            data: Dict[str, Any] = {
+                "name": self.name,
+                "pool_class": type(pool).__name__ if pool is not None else None,
+                "connects_total": self.connects_total,
+                "checkouts_total": self.checkouts_total,
+                "checkins_total": self.checkins_total,
+                "invalidations_total": self.invalidations_total,
+                "timeouts_total": self.timeouts_total,
+                "wait_ms_p50": round(percentile(waits, 50), 3),
+                "wait_ms_p95": round(percentile(waits, 95), 3),
+                "wait_ms_p99": round(percentile(waits, 99), 3),
+                "wait_ms_max": round(self.max_wait_ms, 3),
+            }
+        if isinstance(pool, QueuePool):
+            data.update(
+                {
+                    "pool_size": pool.size(),
+                    "in_use": pool.checkedout(),
+                    "idle": pool.checkedin(),
+                    "overflow": max(pool.overflow(), 0),
+                    "max_overflow": pool._max_overflow,
+                }
+            )
+        return data
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited to its PoolMetrics"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_wait((time.perf_counter() - started) * 1000.0, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait((time.perf_counter() - started) * 1000.0)
+        return conn
+
+    def recreate(self):
+        # Pool.recreate() is used on dispose(); keep reporting to the same metrics
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool (create_async_engine's default) with the same checkout wait timing"""
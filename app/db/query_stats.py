@@ -0,0 +1,121 @@
+"""
+Per-request SQL statement counting
+
+Statement timings from app.db.statement_timing feed the RequestQueryStats
+bound to the current request (a ContextVar set by QueryStatsMiddleware). Each
+request gets a count, total DB time, the number of COMMITs and a tally of
+statement shapes; a shape repeated N_PLUS_ONE_THRESHOLD times or more is logged as a probable N+1.
+
+count_queries() counts every statement on every engine for the duration of a
+block; the query_budget test fixture is built on it. count_commits() does the
+same for transaction commits.
+"""
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.db.statement_timing import on_statement
+
+logger = logging.getLogger(__name__)
+
+
+class RequestQueryStats:
+    """Statements executed while handling one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.commits = 0
+        self.total_ms = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        # Statements reach the cursor with bound-parameter placeholders, so the
+        # SQL text is already the shape (identical for every row of an N+1 loop)
+        self.count += 1
+        self.total_ms += duration_ms
+        self.shapes[statement] += 1
+
+    def repeated(self, threshold: int):
+        """(statement, times) for shapes executed at least threshold times, most frequent first"""
+        return [(stmt, n) for stmt, n in self.shapes.most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        commits = f", {self.commits} commits" if self.commits else ""
+        return f'db;dur={self.total_ms:.2f};desc="{self.count} queries{commits}"'
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def begin_request() -> "tuple[RequestQueryStats, object]":
+    """Bind fresh stats to the current context; returns (stats, token for end_request)."""
+    stats = RequestQueryStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+def log_probable_n_plus_one(stats: RequestQueryStats, label: str, threshold: int) -> None:
+    for statement, times in stats.repeated(threshold):
+        logger.warning(
+            "Probable N+1 in %s: same statement executed %s times (%s queries total): %s",
+            label,
+            times,
+            stats.count,
+            " ".join(statement.split())[:300],
+        )
+
+
+@on_statement
+def _record_statement(conn, statement, parameters, executemany, duration_ms):
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, duration_ms)
+
+
+@event.listens_for(Engine, "commit")
+def _commit(conn):
+    stats = _current.get()
+    if stats is not None:
+        stats.commits += 1
+
+
+@contextmanager
+def count_queries() -> Iterator[List[str]]:
+    """Collect every statement executed on any engine (any thread) inside the block."""
+    statements: List[str] = []
+
+    def _collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "after_cursor_execute", _collect)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "after_cursor_execute", _collect)
+
+
+@contextmanager
+def count_commits() -> Iterator[List[object]]:
+    """Collect the connection of every transaction committed on any engine inside the block."""
+    commits: List[object] = []
+
+    def _collect(conn):
+        commits.append(conn)
+
+    event.listen(Engine, "commit", _collect)
+    try:
+        yield commits
+    finally:
+        event.remove(Engine, "commit", _collect)
@@ -0,0 +1,93 @@
+"""
+Read-your-writes tracking for replica routing
+
+After a caller's successful write, get_read_db sends that caller's reads to the
+primary for READ_YOUR_WRITES_SECONDS so replica lag never hides their own
+change. Callers are identified by a hash of the bearer token (same key as the
+principal cache), so no DB lookup is needed to decide the route.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# Upper bound on tracked callers; oldest entries are dropped first
+_MAX_TRACKED = 10000
+
+
+def _caller_key(authorization: Optional[str]) -> Optional[str]:
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return hashlib.sha256(token.strip().encode("utf-8")).hexdigest()
+
+
+class RecentWriters:
+    """Thread-safe map of caller -> time of last successful write"""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._writes: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, authorization: Optional[str]) -> None:
+        key = _caller_key(authorization)
+        if key is None:
+            return
+        with self._lock:
+            self._writes[key] = time.monotonic()
+            self._writes.move_to_end(key)
+            while len(self._writes) > _MAX_TRACKED:
+                self._writes.popitem(last=False)
+
+    def is_recent(self, authorization: Optional[str]) -> bool:
+        key = _caller_key(authorization)
+        if key is None:
+            return False
+        with self._lock:
+            written_at = self._writes.get(key)
+            if written_at is None:
+                return False
+            if time.monotonic() - written_at > self.window_seconds:
+                del self._writes[key]
+                return False
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._writes.clear()
+
+
+recent_writers = RecentWriters(window_seconds=settings.READ_YOUR_WRITES_SECONDS)
+
+
+class ReadOnlySessionError(RuntimeError):
+    """A write was attempted through a get_read_db session"""
+
+
+def _refuse_flush(session, flush_context, instances) -> None:
+    raise ReadOnlySessionError("Write attempted through a read-only (get_read_db) session")
+
+
+def _refuse_dml(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        raise ReadOnlySessionError("Write attempted through a read-only (get_read_db) session")
+
+
+def read_only(session: Session) -> Session:
+    """
+    Make session refuse ORM flushes and INSERT/UPDATE/DELETE statements. Applied to every
+    get_read_db session, including the primary fallback, so an endpoint that
+    writes fails the same way in tests and with or without a replica.
+    """
+    event.listen(session, "before_flush", _refuse_flush)
+    event.listen(session, "do_orm_execute", _refuse_dml)
+    return session
@@ -1,21 +1,110 @@
 """
 Database session management
 """
+from typing import AsyncGenerator
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 from app.db.base import Base
+from app.db.pool_metrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, PoolMetrics
+from app.db.read_routing import read_only, recent_writers
+from app.db import slow_query_log as _slow_query_log  # noqa: F401  (registers engine listeners)
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def pool_kwargs(url: str) -> dict:
+    """
+    Pool arguments from Settings (DB_POOL_*) for create_engine / create_async_engine.
+
+    In-memory SQLite keeps SQLAlchemy's single-connection pool, which takes no sizing.
+    """
+    if _is_memory_sqlite(url):
+        return {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
 
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=False
+    echo=False,
+    **({} if _is_memory_sqlite(settings.DATABASE_URL) else {"poolclass": InstrumentedQueuePool}),
+    **pool_kwargs(settings.DATABASE_URL),
 )
+pool_metrics = PoolMetrics("primary").attach(engine)
 
 # Tables are managed by Alembic migrations for PostgreSQL
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica (DATABASE_REPLICA_URL) for list/report/export queries
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(
+        settings.DATABASE_REPLICA_URL,
+        echo=False,
+        **({} if _is_memory_sqlite(settings.DATABASE_REPLICA_URL) else {"poolclass": InstrumentedQueuePool}),
+        **pool_kwargs(settings.DATABASE_REPLICA_URL),
+    )
+    replica_pool_metrics = PoolMetrics("replica").attach(replica_engine)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+else:
+    replica_engine = None
+    replica_pool_metrics = None
+    ReadSessionLocal = None
+
+
+# Async drivers for the non-blocking data path (same database as the sync engine)
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def to_async_database_url(url: str) -> str:
+    """
+    Map a sync DATABASE_URL to its async-driver equivalent.
+
+    sqlite:///x.db -> sqlite+aiosqlite:///x.db
+    postgresql://... / postgresql+psycopg2://... -> postgresql+asyncpg://...
+    URLs that already name an async driver are returned unchanged.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    async_driver = _ASYNC_DRIVERS.get(backend)
+    if async_driver is None or parsed.drivername in ("sqlite+aiosqlite", "postgresql+asyncpg"):
+        return url
+    return parsed.set(drivername=async_driver).render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(
+    to_async_database_url(settings.DATABASE_URL),
+    echo=False,
+    **({} if _is_memory_sqlite(settings.DATABASE_URL) else {"poolclass": InstrumentedAsyncAdaptedQueuePool}),
+    **pool_kwargs(settings.DATABASE_URL),
+)
+async_pool_metrics = PoolMetrics("primary_async").attach(async_engine.sync_engine)
+
+# expire_on_commit=False: ORM objects returned from async endpoints must stay readable
+# after commit without an implicit (blocking) refresh.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 
 def get_db():
     """Dependency for getting database session"""
@@ -24,3 +113,28 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db(request: Request):
+    """
+    Dependency for read-only endpoints (lists, reports, exports).
+
+    Uses the replica when DATABASE_REPLICA_URL is set, except for callers who wrote
+    within the last READ_YOUR_WRITES_SECONDS, who stay on the primary. The session
+    refuses writes (ReadOnlySessionError) on either database; write audit rows etc.
+    through a separate get_db session.
+    """
+    factory = SessionLocal
+    if ReadSessionLocal is not None and not recent_writers.is_recent(request.headers.get("authorization")):
+        factory = ReadSessionLocal
+    db = read_only(factory())
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting an async database session (use from async def endpoints)"""
+    async with AsyncSessionLocal() as db:
+        yield db
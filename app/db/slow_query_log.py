@@ -0,0 +1,171 @@
+"""
+Slow-query log
+
+Statement timings from app.db.statement_timing (shared with the per-request
+query stats) at or above SLOW_QUERY_MS are logged and aggregated by
+fingerprint (SQL with placeholders and IN-lists normalized) together with the
+bound-parameter shape and the app function that issued them. With
+SLOW_QUERY_EXPLAIN on, the first slow occurrence of each SELECT fingerprint
+also captures its plan: EXPLAIN (ANALYZE off) on PostgreSQL, EXPLAIN QUERY
+PLAN on SQLite.
+"""
+import hashlib
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.db.statement_timing import on_statement
+
+logger = logging.getLogger(__name__)
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+_DB_DIR = os.path.join(_APP_DIR, "db") + os.sep
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(_APP_DIR))
+
+_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|\$\d+|:\w+|%s")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """SQL shape: placeholders -> ?, IN (?, ?, ...) -> IN (?...), literals -> ?, whitespace collapsed"""
+    sql = _WHITESPACE_RE.sub(" ", statement).strip()
+    sql = _PLACEHOLDER_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    return _IN_LIST_RE.sub("(?...)", sql)
+
+
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize_statement(statement).encode("utf-8")).hexdigest()[:16]
+
+
+def parameter_shape(parameters: Any, executemany: bool) -> str:
+    """Types of bound parameters (values are never stored)"""
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = parameters[0] if parameters else None
+        return f"executemany[{len(parameters)}] x {parameter_shape(first, False)}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+def _calling_function() -> Optional[str]:
+    """Innermost app.* frame outside app.db (the service/endpoint that issued the statement)"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(_APP_DIR) and not filename.startswith(_DB_DIR):
+            module = os.path.relpath(filename, _PROJECT_ROOT)[:-3].replace(os.sep, ".")
+            return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return None
+
+
+@dataclass
+class SlowQueryStat:
+    fingerprint: str
+    statement: str
+    param_shape: str
+    caller: Optional[str]
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_seen: float = 0.0
+    plan: Optional[List[str]] = field(default=None)
+
+
+class SlowQueryLog:
+    """Bounded, thread-safe aggregate of slow statements by fingerprint"""
+
+    def __init__(self, max_fingerprints: int):
+        self.max_fingerprints = max_fingerprints
+        self._stats: Dict[str, SlowQueryStat] = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, parameters: Any, executemany: bool, duration_ms: float) -> SlowQueryStat:
+        fp = fingerprint(statement)
+        with self._lock:
+            stat = self._stats.get(fp)
+            if stat is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    # Make room by dropping the fingerprint with the least total time
+                    del self._stats[min(self._stats.values(), key=lambda s: s.total_ms).fingerprint]
+                stat = SlowQueryStat(
+                    fingerprint=fp,
+                    statement=normalize_statement(statement),
+                    param_shape=parameter_shape(parameters, executemany),
+                    caller=_calling_function(),
+                )
+                self._stats[fp] = stat
+            stat.count += 1
+            stat.total_ms += duration_ms
+            stat.max_ms = max(stat.max_ms, duration_ms)
+            stat.last_seen = time.time()
+        return stat
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> List[Dict[str, Any]]:
+        with self._lock:
+            stats = sorted(self._stats.values(), key=lambda s: getattr(s, order_by), reverse=True)[:limit]
+            return [
+                {**asdict(s), "avg_ms": round(s.total_ms / s.count, 3) if s.count else 0.0}
+                for s in stats
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+slow_query_log = SlowQueryLog(max_fingerprints=settings.SLOW_QUERY_MAX_FINGERPRINTS)
+
+
+def _explain(conn, statement: str, parameters: Any) -> Optional[List[str]]:
+    """Plan for a SELECT via a raw DBAPI cursor (bypasses engine events, so no recursion)"""
+    if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        prefix = "EXPLAIN (ANALYZE off) "
+    elif dialect == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    else:
+        return None
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    if dialect == "sqlite":
+        # (id, parent, notused, detail)
+        return [str(row[-1]) for row in rows]
+    return [str(row[0]) for row in rows]
+
+
+@on_statement
+def _log_if_slow(conn, statement, parameters, executemany, duration_ms):
+    if settings.SLOW_QUERY_MS <= 0 or duration_ms < settings.SLOW_QUERY_MS:
+        return
+
+    stat = slow_query_log.record(statement, parameters, executemany, duration_ms)
+    logger.warning(
+        "Slow query %.1fms [%s] from %s: %s",
+        duration_ms,
+        stat.fingerprint,
+        stat.caller or "?",
+        stat.statement[:500],
+    )
+    if settings.SLOW_QUERY_EXPLAIN and stat.plan is None and not executemany:
+        try:
+            stat.plan = _explain(conn, statement, parameters)
+        except Exception as e:
+            logger.debug("EXPLAIN failed for %s: %s", stat.fingerprint, e)
@@ -0,0 +1,53 @@
+"""
+Statement timing shared by the per-request query stats and the slow-query log
+
+One set of engine-level cursor listeners times every statement once and hands
+(conn, statement, parameters, executemany, duration_ms) to each registered
+consumer, in registration order. Consumers register with on_statement() at
+import time.
+"""
+import logging
+import time
+from typing import Any, Callable, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+StatementConsumer = Callable[[Any, str, Any, bool, float], None]
+
+_START_KEY = "statement_start_time"
+_consumers: List[StatementConsumer] = []
+
+
+def on_statement(consumer: StatementConsumer) -> StatementConsumer:
+    """Register consumer(conn, statement, parameters, executemany, duration_ms); usable as a decorator"""
+    if consumer not in _consumers:
+        _consumers.append(consumer)
+    return consumer
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000.0
+    for consumer in _consumers:
+        consumer(conn, statement, parameters, executemany, duration_ms)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # after_cursor_execute doesn't fire for failed statements; drop their start time
+    conn = exception_context.connection
+    if conn is not None:
+        starts = conn.info.get(_START_KEY)
+        if starts:
+            starts.pop()
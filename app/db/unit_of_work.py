@@ -0,0 +1,76 @@
+"""
+Unit of work - one commit per request for multi-step writes
+
+Services end their writes with commit_or_flush(db, ...). Outside a unit of work
+that is the usual commit + refresh, so scripts and existing callers behave as
+before. Inside `with unit_of_work(db):` it only flushes: audit rows, wallet
+rows and the main insert/update all join one transaction that commits once
+when the block exits, or rolls back entirely if anything raises.
+
+Side effects that must only happen once the data is durable (push
+notifications) go through after_commit(db, fn): run immediately outside a
+unit of work, deferred until the commit inside one.
+"""
+import logging
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_ACTIVE_KEY = "unit_of_work"
+_AFTER_COMMIT_KEY = "unit_of_work_after_commit"
+
+
+def in_unit_of_work(db: Session) -> bool:
+    return bool(db.info.get(_ACTIVE_KEY))
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """
+    Commit once at the end of the block; roll back on any exception.
+    A nested block joins the outer one.
+    """
+    if in_unit_of_work(db):
+        yield db
+        return
+    db.info[_ACTIVE_KEY] = True
+    db.info[_AFTER_COMMIT_KEY] = []
+    try:
+        yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        db.info.pop(_AFTER_COMMIT_KEY, None)
+        raise
+    finally:
+        db.info.pop(_ACTIVE_KEY, None)
+    for fn in db.info.pop(_AFTER_COMMIT_KEY, []):
+        _run(fn)
+
+
+def commit_or_flush(db: Session, *refresh: object) -> None:
+    """db.commit() then refresh each object; only db.flush() inside a unit of work"""
+    if in_unit_of_work(db):
+        db.flush()
+        return
+    db.commit()
+    for obj in refresh:
+        db.refresh(obj)
+
+
+def after_commit(db: Session, fn: Callable[[], None]) -> None:
+    """Run fn now, or after the enclosing unit of work commits (never after a rollback)"""
+    if in_unit_of_work(db):
+        db.info[_AFTER_COMMIT_KEY].append(fn)
+    else:
+        _run(fn)
+
+
+def _run(fn: Callable[[], None]) -> None:
+    try:
+        fn()
+    except Exception:
+        logger.exception("after-commit callback failed")
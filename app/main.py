@@ -19,6 +19,7 @@ from app.core.errors import (
     generic_exception_handler
 )
 from app.core.logging import setup_logging
+from app.core.middleware import QueryStatsMiddleware, ReadYourWritesMiddleware
 
 # Setup logging first
 setup_logging()
@@ -34,7 +35,8 @@ from app.constants import ROLE_ADMIN, ROLE_HR
 from datetime import date
 from sqlalchemy.exc import OperationalError
 from app.utils.production_reset import run_production_reset
-from app.services.push_service import diagnose_fcm_config, _ensure_firebase  # type: ignore
+from app.services.push_service import diagnose_fcm_config
+from app.services.policy_validator import ensure_policy_schema
 
 
 def _mask_database_url(url: str) -> str:
@@ -70,6 +72,13 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Keep callers on the primary right after their own writes (read-replica routing)
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Per-request SQL count/time (Server-Timing header) and N+1 warnings
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+
 # Register exception handlers
 app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
@@ -85,6 +94,7 @@ app.mount("/storage", StaticFiles(directory="storage"), name="storage")
 @app.on_event("startup")
 def startup_log_config() -> None:
     """Log config at startup for verification."""
+    logger.info("Env file: %s", settings.model_config.get("env_file"))
     masked_db = _mask_database_url(settings.DATABASE_URL)
     logger.info("DATABASE_URL (app): %s", masked_db)
     
@@ -95,10 +105,7 @@ def startup_log_config() -> None:
         bool(settings.R2_ACCESS_KEY_ID),
         settings.R2_BUCKET
     )
-    try:
-        _ensure_firebase()
-    except Exception:
-        pass
+    # Firebase is initialized on first push (see push_service._ensure_firebase), not here
     fcm = diagnose_fcm_config()
     logger.info(
         "FCM Config: CONFIGURED_ENABLED=%s, EFFECTIVE_ENABLED=%s, SA_PATH=%s, SA_EXISTS=%s, INITIALIZED=%s, ERROR=%s",
@@ -223,6 +230,16 @@ def bootstrap_initial_admin() -> None:
         logger.error("Failed to initialize database session for admin bootstrap: %s", e)
 
 
+@app.on_event("startup")
+def probe_policy_schema() -> None:
+    """Run the SQLite policy_settings column probe once, not on every policy read."""
+    db = SessionLocal()
+    try:
+        ensure_policy_schema(db)
+    finally:
+        db.close()
+
+
 # Handle missing table errors with a clear message (sqlite3 / SQLAlchemy OperationalError)
 def _is_no_such_table(err: BaseException) -> bool:
     msg = str(err).lower()
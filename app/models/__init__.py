@@ -3,12 +3,14 @@ Database models
 """
 from app.models.department import Department
 from app.models.employee import Employee, Role
+from app.models.employee_hierarchy import EmployeeHierarchyClosure
 from app.models.manager_department import ManagerDepartment
 from app.models.audit_log import AuditLog
 from app.models.attendance import AttendanceLog
 from app.models.leave import (
     LeaveRequest,
     LeaveApproval,
+    LeaveRequestMonthDays,
     LeaveBalance,
     LeaveTransaction,
     LeaveType,
@@ -19,6 +21,8 @@ from app.models.leave import (
 )
 from app.models.holiday import Holiday, RestrictedHoliday
 from app.models.policy import PolicySetting
+from app.models.accrual_run import AccrualRun, AccrualRunStatus
+from app.models.leave_balance_view import EmployeeLeaveBalanceView
 from app.models.compoff import CompoffRequest, CompoffLedger, CompoffRequestStatus, CompoffLedgerType
 from app.models.event import CompanyEvent
 from app.models.wfh import WFHRequest, WFHStatus
@@ -35,12 +39,14 @@ from app.models.notification_reminder import NotificationReminder, ReminderType,
 __all__ = [
     "Department",
     "Employee",
+    "EmployeeHierarchyClosure",
     "ManagerDepartment",
     "Role",
     "AuditLog",
     "AttendanceLog",
     "LeaveRequest",
     "LeaveApproval",
+    "LeaveRequestMonthDays",
     "LeaveBalance",
     "LeaveTransaction",
     "LeaveType",
@@ -51,6 +57,9 @@ __all__ = [
     "Holiday",
     "RestrictedHoliday",
     "PolicySetting",
+    "AccrualRun",
+    "AccrualRunStatus",
+    "EmployeeLeaveBalanceView",
     "CompoffRequest",
     "CompoffLedger",
     "CompoffRequestStatus",
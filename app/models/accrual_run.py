@@ -0,0 +1,38 @@
+"""
+Accrual run checkpoint model
+"""
+import enum
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Enum as SQLEnum, UniqueConstraint, text
+from app.db.base import Base
+
+
+class AccrualRunStatus(str, enum.Enum):
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class AccrualRun(Base):
+    """
+    Checkpoint of a bulk monthly accrual run: one row per (year, month).
+    last_employee_id is advanced in the same commit as each chunk's balance
+    writes, so a failed or interrupted run resumes with the first unwritten chunk.
+    """
+    __tablename__ = "accrual_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    status = Column(SQLEnum(AccrualRunStatus), nullable=False, default=AccrualRunStatus.RUNNING)
+    chunk_size = Column(Integer, nullable=False)
+    last_employee_id = Column(Integer, nullable=True)  # Highest employee id written (NULL: none yet)
+    credited_count = Column(Integer, nullable=False, default=0)
+    chunks_done = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    started_by = Column(Integer, ForeignKey("employees.id"), nullable=True)
+    started_at = Column(DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("year", "month", name="uq_accrual_runs_year_month"),
+    )
@@ -1,7 +1,7 @@
 """
 Attendance session and event models (punch in/out with sessions and immutable event log).
 """
-from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, String, Text, JSON, Enum as SQLEnum
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, String, Text, JSON, Enum as SQLEnum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -46,6 +46,11 @@ class AttendanceSession(Base):
     employee = relationship("Employee", backref="attendance_sessions")
     events = relationship("AttendanceEvent", back_populates="session", order_by="AttendanceEvent.event_at")
 
+    __table_args__ = (
+        # punch in/out: open session for (employee, work_date)
+        Index('ix_attendance_sessions_employee_date_status', 'employee_id', 'work_date', 'status'),
+    )
+
 
 class AttendanceEvent(Base):
     __tablename__ = "attendance_events"
@@ -1,7 +1,7 @@
 """
 Audit log model
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from app.db.base import Base
 
@@ -17,3 +17,8 @@ class AuditLog(Base):
     meta_json = Column(JSON, nullable=True)  # Additional metadata as JSON
     # Note: server_default handled by migration (CURRENT_TIMESTAMP for SQLite, now() for PostgreSQL)
     created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        # History of one entity, newest first
+        Index('ix_audit_logs_entity', 'entity_type', 'entity_id', 'created_at'),
+    )
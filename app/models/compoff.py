@@ -59,4 +59,6 @@ class CompoffLedger(Base):
     __table_args__ = (
         Index('ix_compoff_ledger_employee_type', 'employee_id', 'entry_type'),
         Index('ix_compoff_ledger_employee_expires', 'employee_id', 'expires_on'),
+        # Available / expired credits: employee + CREDIT + expires_on range
+        Index('ix_compoff_ledger_employee_type_expires', 'employee_id', 'entry_type', 'expires_on'),
     )
@@ -1,7 +1,7 @@
 """
 Employee model
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, ForeignKey, Text, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -52,3 +52,11 @@ class Employee(Base):
     managed_departments = relationship("ManagerDepartment", back_populates="manager", cascade="all, delete-orphan")
     leave_requests = relationship("LeaveRequest", foreign_keys="LeaveRequest.employee_id", back_populates="employee")
     approved_leave_requests = relationship("LeaveRequest", foreign_keys="LeaveRequest.approver_id", back_populates="approver")
+
+    __table_args__ = (
+        # Direct reports of a manager (partial on PostgreSQL: active employees only)
+        Index(
+            'ix_employees_manager_active', 'reporting_manager_id', 'active',
+            postgresql_where=text("active = true"),
+        ),
+    )
@@ -0,0 +1,23 @@
+"""
+Employee hierarchy closure model (materialized reporting tree)
+"""
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from app.db.base import Base
+
+
+class EmployeeHierarchyClosure(Base):
+    """
+    One row per (ancestor, descendant) pair in the reporting tree, including a
+    depth-0 row per employee. Maintained by app.services.hierarchy_service on
+    every flush that inserts an employee or changes reporting_manager_id.
+    """
+    __tablename__ = "employee_hierarchy_closure"
+
+    ancestor_id = Column(Integer, ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        # "Is X in Y's chain" / ancestors of X
+        Index("ix_employee_hierarchy_closure_descendant", "descendant_id", "ancestor_id"),
+    )
@@ -21,6 +21,7 @@ class Holiday(Base):
 
     __table_args__ = (
         UniqueConstraint('year', 'date', name='uq_holiday_year_date'),
+        Index('ix_holidays_active_date', 'active', 'date'),
     )
 
 
@@ -16,7 +16,7 @@ from sqlalchemy import (
     Index,
     CheckConstraint,
 )
-from sqlalchemy import func
+from sqlalchemy import DDL, event, func
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import text
 import enum
@@ -103,10 +103,59 @@ class LeaveRequest(Base):
     # Indexes
     __table_args__ = (
         Index('ix_leave_requests_employee_dates', 'employee_id', 'from_date', 'to_date'),
+        # Pending approval queue, oldest first (partial on PostgreSQL)
+        Index(
+            'ix_leave_requests_status_applied_at', 'status', 'applied_at',
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+        # Keyset pages of leave lists (newest first) and delta sync
+        Index('ix_leave_requests_applied_at_id', 'applied_at', 'id'),
+        Index('ix_leave_requests_updated_at', 'updated_at'),
         CheckConstraint('from_date <= to_date', name='check_from_date_le_to_date'),
     )
 
 
+# Full-day PENDING/APPROVED leaves of one employee may not overlap. Enforced by
+# the database so concurrent applies cannot both pass the overlap check:
+# a daterange GiST exclusion constraint on PostgreSQL (no locking), BEFORE
+# INSERT/UPDATE triggers on SQLite (writes are serialized there). Violations
+# mention this name; migration 043 adds the same objects to existing databases.
+LEAVE_OVERLAP_CONSTRAINT = "leave_requests_no_overlap"
+
+_OVERLAP_CANDIDATE = "duration = 'FULL_DAY' AND status IN ('PENDING', 'APPROVED')"
+
+event.listen(
+    LeaveRequest.__table__,
+    "after_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+event.listen(
+    LeaveRequest.__table__,
+    "after_create",
+    DDL(
+        f"ALTER TABLE leave_requests ADD CONSTRAINT {LEAVE_OVERLAP_CONSTRAINT} "
+        "EXCLUDE USING gist (employee_id WITH =, daterange(from_date, to_date, '[]') WITH &&) "
+        f"WHERE ({_OVERLAP_CANDIDATE})"
+    ).execute_if(dialect="postgresql"),
+)
+for _event, _columns, _self in (
+    ("INSERT", "", ""),
+    ("UPDATE", " OF employee_id, from_date, to_date, status, duration", " AND id != NEW.id"),
+):
+    event.listen(
+        LeaveRequest.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TRIGGER {LEAVE_OVERLAP_CONSTRAINT}_{_event.lower()} "
+            f"BEFORE {_event}{_columns} ON leave_requests "
+            "WHEN NEW.duration = 'FULL_DAY' AND NEW.status IN ('PENDING', 'APPROVED') "
+            f"BEGIN SELECT RAISE(ABORT, '{LEAVE_OVERLAP_CONSTRAINT}') WHERE EXISTS ("
+            f"SELECT 1 FROM leave_requests WHERE employee_id = NEW.employee_id AND {_OVERLAP_CANDIDATE} "
+            f"AND from_date <= NEW.to_date AND to_date >= NEW.from_date{_self}); END"
+        ).execute_if(dialect="sqlite"),
+    )
+
+
 class LeaveApproval(Base):
     __tablename__ = "leave_approvals"
 
@@ -126,6 +175,25 @@ class LeaveApproval(Base):
     approver = relationship("Employee", foreign_keys=[action_by])
 
 
+class LeaveRequestMonthDays(Base):
+    """
+    computed_days_by_month of a leave request as rows, one per "YYYY-MM" month.
+    Written alongside LeaveRequest by app.services.leave_month_days on every
+    flush that sets computed_days_by_month, so monthly totals (cap checks,
+    analytics) are a single SUM ... GROUP BY month.
+    """
+    __tablename__ = "leave_request_month_days"
+
+    leave_request_id = Column(Integer, ForeignKey("leave_requests.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(String(7), primary_key=True)  # "YYYY-MM"
+    days = Column(Numeric(5, 2), nullable=False)
+
+    __table_args__ = (
+        # Per-month analytics across employees
+        Index("ix_leave_request_month_days_month", "month", "leave_request_id"),
+    )
+
+
 # Wallet leave types (CL, SL, PL, RH, FL only - no COMPOFF/LWP)
 WALLET_LEAVE_TYPES = (LeaveType.CL, LeaveType.SL, LeaveType.PL, LeaveType.RH, LeaveType.FL)
 
@@ -154,6 +222,7 @@ class LeaveBalance(Base):
     used = Column(Numeric(5, 2), nullable=False, default=0)
     remaining = Column(Numeric(5, 2), nullable=False, default=0)
     carry_forward = Column(Numeric(5, 2), nullable=False, default=0)
+    accrued_as_of = Column(Date, nullable=True)  # Date `accrued` was computed for (NULL: never)
     created_at = Column(DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False)
     updated_at = Column(
         DateTime(timezone=True),
@@ -0,0 +1,40 @@
+"""
+Employee leave balance read model (admin balance grid)
+"""
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Numeric, ForeignKey, Index, Enum as SQLEnum, text
+from app.db.base import Base
+from app.models.leave import LeaveType
+
+
+class EmployeeLeaveBalanceView(Base):
+    """
+    One row per leave_balances row (wallet types) with the employee columns
+    the HR grid filters and sorts on, allocated = opening + accrued +
+    carry_forward, and eligible_from (PL/FL usable from that date; NULL: always).
+    Maintained by app.services.balance_view_service in the same transaction
+    as the balance / employee writes it mirrors.
+    """
+    __tablename__ = "employee_leave_balance_view"
+
+    employee_id = Column(Integer, ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    leave_type = Column(SQLEnum(LeaveType), primary_key=True)
+    emp_code = Column(String, nullable=False)
+    employee_name = Column(String, nullable=False)
+    department_id = Column(Integer, nullable=True)
+    active = Column(Boolean, nullable=False)
+    opening = Column(Numeric(5, 2), nullable=False)
+    accrued = Column(Numeric(5, 2), nullable=False)
+    used = Column(Numeric(5, 2), nullable=False)
+    remaining = Column(Numeric(5, 2), nullable=False)
+    carry_forward = Column(Numeric(5, 2), nullable=False)
+    allocated = Column(Numeric(6, 2), nullable=False)
+    eligible_from = Column(Date, nullable=True)
+    refreshed_at = Column(DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False)
+
+    __table_args__ = (
+        # Grid: year + department (+ leave type), employee order
+        Index("ix_employee_leave_balance_view_year_dept", "year", "department_id", "leave_type", "employee_id"),
+        # Grid: year + leave type, employee order
+        Index("ix_employee_leave_balance_view_year_type", "year", "leave_type", "employee_id"),
+    )
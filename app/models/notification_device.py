@@ -7,7 +7,7 @@ class NotificationDevice(Base):
     __tablename__ = "notification_devices"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("employees.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
     fcm_token = Column(String(512), unique=True, nullable=False, index=True)
     platform = Column(String(32), nullable=False)
     app_version = Column(String(64), nullable=True)
@@ -23,5 +23,9 @@ class NotificationDevice(Base):
     user = relationship("Employee")
 
     __table_args__ = (
-        Index("ix_notification_devices_user_id", "user_id"),
+        # Active devices of a user (partial on PostgreSQL); replaces the user_id-only index
+        Index(
+            "ix_notification_devices_user_active", "user_id", "is_active",
+            postgresql_where=text("is_active = true"),
+        ),
     )
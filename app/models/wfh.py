@@ -1,7 +1,7 @@
 """
 WFH (Work From Home) request model
 """
-from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, String, Text, Numeric, Enum as SQLEnum, UniqueConstraint
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, String, Text, Numeric, Enum as SQLEnum, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -36,4 +36,5 @@ class WFHRequest(Base):
 
     __table_args__ = (
         UniqueConstraint('employee_id', 'request_date', name='uq_wfh_employee_date'),
+        Index('ix_wfh_requests_employee_status_date', 'employee_id', 'status', 'request_date'),
     )
@@ -7,7 +7,7 @@ from pydantic import BaseModel, Field, model_validator, field_serializer
 from pydantic import ConfigDict
 from app.utils.datetime_utils import iso_ist
 from decimal import Decimal
-from app.models.leave import LeaveType, LeaveStatus, LeaveDuration, HalfDaySession
+from app.models.leave import ApprovalAction, LeaveType, LeaveStatus, LeaveDuration, HalfDaySession
 from app.schemas.employee import EmployeeOut
 
 
@@ -144,9 +144,75 @@ class LeaveListItemOut(BaseModel):
 
 
 class LeaveListResponse(BaseModel):
-    """Schema for leave list response"""
+    """Schema for leave list response. total counts the items in this page."""
     items: List[LeaveListItemOut]
     total: int
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= for the next page; null on the last page")
+
+
+# --- Leave quote (calendar picker preview) ---
+
+
+class LeaveQuoteCandidate(BaseModel):
+    """One candidate leave to price; same fields as an apply request"""
+    leave_type: LeaveType
+    from_date: date
+    to_date: date
+    duration: LeaveDuration = LeaveDuration.FULL_DAY
+    half_day_session: Optional[HalfDaySession] = None
+
+
+class LeaveQuoteRequest(BaseModel):
+    """POST /leaves/quote body"""
+    candidates: List[LeaveQuoteCandidate] = Field(..., min_length=1, max_length=100)
+
+
+class LeaveQuoteItemOut(BaseModel):
+    """Apply outcome for one candidate. valid=False carries the error apply would return."""
+    leave_type: LeaveType
+    from_date: date
+    to_date: date
+    valid: bool
+    error_status: Optional[int] = None
+    error_detail: Optional[str] = None
+    effective_leave_type: Optional[LeaveType] = None  # LWP when auto-converted (backdated)
+    duration: Optional[LeaveDuration] = None
+    half_day_session: Optional[HalfDaySession] = None
+    computed_days: Optional[float] = None
+    computed_days_by_month: Optional[Dict[str, float]] = None
+    paid_days: Optional[float] = None
+    lwp_days: Optional[float] = None
+    auto_converted_to_lwp: bool = False
+    auto_lwp_reason: Optional[str] = None
+    sandwich_dates: List[date] = []
+
+
+class LeaveQuoteResponse(BaseModel):
+    """POST /leaves/quote response, items in candidate order"""
+    items: List[LeaveQuoteItemOut]
+
+
+class LeaveBulkActionRequest(BaseModel):
+    """POST /leaves/bulk-action body. remarks are required for REJECT."""
+    leave_request_ids: List[int] = Field(..., min_length=1, max_length=200)
+    action: ApprovalAction = Field(..., description="APPROVE or REJECT")
+    remarks: Optional[str] = Field(None, description="Remarks recorded on every decided leave")
+
+
+class LeaveBulkActionItemOut(BaseModel):
+    """Outcome for one id. ok=False carries the error the single-item endpoint would return."""
+    leave_request_id: int
+    ok: bool
+    status: Optional[LeaveStatus] = None
+    error_status: Optional[int] = None
+    error_detail: Optional[str] = None
+
+
+class LeaveBulkActionResponse(BaseModel):
+    """POST /leaves/bulk-action response, items in request order (duplicates dropped)"""
+    items: List[LeaveBulkActionItemOut]
+    succeeded: int
+    failed: int
 
 
 # --- Leave balance (wallet) ---
@@ -212,10 +278,12 @@ class AdminBalanceItemOut(BaseModel):
 
 
 class AdminBalancesResponse(BaseModel):
-    """GET /admin/leaves/balances response."""
+    """GET /admin/leaves/balances response. total counts all matching rows, not just this page."""
     year: int
     items: List[AdminBalanceItemOut]
     total: int
+    offset: int = 0
+    limit: Optional[int] = None
 
 
 class LeaveTransactionOut(BaseModel):
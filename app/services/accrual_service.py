@@ -1,14 +1,30 @@
 """
 Accrual service - monthly leave crediting (uses leave wallet).
-Calls leave_wallet_service.ensure_wallet_for_employee with as_of = end of month.
+
+run_monthly_accrual is set-based: eligible employees are loaded as (id,
+join_date) pairs, mapped onto the twelve per-start-month accrual vectors from
+leave_wallet_service.accrual_by_start_month, and written as one bulk upsert
+per chunk of employees. Each chunk commits together with the AccrualRun
+checkpoint and its employee_leave_balance_view rows, so a failed run resumes
+after the last written employee.
 """
+import logging
+import time
 from datetime import date
-from typing import Dict, List
+from typing import Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.accrual_run import AccrualRun, AccrualRunStatus
 from app.models.employee import Employee
-from app.models.leave import LeaveBalance
+from app.models.leave import LeaveBalance, WALLET_LEAVE_TYPES
 from app.services.audit_service import log_audit
+from app.services import balance_view_service as balance_view
 from app.services import leave_wallet_service as wallet
+from app.utils.datetime_utils import now_utc
+
+logger = logging.getLogger(__name__)
 
 
 def _last_day_of_month(year: int, month: int) -> date:
@@ -35,74 +51,175 @@ def is_eligible_for_month_accrual(
     return employee.join_date <= month_end
 
 
+def _upsert_balances(db: Session, rows: List[Dict]) -> None:
+    """
+    INSERT wallet rows, or on (employee_id, year, leave_type) conflict set the
+    accrual snapshot and recompute remaining from the stored opening,
+    carry_forward and used.
+    """
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    table = LeaveBalance.__table__
+    stmt = dialect.insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.employee_id, table.c.year, table.c.leave_type],
+        set_={
+            "accrued": stmt.excluded.accrued,
+            "accrued_as_of": stmt.excluded.accrued_as_of,
+            "remaining": table.c.opening + stmt.excluded.accrued + table.c.carry_forward - table.c.used,
+            "updated_at": now_utc(),
+        },
+    )
+    # executemany: SQLAlchemy batches the rows into multi-row INSERTs within driver parameter limits
+    db.execute(stmt, rows)
+
+
+def _checkpoint(db: Session, year: int, month: int, chunk_size: int, actor_id: int, resume: bool) -> AccrualRun:
+    """The (year, month) checkpoint; restarted from the first employee unless resuming an unfinished run"""
+    run = db.query(AccrualRun).filter(AccrualRun.year == year, AccrualRun.month == month).first()
+    if run is None:
+        run = AccrualRun(year=year, month=month)
+        db.add(run)
+    elif resume and run.status != AccrualRunStatus.COMPLETED:
+        run.status = AccrualRunStatus.RUNNING
+        run.chunk_size = chunk_size
+        run.error = None
+        db.commit()
+        return run
+    run.status = AccrualRunStatus.RUNNING
+    run.chunk_size = chunk_size
+    run.last_employee_id = None
+    run.credited_count = 0
+    run.chunks_done = 0
+    run.error = None
+    run.started_by = actor_id
+    run.started_at = now_utc()
+    run.finished_at = None
+    db.commit()
+    return run
+
+
 def run_monthly_accrual(
     db: Session,
     year: int,
     month: int,
-    actor_id: int
+    actor_id: int,
+    chunk_size: Optional[int] = None,
+    resume: bool = True,
 ) -> Dict:
     """
-    Run monthly accrual: ensure wallet for all eligible employees with as_of = end of month.
-    Wallet computes accrued (CL/PL +1 per month, SL pro-rata annual, RH=1) and updates remaining.
+    Run monthly accrual: write wallet accrual as of end of month for every eligible employee.
+    Accrued is absolute for the month, so re-running is idempotent; resume=True continues an
+    unfinished run for the month after its checkpoint instead of starting over.
+    Stops at the first failing chunk (rolled back, error recorded on the run and in its chunk entry).
     """
     if month < 1 or month > 12:
         raise ValueError(f"Invalid month: {month}. Must be between 1 and 12.")
     target_month_key = f"{year:04d}-{month:02d}"
     as_of = _last_day_of_month(year, month)
+    chunk_size = chunk_size or settings.ACCRUAL_CHUNK_SIZE
 
-    employees = db.query(Employee).filter(Employee.active == True).all()
-    total_processed = 0
-    credited_count = 0
-    skipped_not_eligible = 0
-    skipped_inactive = 0
-    details = []
+    run = _checkpoint(db, year, month, chunk_size, actor_id, resume)
+    run_id = run.id
+    resumed_after = run.last_employee_id
+    credited_count = run.credited_count
+    chunks_done = run.chunks_done
 
-    for employee in employees:
-        total_processed += 1
-        if not employee.active:
-            skipped_inactive += 1
-            continue
-        if not is_eligible_for_month_accrual(employee, year, month):
-            skipped_not_eligible += 1
-            continue
+    employees = db.execute(
+        select(Employee.id, Employee.join_date)
+        .where(Employee.active == True, Employee.id > (resumed_after or 0))
+        .order_by(Employee.id)
+    ).all()
+    eligible = [(emp_id, join_date) for emp_id, join_date in employees if join_date <= as_of]
+    skipped_not_eligible = len(employees) - len(eligible)
+    vectors = wallet.accrual_by_start_month(db, year, as_of)
+
+    chunks = []
+    error = None
+    for index, offset in enumerate(range(0, len(eligible), chunk_size), start=chunks_done):
+        chunk = eligible[offset:offset + chunk_size]
+        started = time.perf_counter()
+        entry = {
+            "index": index,
+            "first_employee_id": chunk[0][0],
+            "last_employee_id": chunk[-1][0],
+            "employees": len(chunk),
+        }
         try:
-            wallet.ensure_wallet_for_employee(db, employee.id, year, as_of_date=as_of)
-            credited_count += 1
-            balances = db.query(LeaveBalance).filter(
-                LeaveBalance.employee_id == employee.id,
-                LeaveBalance.year == year,
-            ).all()
-            detail = {"employee_id": employee.id, "emp_code": employee.emp_code, "name": employee.name}
-            for b in balances:
-                detail[f"{b.leave_type.value.lower()}_remaining"] = float(b.remaining)
-            details.append(detail)
-        except Exception:
-            pass
+            rows = []
+            for emp_id, join_date in chunk:
+                accrued = vectors[join_date.month if join_date.year == year else 1]
+                for lt in WALLET_LEAVE_TYPES:
+                    rows.append({
+                        "employee_id": emp_id,
+                        "year": year,
+                        "leave_type": lt,
+                        "opening": 0,
+                        "accrued": accrued[lt],
+                        "used": 0,
+                        "remaining": accrued[lt],
+                        "carry_forward": 0,
+                        "accrued_as_of": as_of,
+                    })
+            _upsert_balances(db, rows)
+            balance_view.mark_stale(db, year, [emp_id for emp_id, _ in chunk])
+            db.query(AccrualRun).filter(AccrualRun.id == run_id).update(
+                {
+                    AccrualRun.last_employee_id: chunk[-1][0],
+                    AccrualRun.credited_count: AccrualRun.credited_count + len(chunk),
+                    AccrualRun.chunks_done: AccrualRun.chunks_done + 1,
+                },
+                synchronize_session=False,
+            )
+            db.commit()
+            credited_count += len(chunk)
+            entry["error"] = None
+        except Exception as exc:
+            db.rollback()
+            logger.exception("Accrual %s chunk %s failed", target_month_key, index)
+            error = f"chunk {index} (employees {chunk[0][0]}-{chunk[-1][0]}): {exc}"
+            entry["error"] = str(exc)
+        entry["seconds"] = round(time.perf_counter() - started, 4)
+        chunks.append(entry)
+        if error:
+            break
+
+    run = db.get(AccrualRun, run_id)
+    run.status = AccrualRunStatus.FAILED if error else AccrualRunStatus.COMPLETED
+    run.error = error
+    run.finished_at = now_utc()
 
     log_audit(
         db=db,
         actor_id=actor_id,
         action="ACCRUAL_RUN",
         entity_type="accrual",
-        entity_id=None,
+        entity_id=run_id,
         meta={
             "month": target_month_key,
             "year": year,
             "month_number": month,
-            "total_employees_processed": total_processed,
+            "status": run.status.value,
+            "resumed_after_employee_id": resumed_after,
+            "total_employees_processed": len(employees),
             "credited_count": credited_count,
             "skipped_not_eligible": skipped_not_eligible,
-            "skipped_inactive": skipped_inactive,
+            "chunks": len(chunks),
+            "failed_chunks": sum(1 for c in chunks if c["error"]),
         },
     )
     return {
         "month": target_month_key,
-        "total_employees_processed": total_processed,
+        "run_id": run_id,
+        "status": run.status.value,
+        "resumed_after_employee_id": resumed_after,
+        "total_employees_processed": len(employees),
         "credited_count": credited_count,
         "skipped_already_credited": 0,
         "skipped_not_eligible": skipped_not_eligible,
-        "skipped_inactive": skipped_inactive,
-        "details": details,
+        "skipped_inactive": 0,
+        "chunk_size": chunk_size,
+        "chunks": chunks,
+        "error": error,
     }
 
 
@@ -1,11 +1,11 @@
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
 from typing import List, Tuple
 from zoneinfo import ZoneInfo
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
 
 from app.models.attendance_daily import AttendanceDaily
-from app.models.holiday import Holiday
+from app.services.work_calendar import NON_WORKING, work_calendar
 from app.utils.datetime_utils import now_utc, to_ist, ensure_utc
 
 IST = ZoneInfo("Asia/Kolkata")
@@ -54,17 +54,7 @@ def _working_days_back(db: Session, upto: date, window: int) -> List[date]:
     Return the last `window` working days up to and including the last working day on/before `upto`.
     Sundays and active holidays are excluded.
     """
-    holidays = set(
-        d for (d,) in db.query(Holiday.date).filter(Holiday.active == True, Holiday.date <= upto).all()  # noqa: E712
-    )
-    days: List[date] = []
-    cur = upto
-    while len(days) < window:
-        is_sunday = cur.weekday() == 6
-        if not is_sunday and cur not in holidays:
-            days.append(cur)
-        cur = cur - timedelta(days=1)
-    return list(reversed(days))
+    return work_calendar.days_back(db, upto, window, NON_WORKING)
 
 
 def get_streak_and_consistency(
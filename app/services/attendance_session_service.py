@@ -6,13 +6,15 @@ import logging
 from datetime import datetime, date, timezone
 from zoneinfo import ZoneInfo
 from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+from sqlalchemy import and_, select
 from fastapi import HTTPException, status
 
 _log = logging.getLogger(__name__)
 
 from app.core.config import settings
+from app.db.unit_of_work import commit_or_flush
 from app.models.attendance_session import (
     AttendanceSession,
     AttendanceEvent,
@@ -22,6 +24,7 @@ from app.models.attendance_session import (
 from app.models.employee import Employee, Role
 from app.models.manager_department import ManagerDepartment
 from app.services.audit_service import log_audit
+from app.services.visibility_scope import VisibilityScope, resolve_visibility_scope
 from app.utils.json_serializer import sanitize_for_json
 from app.utils.datetime_utils import now_utc, ensure_utc
 from app.services.attendance_daily_service import upsert_daily_on_punch_in
@@ -113,16 +116,16 @@ def punch_in(
         created_by=employee_id,
     )
     db.add(event)
-    db.commit()
-    db.refresh(session)
+    db.flush()
 
-    # Upsert attendance_daily summary for streak/consistency
+    # Upsert attendance_daily summary for streak/consistency (best effort: a
+    # failure only rolls back its savepoint, never the punch)
     try:
-        upsert_daily_on_punch_in(db=db, user_id=employee_id, punch_in_at_utc=session.punch_in_at)
-        db.commit()
+        with db.begin_nested():
+            upsert_daily_on_punch_in(db=db, user_id=employee_id, punch_in_at_utc=now)
     except Exception:
-        db.rollback()
         _log.exception("Failed to upsert attendance_daily for user_id=%s", employee_id)
+    commit_or_flush(db, session)
 
     log_audit(
         db=db,
@@ -209,8 +212,7 @@ def punch_out(
         created_by=employee_id,
     )
     db.add(event)
-    db.commit()
-    db.refresh(session)
+    commit_or_flush(db, session)
 
     log_audit(
         db=db,
@@ -240,6 +242,20 @@ def get_today_session(db: Session, employee_id: int) -> Optional[AttendanceSessi
     )
 
 
+async def get_today_session_async(db: AsyncSession, employee_id: int) -> Optional[AttendanceSession]:
+    """Async variant of get_today_session for async endpoints (non-blocking DB I/O)."""
+    work_date = get_work_date()
+    result = await db.execute(
+        select(AttendanceSession)
+        .where(
+            AttendanceSession.employee_id == employee_id,
+            AttendanceSession.work_date == work_date,
+        )
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
 def list_my_sessions(
     db: Session,
     employee_id: int,
@@ -322,28 +338,20 @@ def _admin_employee_scope(db: Session, current_user: Employee):
     return [current_user.id]
 
 
-def _admin_employee_scope_role_rank(db: Session, current_user: Employee):
+def _admin_employee_scope_role_rank(
+    db: Session, current_user: Employee, scope: Optional[VisibilityScope] = None
+):
     """
     Return list of employee_ids the current user can see based on role-rank hierarchy.
     ADMIN/MD/VP: None (all access)
-    MANAGER: [current_user.id] + direct reportees
+    MANAGER: [current_user.id] + direct and indirect reportees
     EMPLOYEE: [current_user.id]
+    Pass the request's VisibilityScope to reuse it instead of resolving again.
     """
-    from app.services.leave_service import get_role_rank, get_subordinate_ids
-    
-    current_user_rank = get_role_rank(db, current_user)
-    
-    # ADMIN, MD, VP (role_rank <= 3): full access
-    if current_user_rank <= 3:
+    scope = scope or resolve_visibility_scope(db, current_user)
+    if scope.all:
         return None
-    
-    # MANAGER (role_rank == 4): self + direct reportees
-    if current_user_rank == 4:
-        subordinate_ids = get_subordinate_ids(db, current_user.id)
-        return [current_user.id] + subordinate_ids
-    
-    # EMPLOYEE and others: only self
-    return [current_user.id]
+    return sorted(scope.employee_ids)
 
 
 def admin_list_today(
@@ -352,6 +360,7 @@ def admin_list_today(
     department_id: Optional[int] = None,
     status_filter: Optional[str] = None,
     q: Optional[str] = None,
+    scope: Optional[VisibilityScope] = None,
 ) -> List[AttendanceSession]:
     """
     Admin: list today's sessions. HR/ADMIN see all; MANAGER only department/team.
@@ -368,7 +377,7 @@ def admin_list_today(
         .filter(AttendanceSession.work_date == work_date)
     )
 
-    emp_scope = _admin_employee_scope_role_rank(db, current_user)
+    emp_scope = _admin_employee_scope_role_rank(db, current_user, scope)
     if emp_scope is not None:
         if emp_scope == []:
             return []
@@ -395,6 +404,7 @@ def admin_list(
     employee_id: Optional[int] = None,
     department_id: Optional[int] = None,
     status_filter: Optional[str] = None,
+    scope: Optional[VisibilityScope] = None,
 ) -> List[AttendanceSession]:
     """
     Admin: list sessions in date range with optional employee_id, department_id, status.
@@ -406,7 +416,7 @@ def admin_list(
             detail="from must be less than or equal to to",
         )
 
-    emp_scope = _admin_employee_scope_role_rank(db, current_user)
+    emp_scope = _admin_employee_scope_role_rank(db, current_user, scope)
     if emp_scope is not None and emp_scope == []:
         return []
 
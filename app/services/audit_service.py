@@ -3,6 +3,7 @@ Audit logging service
 """
 from datetime import datetime
 from sqlalchemy.orm import Session
+from app.db.unit_of_work import commit_or_flush
 from app.models.audit_log import AuditLog
 from app.utils.json_serializer import sanitize_for_json
 from typing import Optional, Dict, Any
@@ -17,7 +18,7 @@ def log_audit(
     meta: Optional[Dict[str, Any]] = None
 ) -> AuditLog:
     """
-    Create an audit log entry
+    Create an audit log entry (joins the caller's transaction inside a unit of work)
     
     Args:
         db: Database session
@@ -43,6 +44,5 @@ def log_audit(
         created_at=datetime.utcnow()
     )
     db.add(audit_log)
-    db.commit()
-    db.refresh(audit_log)
+    commit_or_flush(db, audit_log)
     return audit_log
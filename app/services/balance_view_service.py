@@ -0,0 +1,216 @@
+"""
+Employee leave balance read model service
+
+employee_leave_balance_view mirrors leave_balances (wallet types) joined with
+the employee columns the HR balance grid filters and sorts on, plus the
+precomputed allocation and PL/FL eligibility date, so the grid is one indexed
+SELECT instead of a balance scan with a per-employee accrual recompute.
+
+Rows are refreshed by a Session hook, inside the same transaction as the
+writes they mirror: after_flush records the (employee, year) keys of every
+LeaveBalance inserted, updated or deleted through the ORM (approval, cancel,
+wallet init, year close) and of employees whose name, code, department,
+join date or active flag changed; before_commit rewrites those rows from the
+source tables. Core bulk writes (the monthly accrual upsert) call mark_stale
+for the keys they touched. refresh_balance_view() rebuilds a whole year
+(backfill, or repair after raw SQL edits): python scripts/rebuild_balance_view.py
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, delete, event, false, func, insert, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.department import Department
+from app.models.employee import Employee
+from app.models.leave import LeaveBalance, LeaveType, WALLET_LEAVE_TYPES
+from app.models.leave_balance_view import EmployeeLeaveBalanceView
+from app.services.leave_wallet_service import pl_eligible_from
+from app.utils.datetime_utils import now_utc
+
+view = EmployeeLeaveBalanceView.__table__
+
+_STALE_KEY = "balance_view_stale"
+
+# Leave types usable only from pl_eligible_from(join_date)
+_GATED_TYPES = (LeaveType.PL, LeaveType.FL)
+
+# Employee columns copied into the view
+_EMPLOYEE_ATTRS = ("emp_code", "name", "department_id", "join_date", "active")
+
+# (employee_id, year); year None means every year of that employee
+StaleKey = Tuple[int, Optional[int]]
+
+SORT_COLUMNS = {
+    "employee_id": EmployeeLeaveBalanceView.employee_id,
+    "emp_code": EmployeeLeaveBalanceView.emp_code,
+    "employee_name": EmployeeLeaveBalanceView.employee_name,
+    "department": Department.name,
+    "leave_type": EmployeeLeaveBalanceView.leave_type,
+    "allocated": EmployeeLeaveBalanceView.allocated,
+    "used": EmployeeLeaveBalanceView.used,
+    "remaining": EmployeeLeaveBalanceView.remaining,
+}
+
+
+def mark_stale(db: Session, year: Optional[int], employee_ids: Iterable[int]) -> None:
+    """Refresh these employees' rows (one year, or all with year=None) when the transaction commits"""
+    db.info.setdefault(_STALE_KEY, set()).update((employee_id, year) for employee_id in employee_ids)
+
+
+def _key_filter(columns, keys: Iterable[StaleKey]):
+    by_year = defaultdict(set)
+    every_year = set()
+    for employee_id, year in keys:
+        (every_year if year is None else by_year[year]).add(employee_id)
+    conditions = [and_(columns.year == year, columns.employee_id.in_(ids)) for year, ids in by_year.items()]
+    if every_year:
+        conditions.append(columns.employee_id.in_(every_year))
+    return or_(*conditions) if conditions else false()
+
+
+def _rebuild(db: Session, balance_filter, view_filter) -> int:
+    rows = db.execute(
+        select(
+            LeaveBalance.employee_id,
+            LeaveBalance.year,
+            LeaveBalance.leave_type,
+            LeaveBalance.opening,
+            LeaveBalance.accrued,
+            LeaveBalance.used,
+            LeaveBalance.remaining,
+            LeaveBalance.carry_forward,
+            Employee.emp_code,
+            Employee.name,
+            Employee.department_id,
+            Employee.active,
+            Employee.join_date,
+        )
+        .join(Employee, Employee.id == LeaveBalance.employee_id)
+        .where(balance_filter, LeaveBalance.leave_type.in_(WALLET_LEAVE_TYPES))
+    ).all()
+    db.execute(delete(view).where(view_filter))
+    if not rows:
+        return 0
+    refreshed_at = now_utc()
+    db.execute(
+        insert(view),
+        [
+            {
+                "employee_id": r.employee_id,
+                "year": r.year,
+                "leave_type": r.leave_type,
+                "emp_code": r.emp_code,
+                "employee_name": r.name,
+                "department_id": r.department_id,
+                "active": r.active,
+                "opening": r.opening,
+                "accrued": r.accrued,
+                "used": r.used,
+                "remaining": r.remaining,
+                "carry_forward": r.carry_forward,
+                "allocated": r.opening + r.accrued + r.carry_forward,
+                "eligible_from": pl_eligible_from(r.join_date) if r.leave_type in _GATED_TYPES else None,
+                "refreshed_at": refreshed_at,
+            }
+            for r in rows
+        ],
+    )
+    return len(rows)
+
+
+def refresh_balance_view(db: Session, year: int, employee_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Rewrite the year's view rows (only employee_ids' if given) from leave_balances.
+    Runs in the caller's transaction (caller commits). Returns rows written.
+    """
+    if employee_ids is None:
+        return _rebuild(db, LeaveBalance.year == year, view.c.year == year)
+    keys = [(employee_id, year) for employee_id in employee_ids]
+    return _rebuild(db, _key_filter(LeaveBalance, keys), _key_filter(view.c, keys))
+
+
+def _employee_changed(employee: Employee) -> bool:
+    attrs = inspect(employee).attrs
+    return any(getattr(attrs, name).history.has_changes() for name in _EMPLOYEE_ATTRS)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_stale(session: Session, flush_context) -> None:
+    keys: Set[StaleKey] = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, LeaveBalance):
+            keys.add((obj.employee_id, obj.year))
+        elif isinstance(obj, Employee) and obj not in session.new and _employee_changed(obj):
+            keys.add((obj.id, None))
+    if keys:
+        session.info.setdefault(_STALE_KEY, set()).update(keys)
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_stale(session: Session) -> None:
+    # before_commit runs ahead of the commit's own flush; flush here so its writes are collected too
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    keys = session.info.pop(_STALE_KEY, set())
+    if keys:
+        _rebuild(session, _key_filter(LeaveBalance, keys), _key_filter(view.c, keys))
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_stale(session: Session, transaction) -> None:
+    # Keys from a rolled-back transaction; a savepoint keeps the outer transaction's keys
+    if transaction.parent is None:
+        session.info.pop(_STALE_KEY, None)
+
+
+def list_balances(
+    db: Session,
+    year: int,
+    employee_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+    leave_type: Optional[LeaveType] = None,
+    sort: str = "employee_id",
+    descending: bool = False,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> Tuple[List, int]:
+    """
+    One page of the year's balance rows with the department name, and the total
+    number of matching rows (a window count in the same query).
+    Rows are (EmployeeLeaveBalanceView, department_name, total).
+    """
+    sort_column = SORT_COLUMNS[sort]
+    query = (
+        select(EmployeeLeaveBalanceView, Department.name, func.count().over())
+        .outerjoin(Department, Department.id == EmployeeLeaveBalanceView.department_id)
+        .where(EmployeeLeaveBalanceView.year == year)
+    )
+    if employee_id is not None:
+        query = query.where(EmployeeLeaveBalanceView.employee_id == employee_id)
+    if department_id is not None:
+        query = query.where(EmployeeLeaveBalanceView.department_id == department_id)
+    if leave_type is not None:
+        query = query.where(EmployeeLeaveBalanceView.leave_type == leave_type)
+    query = query.order_by(
+        sort_column.desc() if descending else sort_column.asc(),
+        EmployeeLeaveBalanceView.employee_id,
+        EmployeeLeaveBalanceView.leave_type,
+    ).offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    rows = db.execute(query).all()
+    if rows:
+        return rows, rows[0][2]
+    if offset == 0:
+        return rows, 0
+    # Page past the end: the window count came back with no rows
+    total = db.execute(
+        select(func.count()).select_from(query.order_by(None).limit(None).offset(None).subquery())
+    ).scalar_one()
+    return rows, total
+
+
+def is_eligible(row: EmployeeLeaveBalanceView, as_of: Optional[date] = None) -> bool:
+    return row.eligible_from is None or row.eligible_from <= (as_of or date.today())
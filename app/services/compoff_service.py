@@ -8,12 +8,13 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, func as sql_func
 from fastapi import HTTPException, status
 from decimal import Decimal
+from app.db.unit_of_work import commit_or_flush
 from app.models.compoff import CompoffRequest, CompoffLedger, CompoffRequestStatus, CompoffLedgerType
 from app.models.attendance_session import AttendanceSession
 from app.models.employee import Employee, Role
 from app.models.leave import LeaveRequest
 from app.services.audit_service import log_audit
-from app.services.holiday_service import get_holidays_in_range
+from app.services.work_calendar import HOLIDAY, work_calendar
 
 logger = logging.getLogger(__name__)
 
@@ -77,13 +78,12 @@ def validate_compoff_eligibility(
     is_sunday_flag = is_sunday(worked_date)
     
     # Check if worked_date is an active holiday
-    holidays = get_holidays_in_range(db, worked_date, worked_date)
-    is_holiday = worked_date in holidays
+    is_holiday = work_calendar.has(db, worked_date, HOLIDAY)
     
     # Debug logging - detailed troubleshooting info
     logger.debug(
         f"Comp-off validation: employee_id={employee_id}, worked_date={worked_date} (weekday={worked_date.weekday()}), "
-        f"is_sunday={is_sunday_flag}, is_holiday={is_holiday}, holidays_found={len(holidays)}"
+        f"is_sunday={is_sunday_flag}, is_holiday={is_holiday}"
     )
     
     if attendance:
@@ -495,8 +495,7 @@ def consume_compoff_on_leave_approval(
             leave_request_id=leave_request_id
         )
         db.add(ledger_entry)
-        db.commit()
-        db.refresh(ledger_entry)
+        commit_or_flush(db, ledger_entry)
     
     return paid_days, lwp_days
 
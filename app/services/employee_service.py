@@ -18,8 +18,10 @@ from app.schemas.employee import (
     ReportingManagerRef,
 )
 from app.core.security import hash_password
+from app.core.principal_cache import principal_cache
 from app.utils.enums import enum_to_str
 from app.services.audit_service import log_audit
+from app.services.hierarchy_service import is_ancestor_or_self
 from app.services.r2_storage import get_r2_storage_service
 
 
@@ -39,28 +41,9 @@ def _check_reporting_hierarchy_cycle(
     Returns:
         True if cycle would be created, False otherwise
     """
-    if employee_id == reporting_manager_id:
-        return True  # Self-reference creates a cycle
-    
-    # Walk up the chain from the proposed manager
-    visited = set()
-    current_id = reporting_manager_id
-    
-    while current_id is not None:
-        if current_id == employee_id:
-            return True  # Cycle detected
-        
-        if current_id in visited:
-            break  # Already checked this path
-        
-        visited.add(current_id)
-        manager = db.query(Employee).filter(Employee.id == current_id).first()
-        if not manager or not manager.reporting_manager_id:
-            break
-        
-        current_id = manager.reporting_manager_id
-    
-    return False
+    # Self-reference, or the employee already sits above the proposed manager
+    # (closure-table lookup)
+    return is_ancestor_or_self(db, employee_id, reporting_manager_id)
 
 
 def create_employee(
@@ -374,6 +357,7 @@ def delete_employee(
     # Delete the employee
     db.delete(employee)
     db.commit()
+    principal_cache.evict_employee(employee_id)
     
     return True
 
@@ -727,6 +711,8 @@ def update_employee(
     
     db.commit()
     db.refresh(employee)
+    # Cached principals carry role/department/manager/active; drop this employee's tokens
+    principal_cache.evict_employee(employee.id)
     
     # Log audit
     log_audit(
@@ -0,0 +1,221 @@
+"""
+Employee hierarchy closure service
+
+employee_hierarchy_closure holds every (ancestor, descendant, depth) pair of the
+reporting tree, so "is X under Y" and "would this manager change create a
+cycle" are primary-key lookups instead of tree walks.
+
+The table is kept in step with employees by an after_flush hook on every ORM
+Session, i.e. inside the same transaction as the employee insert / manager
+change (employee_service create/update, admin tools, tests). Deletes cascade
+through the foreign keys. rebuild_closure() recomputes the whole table
+(backfill, or repair after raw SQL edits): python scripts/rebuild_hierarchy_closure.py
+"""
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, delete, event, exists, insert, inspect, select, true
+from sqlalchemy.orm import Session, aliased
+
+from app.models.employee import Employee
+from app.models.employee_hierarchy import EmployeeHierarchyClosure
+
+logger = logging.getLogger(__name__)
+
+closure = EmployeeHierarchyClosure.__table__
+
+# Rows per INSERT when rebuilding
+_REBUILD_CHUNK = 5000
+
+
+def active_subtree_cte(manager_id: int):
+    """
+    WITH RECURSIVE (id, department_id) of manager's direct and indirect reports
+    through active employees. UNION (not UNION ALL) stops the recursion if the
+    data ever contains a cycle.
+    """
+    subtree = (
+        select(Employee.id, Employee.department_id)
+        .where(Employee.reporting_manager_id == manager_id, Employee.active == True)
+        .cte("subordinates", recursive=True)
+    )
+    return subtree.union(
+        select(Employee.id, Employee.department_id)
+        .join(subtree, Employee.reporting_manager_id == subtree.c.id)
+        .where(Employee.active == True)
+    )
+
+
+def is_subordinate(db: Session, manager_id: int, employee_id: int) -> bool:
+    """
+    True if employee_id is a direct or indirect report of manager_id through
+    active employees only (same membership as get_subordinate_ids: an inactive
+    employee hides everyone below them).
+    """
+    if manager_id == employee_id:
+        return False
+    path = aliased(closure)
+    from_manager = aliased(closure)
+    inactive_on_path = (
+        select(path.c.ancestor_id)
+        .join(
+            from_manager,
+            and_(
+                from_manager.c.ancestor_id == manager_id,
+                from_manager.c.descendant_id == path.c.ancestor_id,
+                from_manager.c.depth >= 1,
+            ),
+        )
+        .join(Employee, Employee.id == path.c.ancestor_id)
+        .where(path.c.descendant_id == employee_id, Employee.active == False)
+    )
+    row = db.execute(
+        select(closure.c.depth).where(
+            closure.c.ancestor_id == manager_id,
+            closure.c.descendant_id == employee_id,
+            closure.c.depth >= 1,
+            ~exists(inactive_on_path),
+        )
+    ).first()
+    return row is not None
+
+
+def is_ancestor_or_self(db: Session, ancestor_id: int, employee_id: int) -> bool:
+    """True if ancestor_id is employee_id or anywhere above it (active or not)"""
+    if ancestor_id == employee_id:
+        return True
+    return db.execute(
+        select(closure.c.depth).where(
+            closure.c.ancestor_id == ancestor_id,
+            closure.c.descendant_id == employee_id,
+        )
+    ).first() is not None
+
+
+def _insert_self(conn, employee_id: int) -> None:
+    conn.execute(insert(closure).values(ancestor_id=employee_id, descendant_id=employee_id, depth=0))
+
+
+def _detach_subtree(conn, employee_id: int) -> None:
+    """Remove the links between employee's subtree and everything above employee"""
+    subtree = select(closure.c.descendant_id).where(closure.c.ancestor_id == employee_id)
+    conn.execute(
+        delete(closure).where(
+            closure.c.descendant_id.in_(subtree),
+            closure.c.ancestor_id.notin_(subtree),
+        )
+    )
+
+
+def _attach_subtree(conn, employee_id: int, manager_id: Optional[int]) -> None:
+    """Link every ancestor of manager_id (itself included) to every node of employee's subtree"""
+    if manager_id is None:
+        return
+    in_subtree = conn.execute(
+        select(closure.c.depth).where(
+            closure.c.ancestor_id == employee_id,
+            closure.c.descendant_id == manager_id,
+        )
+    ).first()
+    if in_subtree is not None:
+        # Services reject this (cycle check); raw writes leave the subtree detached
+        logger.warning(
+            "Reporting cycle: employee %s -> manager %s is inside its own subtree; "
+            "subtree left detached in employee_hierarchy_closure",
+            employee_id,
+            manager_id,
+        )
+        return
+    up = select(closure.c.ancestor_id, closure.c.depth).where(closure.c.descendant_id == manager_id).subquery()
+    down = select(closure.c.descendant_id, closure.c.depth).where(closure.c.ancestor_id == employee_id).subquery()
+    conn.execute(
+        insert(closure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(up.c.ancestor_id, down.c.descendant_id, up.c.depth + down.c.depth + 1)
+            .select_from(up.join(down, true())),
+        )
+    )
+
+
+def _managers_first(employees: List[Employee]) -> List[Employee]:
+    """Order new employees so a manager inserted in the same flush is linked before its reports"""
+    pending = {e.id: e for e in employees}
+    ordered = []
+    while pending:
+        ready = [e for e in pending.values() if e.reporting_manager_id not in pending]
+        if not ready:  # cycle among new rows; link in any order
+            ready = list(pending.values())
+        for e in ready:
+            ordered.append(e)
+            del pending[e.id]
+    return ordered
+
+
+def _manager_changed(employee: Employee) -> bool:
+    attrs = inspect(employee).attrs
+    return attrs.reporting_manager_id.history.has_changes() or attrs.reporting_manager.history.has_changes()
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_closure(session: Session, flush_context) -> None:
+    new = [o for o in session.new if isinstance(o, Employee)]
+    moved = [o for o in session.dirty if isinstance(o, Employee) and _manager_changed(o)]
+    if not new and not moved:
+        return
+    conn = session.connection()
+    for employee in _managers_first(new):
+        _insert_self(conn, employee.id)
+        _attach_subtree(conn, employee.id, employee.reporting_manager_id)
+    for employee in moved:
+        _detach_subtree(conn, employee.id)
+        _attach_subtree(conn, employee.id, employee.reporting_manager_id)
+
+
+def _ancestor_lists(parents: Dict[int, Optional[int]]) -> Dict[int, List[int]]:
+    """employee -> [manager, manager's manager, ...]; an edge that closes a cycle is dropped"""
+    ancestors: Dict[int, List[int]] = {}
+    for start in parents:
+        path, on_path = [], set()
+        node = start
+        while node is not None and node not in ancestors and node not in on_path:
+            on_path.add(node)
+            path.append(node)
+            node = parents.get(node)
+        for employee_id in reversed(path):
+            manager_id = parents.get(employee_id)
+            if manager_id is None or manager_id not in parents:
+                ancestors[employee_id] = []
+            elif manager_id in ancestors:
+                ancestors[employee_id] = [manager_id] + ancestors[manager_id]
+            else:
+                logger.warning("Reporting cycle at employee %s; manager link ignored in closure", employee_id)
+                ancestors[employee_id] = []
+    return ancestors
+
+
+def _closure_rows(parents: Dict[int, Optional[int]]) -> Iterable[dict]:
+    for employee_id, chain in _ancestor_lists(parents).items():
+        yield {"ancestor_id": employee_id, "descendant_id": employee_id, "depth": 0}
+        for depth, ancestor_id in enumerate(chain, start=1):
+            yield {"ancestor_id": ancestor_id, "descendant_id": employee_id, "depth": depth}
+
+
+def rebuild_closure(db: Session) -> int:
+    """
+    Recompute employee_hierarchy_closure from employees.reporting_manager_id.
+    Runs in the caller's transaction (caller commits). Returns rows written.
+    """
+    parents = dict(db.execute(select(Employee.id, Employee.reporting_manager_id)).all())
+    db.execute(delete(closure))
+    written = 0
+    chunk: List[dict] = []
+    for row in _closure_rows(parents):
+        chunk.append(row)
+        if len(chunk) >= _REBUILD_CHUNK:
+            db.execute(insert(closure), chunk)
+            written += len(chunk)
+            chunk = []
+    if chunk:
+        db.execute(insert(closure), chunk)
+        written += len(chunk)
+    return written
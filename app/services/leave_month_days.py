@@ -0,0 +1,150 @@
+"""
+Leave month-days service - computed_days_by_month as indexed rows
+
+leave_request_month_days holds one (leave_request_id, month, days) row per
+"YYYY-MM" key of LeaveRequest.computed_days_by_month, so monthly totals (the
+monthly cap check, per-month leave analytics) are a single
+SUM(days) ... GROUP BY month instead of loading every approved leave and
+parsing its JSON.
+
+The rows are written by an after_flush hook on every ORM Session whenever a
+LeaveRequest is inserted or its computed_days_by_month changes, i.e. in the
+same transaction as the leave itself. Bulk UPDATEs that bypass the ORM
+(recompute_pending_leave_days) call replace_month_days() directly. Deletes
+cascade through the foreign key. rebuild_month_days() recomputes the whole
+table (backfill, or repair after raw SQL edits):
+python scripts/rebuild_leave_month_days.py
+"""
+import json
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, List, Mapping, Optional, Union
+
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.leave import LeaveRequest, LeaveRequestMonthDays, LeaveStatus, LeaveType
+
+month_days = LeaveRequestMonthDays.__table__
+
+# Leave types counted against the monthly cap (RH counts as PL; COMPOFF exempt)
+MONTHLY_CAP_LEAVE_TYPES = (LeaveType.CL, LeaveType.PL, LeaveType.RH)
+
+# Rows per INSERT when rebuilding
+_REBUILD_CHUNK = 2000
+
+
+def parse_by_month(value: Union[str, Mapping, None]) -> Dict[str, Decimal]:
+    """computed_days_by_month (JSON string or dict) -> {"YYYY-MM": days}; bad data yields {}"""
+    if not value:
+        return {}
+    try:
+        by_month = json.loads(value) if isinstance(value, str) else value
+        return {
+            str(month): Decimal(str(days))
+            for month, days in by_month.items()
+            if Decimal(str(days)) != 0
+        }
+    except (ValueError, TypeError, AttributeError, InvalidOperation):
+        return {}
+
+
+def _rows(by_leave: Mapping[int, Union[str, Mapping, None]]) -> List[dict]:
+    return [
+        {"leave_request_id": leave_id, "month": month, "days": days}
+        for leave_id, value in by_leave.items()
+        for month, days in parse_by_month(value).items()
+    ]
+
+
+def replace_month_days(conn: Union[Connection, Session], by_leave: Mapping[int, Union[str, Mapping, None]]) -> int:
+    """
+    Replace the month rows of the given leave requests
+    ({leave_request_id: computed_days_by_month}). Returns rows written.
+    """
+    if not by_leave:
+        return 0
+    conn.execute(delete(month_days).where(month_days.c.leave_request_id.in_(list(by_leave))))
+    rows = _rows(by_leave)
+    if rows:
+        conn.execute(insert(month_days), rows)
+    return len(rows)
+
+
+def _by_month_changed(leave: LeaveRequest) -> bool:
+    return inspect(leave).attrs.computed_days_by_month.history.has_changes()
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_month_days(session: Session, flush_context) -> None:
+    changed = {
+        o.id: o.computed_days_by_month
+        for o in session.new
+        if isinstance(o, LeaveRequest)
+    }
+    changed.update(
+        (o.id, o.computed_days_by_month)
+        for o in session.dirty
+        if isinstance(o, LeaveRequest) and _by_month_changed(o)
+    )
+    deleted = [o.id for o in session.deleted if isinstance(o, LeaveRequest)]
+    if not changed and not deleted:
+        return
+    conn = session.connection()
+    if deleted:
+        conn.execute(delete(month_days).where(month_days.c.leave_request_id.in_(deleted)))
+    replace_month_days(conn, changed)
+
+
+def monthly_totals(
+    db: Session,
+    employee_id: int,
+    months: Iterable[str],
+    exclude_leave_request_id: Optional[int] = None,
+) -> Dict[str, float]:
+    """
+    Approved CL/PL/RH days per month for an employee, for the given "YYYY-MM"
+    months only. One indexed GROUP BY query.
+    """
+    months = list(months)
+    if not months:
+        return {}
+    query = (
+        select(month_days.c.month, func.sum(month_days.c.days))
+        .join(LeaveRequest, LeaveRequest.id == month_days.c.leave_request_id)
+        .where(
+            LeaveRequest.employee_id == employee_id,
+            LeaveRequest.status == LeaveStatus.APPROVED,
+            LeaveRequest.leave_type.in_(MONTHLY_CAP_LEAVE_TYPES),
+            month_days.c.month.in_(months),
+        )
+        .group_by(month_days.c.month)
+    )
+    if exclude_leave_request_id:
+        query = query.where(LeaveRequest.id != exclude_leave_request_id)
+    return {month: float(days) for month, days in db.execute(query)}
+
+
+def rebuild_month_days(db: Session) -> int:
+    """
+    Recompute leave_request_month_days from leave_requests.computed_days_by_month.
+    Runs in the caller's transaction (caller commits). Returns rows written.
+    """
+    db.execute(delete(month_days))
+    written = 0
+    chunk: List[dict] = []
+    leaves = db.execute(
+        select(LeaveRequest.id, LeaveRequest.computed_days_by_month).where(
+            LeaveRequest.computed_days_by_month.isnot(None)
+        )
+    ).all()
+    for leave_id, value in leaves:
+        chunk.extend(_rows({leave_id: value}))
+        if len(chunk) >= _REBUILD_CHUNK:
+            db.execute(insert(month_days), chunk)
+            written += len(chunk)
+            chunk = []
+    if chunk:
+        db.execute(insert(month_days), chunk)
+        written += len(chunk)
+    return written
@@ -2,10 +2,13 @@
 Leave service - business logic for leave management
 """
 import logging
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta, timezone
+from functools import cached_property
 from typing import List, Optional, Tuple, Dict, Set
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import Integer, Row, and_, or_, literal_column, select, update
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from app.models.leave import (
     LeaveRequest,
@@ -16,13 +19,17 @@ from app.models.leave import (
     ApprovalAction,
     LeaveDuration,
     HalfDaySession,
+    LEAVE_OVERLAP_CONSTRAINT,
 )
 from app.models.employee import Employee, Role
-from app.models.role import RoleModel
-from app.utils.roles import role_name
+from app.db.keyset import changed_since, paginate
+from app.db.unit_of_work import after_commit, commit_or_flush, unit_of_work
 from app.services.audit_service import log_audit
+from app.services.hierarchy_service import active_subtree_cte, is_subordinate
+from app.services.visibility_scope import ScopeView, VisibilityScope, resolve_visibility_scope
+from app.services.role_registry import role_registry
 from app.models.notification_device import NotificationDevice
-from app.services.push_service import send_push_to_tokens
+from app.services.push_service import send_push_in_background
 
 logger = logging.getLogger(__name__)
 
@@ -33,9 +40,10 @@ TERMINAL_LEAVE_STATUSES = frozenset({
     LeaveStatus.CANCELLED,
     LeaveStatus.CANCELLED_BY_COMPANY,
 })
-from app.services.holiday_service import get_holidays_in_range, is_rh_date
+from app.utils.datetime_utils import ensure_utc
+from app.services.work_calendar import EVENT, NON_WORKING, RH as RH_DAY, work_calendar
+from app.services.policy_cache import PolicySnapshot, policy_cache
 from app.services.policy_validator import (
-    get_or_create_policy_settings,
     validate_pl_eligibility,
     validate_probation,  # Keep for backward compatibility
     validate_notice,
@@ -45,6 +53,7 @@ from app.services.policy_validator import (
     validate_company_event_block
 )
 from app.services.compoff_service import consume_compoff_on_leave_approval
+from app.services.leave_month_days import replace_month_days
 from app.services import leave_wallet_service as wallet
 from app.models.leave import WALLET_LEAVE_TYPES
 from decimal import Decimal
@@ -59,7 +68,9 @@ def is_sunday(check_date: date) -> bool:
 def get_subordinate_ids(db: Session, manager_id: int) -> List[int]:
     """
     Recursively fetch all subordinate employee IDs in the reporting hierarchy.
-    Uses iterative approach for better reliability across different databases.
+    Single round trip: WITH RECURSIVE over employees (PostgreSQL and SQLite).
+    Inactive employees are excluded along with everyone below them; UNION
+    (not UNION ALL) stops the recursion if the data ever contains a cycle.
     
     Args:
         db: Database session
@@ -68,32 +79,19 @@ def get_subordinate_ids(db: Session, manager_id: int) -> List[int]:
     Returns:
         List of employee IDs for all direct and indirect reports
     """
-    # Use iterative approach for better reliability
-    subordinate_ids = []
-    
-    from collections import deque
-    
-    queue = deque([manager_id])
-    
-    while queue:
-        current_manager_id = queue.popleft()
-        
-        # Get direct reports of current manager
-        direct_reports = db.query(Employee.id).filter(
-            Employee.reporting_manager_id == current_manager_id,
-            Employee.active == True
-        ).all()
-        
-        for (employee_id,) in direct_reports:
-            subordinate_ids.append(employee_id)
-            queue.append(employee_id)  # Add to queue to process their subordinates
-    
-    return subordinate_ids
+    subordinates = active_subtree_cte(manager_id)
+    return [employee_id for (employee_id,) in db.execute(select(subordinates.c.id))]
+
+
+# Upper bound on the manager chain walk (guards against cycles in bad data)
+MAX_MANAGER_CHAIN_DEPTH = 20
 
 
 def get_manager_chain_ids(db: Session, employee_id: int) -> List[int]:
     """
     Get the upward chain of manager IDs for an employee (recursive reporting hierarchy).
+    Single round trip: WITH RECURSIVE from the employee up through active
+    employees; the first inactive manager ends the chain (and is included).
     
     Args:
         db: Database session
@@ -102,30 +100,30 @@ def get_manager_chain_ids(db: Session, employee_id: int) -> List[int]:
     Returns:
         List of manager IDs in the chain (employee -> manager -> manager...)
     """
-    manager_chain = []
-    current_id = employee_id
-    
-    # Prevent infinite loops with a safety limit
-    max_depth = 20
-    depth = 0
-    
-    while current_id and depth < max_depth:
-        depth += 1
-        
-        # Get current employee's reporting manager
-        employee = db.query(Employee).filter(
-            Employee.id == current_id,
-            Employee.active == True
-        ).first()
-        
-        if not employee or not employee.reporting_manager_id:
-            break
-            
-        # Add manager to chain and move up
-        manager_chain.append(employee.reporting_manager_id)
-        current_id = employee.reporting_manager_id
-    
-    return manager_chain
+    chain = (
+        select(
+            Employee.id,
+            Employee.reporting_manager_id,
+            literal_column("1", Integer).label("depth"),
+        )
+        .where(Employee.id == employee_id, Employee.active == True)
+        .cte("manager_chain", recursive=True)
+    )
+    chain = chain.union_all(
+        select(
+            Employee.id,
+            Employee.reporting_manager_id,
+            (chain.c.depth + 1).label("depth"),
+        )
+        .join(chain, Employee.id == chain.c.reporting_manager_id)
+        .where(Employee.active == True, chain.c.depth < MAX_MANAGER_CHAIN_DEPTH)
+    )
+    rows = db.execute(
+        select(chain.c.reporting_manager_id)
+        .where(chain.c.reporting_manager_id.isnot(None))
+        .order_by(chain.c.depth)
+    )
+    return [manager_id for (manager_id,) in rows]
 
 
 def get_role_rank(db: Session, employee: Employee) -> int:
@@ -137,29 +135,10 @@ def get_role_rank(db: Session, employee: Employee) -> int:
         employee: Employee instance
         
     Returns:
-        role_rank value for the employee's role
+        role_rank value for the employee's role (served from the role registry;
+        roles missing from the roles table use DEFAULT_ROLE_RANKS)
     """
-    role_row = db.query(RoleModel).filter(
-        RoleModel.name == role_name(employee.role),
-        RoleModel.is_active == True
-    ).first()
-    
-    if not role_row:
-        # Handle roles that might not exist in RoleModel table
-        # ADMIN should have rank 1, MD rank 2, VP rank 3, MANAGER rank 4, EMPLOYEE rank 5+
-        if employee.role == "ADMIN":
-            return 1
-        elif employee.role == "MD":
-            return 2
-        elif employee.role == "VP":
-            return 3
-        elif employee.role == "MANAGER":
-            return 4
-        else:
-            # Default to high rank for other roles (restrictive)
-            return 99
-    
-    return role_row.role_rank
+    return role_registry.rank_for(db, employee.role)
 
 
 def get_non_working_days_in_range(
@@ -185,34 +164,8 @@ def get_non_working_days_in_range(
     Returns:
         Set of non-working dates (Sundays + active holidays + company events)
     """
-    from app.models.event import CompanyEvent
-    
-    non_working = set()
-    
-    # Add all Sundays in range
-    current_date = from_date
-    while current_date <= to_date:
-        if is_sunday(current_date):
-            non_working.add(current_date)
-        current_date += timedelta(days=1)
-    
-    # Add active holidays in range
-    holiday_set = get_holidays_in_range(db, from_date, to_date)
-    non_working.update(holiday_set)
-    
-    # Add company events if enabled
-    if include_company_events:
-        year = from_date.year
-        events = db.query(CompanyEvent).filter(
-            CompanyEvent.year == year,
-            CompanyEvent.active == True,
-            CompanyEvent.date >= from_date,
-            CompanyEvent.date <= to_date
-        ).all()
-        for event in events:
-            non_working.add(event.date)
-    
-    return non_working
+    mask = NON_WORKING | EVENT if include_company_events else NON_WORKING
+    return work_calendar.dates(db, from_date, to_date, mask)
 
 
 def calculate_days_baseline(
@@ -241,21 +194,9 @@ def calculate_days_baseline(
     if from_date > to_date:
         return 0.0
     
-    # Get active holidays in range
-    holiday_set = get_holidays_in_range(db, from_date, to_date)
-    
-    current_date = from_date
-    day_count = 0.0
-    
-    while current_date <= to_date:
-        # Exclude Sundays
-        if not is_sunday(current_date):
-            # Exclude holidays
-            if current_date not in holiday_set:
-                day_count += 1.0
-        current_date += timedelta(days=1)
-    
-    return day_count
+    # Days in range minus Sundays/holidays (prefix sums over the year's day flags)
+    total = (to_date - from_date).days + 1
+    return float(total - work_calendar.count(db, from_date, to_date, NON_WORKING))
 
 
 def calculate_days_with_sandwich(
@@ -290,61 +231,58 @@ def calculate_days_with_sandwich(
     # Get policy settings to check if company events should be included
     year = from_date.year
     try:
-        settings = get_or_create_policy_settings(db, year)
+        settings = policy_cache.get(db, year)
         include_events = getattr(settings, 'treat_event_as_non_working_for_sandwich', True)
     except Exception:
         # Fallback if policy settings not available
         include_events = True
     
-    # Get non-working days (Sundays + holidays + company events if enabled) in range
-    non_working_days = get_non_working_days_in_range(db, from_date, to_date, include_company_events=include_events)
-    
-    # First, compute baseline counted days (excluding Sundays and holidays)
-    baseline_counted = set()
-    current_date = from_date
-    
-    while current_date <= to_date:
-        if current_date not in non_working_days:
-            baseline_counted.add(current_date)
-        current_date += timedelta(days=1)
-    
-    # If leave type does NOT support sandwich, return baseline only
-    if leave_type not in (LeaveType.CL, LeaveType.PL, LeaveType.SL):
-        # Build by_month from baseline only
-        by_month: Dict[str, float] = {}
-        for d in baseline_counted:
-            month_key = f"{d.year}-{d.month:02d}"
-            by_month[month_key] = by_month.get(month_key, 0.0) + 1.0
-        
-        return float(len(baseline_counted)), by_month
-    
-    # Sandwich applies: find non-working days that are BETWEEN counted leave days
-    sandwich_included = set()
-    
-    # For each non-working day in range, check if it's sandwiched
-    for non_working_date in non_working_days:
-        if non_working_date < from_date or non_working_date > to_date:
-            continue
-        
-        # Check if there's at least one counted day before AND after this non-working day
-        has_before = any(d < non_working_date for d in baseline_counted)
-        has_after = any(d > non_working_date for d in baseline_counted)
-        
-        if has_before and has_after:
-            sandwich_included.add(non_working_date)
-    
-    # Combine baseline counted days with sandwich-included non-working days
-    all_included_days = baseline_counted | sandwich_included
-    
-    # Build by_month dictionary
+    return count_leave_days(db, leave_type, from_date, to_date, include_events)
+
+
+def _month_spans(from_date: date, to_date: date):
+    """("YYYY-MM", start, end) for each calendar month the range touches"""
+    start = from_date
+    while start <= to_date:
+        next_month = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+        end = min(to_date, next_month - timedelta(days=1))
+        yield f"{start.year}-{start.month:02d}", start, end
+        start = next_month
+
+
+def count_leave_days(
+    db: Session,
+    leave_type: LeaveType,
+    from_date: date,
+    to_date: date,
+    include_events: bool = True
+) -> Tuple[float, Dict[str, float]]:
+    """
+    Sandwich-rule day count for an already resolved policy (see calculate_days_with_sandwich).
+
+    A non-working day is sandwiched exactly when it lies between the first and
+    the last counted (working) day of the range, so for CL/PL/SL every day in
+    [first counted, last counted] is included. Other types count working days
+    only. Both are per-month prefix-sum lookups on the work calendar: O(months)
+    instead of comparing every non-working day against every counted day.
+    """
+    mask = NON_WORKING | EVENT if include_events else NON_WORKING
+    first = work_calendar.first_clear(db, from_date, to_date, mask)
+    if first is None:
+        return 0.0, {}
+
     by_month: Dict[str, float] = {}
-    for d in all_included_days:
-        month_key = f"{d.year}-{d.month:02d}"
-        by_month[month_key] = by_month.get(month_key, 0.0) + 1.0
-    
-    total_days = float(len(all_included_days))
-    
-    return total_days, by_month
+    if leave_type in (LeaveType.CL, LeaveType.PL, LeaveType.SL):
+        last = work_calendar.first_clear(db, from_date, to_date, mask, reverse=True)
+        for month_key, start, end in _month_spans(first, last):
+            by_month[month_key] = float((end - start).days + 1)
+    else:
+        for month_key, start, end in _month_spans(first, to_date):
+            counted = (end - start).days + 1 - work_calendar.count(db, start, end, mask)
+            if counted:
+                by_month[month_key] = float(counted)
+
+    return float(sum(by_month.values())), by_month
 
 
 def validate_leave_year(from_date: date, to_date: date) -> None:
@@ -407,26 +345,64 @@ def validate_overlap(
     Raises:
         HTTPException: If overlap detected (409 Conflict)
     """
+    # A full-day request conflicts with any overlap: existence is enough
+    limit = 1 if (duration or LeaveDuration.FULL_DAY) == LeaveDuration.FULL_DAY else None
+    existing = _overlapping_leaves(db, employee_id, from_date, to_date, exclude_leave_id, limit=limit)
+    _raise_on_overlap(existing, from_date, duration, half_day_session)
+
+
+def _overlapping_leaves(
+    db: Session,
+    employee_id: int,
+    from_date: date,
+    to_date: date,
+    exclude_leave_id: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[Row]:
+    """
+    PENDING/APPROVED leaves of the employee that touch [from_date, to_date].
+    Light rows (type, status, dates, duration, session) from a range probe on
+    ix_leave_requests_employee_dates; no ORM objects or relationship joins.
+    """
     # Overlap condition: NOT (existing.to_date < new.from_date OR existing.from_date > new.to_date)
     # Which means: existing.to_date >= new.from_date AND existing.from_date <= new.to_date
     query = (
-        db.query(LeaveRequest)
-        .options(
-            joinedload(LeaveRequest.employee),
-            joinedload(LeaveRequest.approver),
+        select(
+            LeaveRequest.leave_type,
+            LeaveRequest.status,
+            LeaveRequest.from_date,
+            LeaveRequest.to_date,
+            LeaveRequest.duration,
+            LeaveRequest.half_day_session,
         )
-        .filter(
+        .where(
             LeaveRequest.employee_id == employee_id,
-            LeaveRequest.status.in_([LeaveStatus.PENDING, LeaveStatus.APPROVED]),
-            LeaveRequest.to_date >= from_date,
             LeaveRequest.from_date <= to_date,
+            LeaveRequest.to_date >= from_date,
+            LeaveRequest.status.in_([LeaveStatus.PENDING, LeaveStatus.APPROVED]),
         )
+        .order_by(LeaveRequest.from_date)
     )
     
     if exclude_leave_id:
-        query = query.filter(LeaveRequest.id != exclude_leave_id)
+        query = query.where(LeaveRequest.id != exclude_leave_id)
+    if limit:
+        query = query.limit(limit)
     
-    existing = query.all()
+    return db.execute(query).all()
+
+
+def _is_overlap_violation(exc: IntegrityError) -> bool:
+    """True if the database rejected a write on the leave overlap exclusion constraint/trigger"""
+    return LEAVE_OVERLAP_CONSTRAINT in str(exc.orig)
+
+
+def _raise_on_overlap(
+    existing: List[Row],
+    from_date: date,
+    duration: Optional[LeaveDuration] = None,
+    half_day_session: Optional[HalfDaySession] = None,
+) -> None:
     if not existing:
         return
     
@@ -467,39 +443,117 @@ def validate_overlap(
         return
 
 
-def apply_leave(
-    db: Session,
-    employee_id: int,
+class LeaveContext:
+    """
+    Inputs of the apply pipeline that only depend on (employee, year): the
+    employee row, policy settings, wallet remaining and existing leaves.
+
+    apply_leave uses a live context (policy/wallet get-or-create, overlap
+    queried per call). quote_leaves uses preview=True and shares one context
+    across a batch of candidates: policy and wallet are read without writing
+    and the employee's PENDING/APPROVED leaves for the year are loaded once.
+    """
+
+    def __init__(self, db: Session, employee_id: int, year: int, preview: bool = False):
+        self.db = db
+        self.employee_id = employee_id
+        self.year = year
+        self.preview = preview
+
+    @cached_property
+    def employee(self) -> Optional[Employee]:
+        return self.db.query(Employee).filter(Employee.id == self.employee_id).first()
+
+    @cached_property
+    def settings(self) -> PolicySnapshot:
+        return policy_cache.get(self.db, self.year)
+
+    @cached_property
+    def include_events(self) -> bool:
+        return getattr(self.settings, "treat_event_as_non_working_for_sandwich", True)
+
+    def ensure_wallet(self) -> None:
+        """Create missing wallet rows before any balance checks (live context only)"""
+        if not self.preview:
+            wallet.init_wallet_if_missing(self.db, self.employee_id, self.year)
+
+    @cached_property
+    def available(self) -> Dict[LeaveType, float]:
+        """Wallet remaining per leave type"""
+        if self.preview:
+            return wallet.preview_remaining(self.db, self.employee, self.year, self.settings)
+        bal = wallet.get_wallet_balances(self.db, self.employee_id, self.year)
+        return {b.leave_type: float(b.remaining) for b in bal}
+
+    @cached_property
+    def _active_leaves(self) -> List[Row]:
+        return _overlapping_leaves(
+            self.db, self.employee_id, date(self.year, 1, 1), date(self.year, 12, 31)
+        )
+
+    def overlapping(
+        self, from_date: date, to_date: date, duration: Optional[LeaveDuration] = None
+    ) -> List[Row]:
+        if not self.preview:
+            limit = 1 if (duration or LeaveDuration.FULL_DAY) == LeaveDuration.FULL_DAY else None
+            return _overlapping_leaves(self.db, self.employee_id, from_date, to_date, limit=limit)
+        return [
+            lr for lr in self._active_leaves
+            if lr.to_date >= from_date and lr.from_date <= to_date
+        ]
+
+    def has_approved_rh(self) -> bool:
+        year_start, year_end = date(self.year, 1, 1), date(self.year, 12, 31)
+        if self.preview:
+            return any(
+                lr.leave_type == LeaveType.RH
+                and lr.status == LeaveStatus.APPROVED
+                and lr.from_date >= year_start
+                and lr.to_date <= year_end
+                for lr in self._active_leaves
+            )
+        return self.db.query(LeaveRequest.id).filter(
+            LeaveRequest.employee_id == self.employee_id,
+            LeaveRequest.leave_type == LeaveType.RH,
+            LeaveRequest.status == LeaveStatus.APPROVED,
+            LeaveRequest.from_date >= year_start,
+            LeaveRequest.to_date <= year_end
+        ).first() is not None
+
+
+@dataclass
+class LeaveEvaluation:
+    """Outcome of the apply pipeline for one candidate (nothing persisted)"""
+    leave_type: LeaveType
+    from_date: date
+    to_date: date
+    duration: LeaveDuration
+    half_day_session: Optional[HalfDaySession]
+    computed_days: float
+    by_month: Dict[str, float]
+    paid_days: Decimal
+    lwp_days: Decimal
+    auto_lwp_reason: Optional[str]
+    sandwich_dates: List[date] = field(default_factory=list)
+
+
+def evaluate_leave(
+    ctx: LeaveContext,
     leave_type: LeaveType,
     from_date: date,
     to_date: date,
-    reason: Optional[str] = None,
     duration: Optional[LeaveDuration] = None,
     half_day_session: Optional[HalfDaySession] = None,
     override_policy: bool = False,
     override_remark: Optional[str] = None,
     current_user: Optional[Employee] = None
-) -> LeaveRequest:
+) -> LeaveEvaluation:
     """
-    Apply for leave (creates PENDING request)
-    
-    Args:
-        db: Database session
-        employee_id: Employee ID applying for leave
-        leave_type: Type of leave
-        from_date: Start date
-        to_date: End date
-        reason: Optional reason
-        override_policy: Whether to override policy rules (HR only)
-        override_remark: Remark for override (required if override_policy is True)
-        current_user: Current authenticated user (for override validation)
-    
-    Returns:
-        Created LeaveRequest instance
-    
-    Raises:
-        HTTPException: If validation fails
+    Validation pipeline of apply_leave: raises the same HTTPException apply
+    would, otherwise returns the computed days and paid/LWP split.
+    ctx.year must be from_date.year.
     """
+    db = ctx.db
     # Validate date order
     if from_date > to_date:
         raise HTTPException(
@@ -509,6 +563,7 @@ def apply_leave(
     
     # Validate leave year
     validate_leave_year(from_date, to_date)
+    year = from_date.year
     
     # RH-specific validations
     if leave_type == LeaveType.RH:
@@ -520,49 +575,32 @@ def apply_leave(
             )
         
         # RH date must be a valid restricted holiday
-        year = from_date.year
-        if not is_rh_date(db, year, from_date):
+        if not work_calendar.has(db, from_date, RH_DAY):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Date {from_date} is not a valid Restricted Holiday (RH) date for year {year}"
             )
         
         # Check if employee already has an approved RH in this year
-        existing_approved_rh = db.query(LeaveRequest).filter(
-            LeaveRequest.employee_id == employee_id,
-            LeaveRequest.leave_type == LeaveType.RH,
-            LeaveRequest.status == LeaveStatus.APPROVED,
-            LeaveRequest.from_date >= date(year, 1, 1),
-            LeaveRequest.to_date <= date(year, 12, 31)
-        ).first()
-        
-        if existing_approved_rh:
+        if ctx.has_approved_rh():
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=f"Employee has already used their Restricted Holiday (RH) quota for year {year}. Only one RH per year is allowed."
             )
     
     # Validate overlap (session-aware)
-    validate_overlap(
-        db,
-        employee_id,
-        from_date,
-        to_date,
-        duration=duration,
-        half_day_session=half_day_session
-    )
+    _raise_on_overlap(ctx.overlapping(from_date, to_date, duration), from_date, duration, half_day_session)
     
     # Get employee for policy validations
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    employee = ctx.employee
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Employee with id {employee_id} not found"
+            detail=f"Employee with id {ctx.employee_id} not found"
         )
 
     # Ensure leave balances exist for this employee+year before any balance checks (auto-init)
-    year = from_date.year
-    wallet.ensure_wallet_for_employee(db, employee_id, year)
+    ctx.ensure_wallet()
     
     # Validate reporting manager exists (except for MD role)
     if employee.role != Role.MD and not employee.reporting_manager_id:
@@ -583,6 +621,7 @@ def apply_leave(
     
     # Resolve duration defaults to FULL_DAY if not provided
     duration = duration or LeaveDuration.FULL_DAY
+    sandwich_dates: List[date] = []
     # Half-day validations and calculation
     if duration == LeaveDuration.HALF_DAY:
         # Only allow half-day for CL/PL/SL
@@ -604,7 +643,9 @@ def apply_leave(
             half_day_session = HalfDaySession.FIRST_HALF
     else:
         # Calculate days with sandwich rule (applies to CL/PL/SL, not to RH/COMPOFF/LWP)
-        computed_days, by_month = calculate_days_with_sandwich(db, leave_type, from_date, to_date)
+        computed_days, by_month = count_leave_days(db, leave_type, from_date, to_date, ctx.include_events)
+        if leave_type in (LeaveType.CL, LeaveType.PL, LeaveType.SL):
+            sandwich_dates = _sandwiched_dates(db, from_date, to_date, ctx.include_events)
     
     if computed_days <= 0:
         raise HTTPException(
@@ -618,13 +659,9 @@ def apply_leave(
         )
     
     # Get policy settings for the year
-    year = from_date.year
-    settings = get_or_create_policy_settings(db, year)
+    settings = ctx.settings
     today = date.today()
     
-    # Store original leave_type for validations
-    original_leave_type = leave_type
-    
     # Validate backdated leave rule (applies to all leave types)
     is_backdated, auto_lwp_reason = validate_backdated_leave(from_date, settings, today)
     
@@ -636,36 +673,116 @@ def apply_leave(
     
     # Validate company event blocking (unless override or LWP)
     # LWP doesn't need event blocking (it's already a penalty/conversion)
-    if leave_type != LeaveType.LWP and not override_policy:
+    # The calendar answers "no events in range" without a query
+    if (
+        leave_type != LeaveType.LWP
+        and not override_policy
+        and work_calendar.count(db, from_date, to_date, EVENT)
+    ):
         validate_company_event_block(db, from_date, to_date, year, override_policy)
     
     # Run policy validations (unless override is enabled or LWP)
     # COMPOFF and LWP are exempt from PL eligibility, notice, and monthly cap
+    available = 0.0
     if leave_type not in (LeaveType.COMPOFF, LeaveType.LWP):
         # Use new PL eligibility rule (replaces probation lock)
         validate_pl_eligibility(employee, leave_type, from_date, settings, today, override_policy)
         validate_notice(leave_type, from_date, settings, today, override_policy)
         # Validate monthly cap (check approved history) - only if enforcement is enabled
-        validate_monthly_cap(db, employee_id, by_month, settings, year)
+        validate_monthly_cap(db, ctx.employee_id, by_month, settings, year)
         if leave_type in WALLET_LEAVE_TYPES:
-            bal = wallet.get_wallet_balances(db, employee_id, year)
-            available_map = {b.leave_type: float(b.remaining) for b in bal}
-            available = available_map.get(leave_type, 0.0)
+            available = ctx.available.get(leave_type, 0.0)
             if leave_type == LeaveType.RH and computed_days > available and not override_policy:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Insufficient RH entitlement for the requested date"
                 )
+    
+    if leave_type in WALLET_LEAVE_TYPES and leave_type != LeaveType.RH:
+        paid_days, lwp_days = compute_split(leave_type, computed_days, available)
     else:
-        available = 0.0
+        paid_days, lwp_days = Decimal('0'), Decimal('0')
+    
+    return LeaveEvaluation(
+        leave_type=leave_type,
+        from_date=from_date,
+        to_date=to_date,
+        duration=duration,
+        half_day_session=half_day_session,
+        computed_days=computed_days,
+        by_month=by_month,
+        paid_days=paid_days,
+        lwp_days=lwp_days,
+        auto_lwp_reason=auto_lwp_reason,
+        sandwich_dates=sandwich_dates,
+    )
+
+
+def _sandwiched_dates(db: Session, from_date: date, to_date: date, include_events: bool) -> List[date]:
+    """Non-working days between the first and last counted day (charged under the sandwich rule)"""
+    mask = NON_WORKING | EVENT if include_events else NON_WORKING
+    first = work_calendar.first_clear(db, from_date, to_date, mask)
+    if first is None:
+        return []
+    last = work_calendar.first_clear(db, first, to_date, mask, reverse=True)
+    return sorted(work_calendar.dates(db, first, last, mask))
+
+
+def apply_leave(
+    db: Session,
+    employee_id: int,
+    leave_type: LeaveType,
+    from_date: date,
+    to_date: date,
+    reason: Optional[str] = None,
+    duration: Optional[LeaveDuration] = None,
+    half_day_session: Optional[HalfDaySession] = None,
+    override_policy: bool = False,
+    override_remark: Optional[str] = None,
+    current_user: Optional[Employee] = None
+) -> LeaveRequest:
+    """
+    Apply for leave (creates PENDING request)
+    
+    Args:
+        db: Database session
+        employee_id: Employee ID applying for leave
+        leave_type: Type of leave
+        from_date: Start date
+        to_date: End date
+        reason: Optional reason
+        override_policy: Whether to override policy rules (HR only)
+        override_remark: Remark for override (required if override_policy is True)
+        current_user: Current authenticated user (for override validation)
+    
+    Returns:
+        Created LeaveRequest instance
+    
+    Raises:
+        HTTPException: If validation fails
+    """
+    ctx = LeaveContext(db, employee_id, from_date.year)
+    result = evaluate_leave(
+        ctx,
+        leave_type,
+        from_date,
+        to_date,
+        duration=duration,
+        half_day_session=half_day_session,
+        override_policy=override_policy,
+        override_remark=override_remark,
+        current_user=current_user,
+    )
+    leave_type = result.leave_type
+    computed_days = result.computed_days
     
     # Convert by_month dict to JSON string for storage
-    computed_days_by_month_json = json.dumps(by_month) if by_month else None
+    computed_days_by_month_json = json.dumps(result.by_month) if result.by_month else None
     
     # Create leave request
     leave_request = LeaveRequest(
         employee_id=employee_id,
-        approver_id=employee.reporting_manager_id,
+        approver_id=ctx.employee.reporting_manager_id,
         leave_type=leave_type,
         from_date=from_date,
         to_date=to_date,
@@ -673,20 +790,29 @@ def apply_leave(
         status=LeaveStatus.PENDING,
         computed_days=Decimal(str(computed_days)),
         computed_days_by_month=computed_days_by_month_json,
-        paid_days=(compute_split(leave_type, computed_days, available)[0] if leave_type in WALLET_LEAVE_TYPES and leave_type != LeaveType.RH else Decimal('0')),
-        lwp_days=(compute_split(leave_type, computed_days, available)[1] if leave_type in WALLET_LEAVE_TYPES and leave_type != LeaveType.RH else Decimal('0')),
-        duration=duration,
-        half_day_session=half_day_session,
+        paid_days=result.paid_days,
+        lwp_days=result.lwp_days,
+        duration=result.duration,
+        half_day_session=result.half_day_session,
         override_policy=override_policy,
         override_remark=override_remark,
-        auto_converted_to_lwp=(auto_lwp_reason is not None),
-        auto_lwp_reason=auto_lwp_reason,
+        auto_converted_to_lwp=(result.auto_lwp_reason is not None),
+        auto_lwp_reason=result.auto_lwp_reason,
         applied_at=datetime.now(timezone.utc)
     )
     
     db.add(leave_request)
-    db.commit()
-    db.refresh(leave_request)
+    try:
+        commit_or_flush(db, leave_request)
+    except IntegrityError as exc:
+        # A concurrent apply for overlapping dates committed after our overlap check
+        if not _is_overlap_violation(exc):
+            raise
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Leave request overlaps with an existing leave between {from_date} and {to_date}"
+        )
     
     # Log audit
     audit_meta = {
@@ -715,85 +841,147 @@ def apply_leave(
     return leave_request
 
 
+def quote_leaves(
+    db: Session,
+    employee_id: int,
+    candidates: List[Dict],
+) -> List[Dict]:
+    """
+    Run the apply pipeline for many candidate leaves without persisting anything.
+
+    candidates: dicts with leave_type, from_date, to_date and optional duration /
+    half_day_session. One preview LeaveContext is shared per calendar year, so
+    policy, wallet and existing leaves are read once per batch; the work
+    calendar answers day counts from memory. Returns one dict per candidate, in
+    order: valid plus the computed fields, or the status/detail apply_leave
+    would have raised. Never commits or writes audit entries.
+    """
+    contexts: Dict[int, LeaveContext] = {}
+    results = []
+    for candidate in candidates:
+        from_date = candidate["from_date"]
+        ctx = contexts.get(from_date.year)
+        if ctx is None:
+            ctx = contexts[from_date.year] = LeaveContext(db, employee_id, from_date.year, preview=True)
+        item = {
+            "leave_type": candidate["leave_type"],
+            "from_date": from_date,
+            "to_date": candidate["to_date"],
+        }
+        try:
+            result = evaluate_leave(
+                ctx,
+                candidate["leave_type"],
+                from_date,
+                candidate["to_date"],
+                duration=candidate.get("duration"),
+                half_day_session=candidate.get("half_day_session"),
+            )
+        except HTTPException as exc:
+            item.update(valid=False, error_status=exc.status_code, error_detail=str(exc.detail))
+        else:
+            item.update(
+                valid=True,
+                effective_leave_type=result.leave_type,
+                duration=result.duration,
+                half_day_session=result.half_day_session,
+                computed_days=result.computed_days,
+                computed_days_by_month=result.by_month,
+                paid_days=float(result.paid_days),
+                lwp_days=float(result.lwp_days),
+                auto_converted_to_lwp=result.auto_lwp_reason is not None,
+                auto_lwp_reason=result.auto_lwp_reason,
+                sandwich_dates=result.sandwich_dates,
+            )
+        results.append(item)
+    return results
+
+
+# Employee columns rendered by EmployeeOut (no password/login bookkeeping)
+_EMPLOYEE_OUT_COLUMNS = (
+    Employee.id,
+    Employee.emp_code,
+    Employee.name,
+    Employee.mobile_number,
+    Employee.role,
+    Employee.department_id,
+    Employee.reporting_manager_id,
+    Employee.dob,
+    Employee.profile_photo_url,
+    Employee.photo_key,
+    Employee.join_date,
+    Employee.active,
+    Employee.work_mode,
+    Employee.created_at,
+    Employee.updated_at,
+)
+
+
+def _employee_out_load(loader):
+    """Restrict a loaded Employee to EmployeeOut columns, its reporting_manager to the ref columns"""
+    return loader.load_only(*_EMPLOYEE_OUT_COLUMNS).options(
+        selectinload(Employee.reporting_manager).load_only(Employee.id, Employee.emp_code, Employee.name)
+    )
+
+
+# Loader options for leave lists rendered as LeaveListItemOut. The applicant is
+# joined (always present); approver / rejected_by / cancelled_by are mostly
+# NULL, so each is one IN query over the distinct ids on the page instead of
+# three more outer joins per row.
+LEAVE_LIST_LOAD = (
+    _employee_out_load(joinedload(LeaveRequest.employee, innerjoin=True)),
+    _employee_out_load(selectinload(LeaveRequest.approver)),
+    _employee_out_load(selectinload(LeaveRequest.rejected_by)),
+    _employee_out_load(selectinload(LeaveRequest.cancelled_by)),
+)
+
+
 def list_leaves(
     db: Session,
     current_user: Employee,
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
-    employee_id: Optional[int] = None
-) -> List[LeaveRequest]:
+    employee_id: Optional[int] = None,
+    scope: Optional[VisibilityScope] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    updated_since: Optional[datetime] = None,
+) -> Tuple[List[LeaveRequest], Optional[str]]:
     """
     List leave requests with role-based scoping.
     Includes ALL statuses (PENDING, APPROVED, REJECTED, CANCELLED). Do NOT filter out CANCELLED.
     Never transform or overwrite status (e.g. never return PENDING for a cancelled leave).
+
+    Visibility (scope.leaves): ADMIN/MD everyone; VP/MANAGER themselves plus
+    same-department subordinates; everyone else only themselves. Pass the
+    request's scope to avoid resolving it again.
+
+    Newest first, keyset-paginated on (applied_at, id): returns (rows,
+    next_cursor); pass next_cursor back to get the following page. Without a
+    limit every matching row is returned. updated_since keeps only rows
+    changed at or after that instant (mobile delta sync).
     """
-    query = db.query(LeaveRequest).options(
-        joinedload(LeaveRequest.employee),
-        joinedload(LeaveRequest.approver),
-        joinedload(LeaveRequest.rejected_by),
-        joinedload(LeaveRequest.cancelled_by)
-    )
+    query = db.query(LeaveRequest).options(*LEAVE_LIST_LOAD)
 
-    # Get current user's role_rank for permission checking
-    current_user_rank = get_role_rank(db, current_user)
-    
-    # Apply role_rank-based scoping with department separation
-    if current_user_rank <= 2:  # ADMIN (1) and MD (2) have global access
-        # ADMIN and MD can see all employees across all departments
-        if employee_id:
-            query = query.filter(LeaveRequest.employee_id == employee_id)
+    visible = (scope or resolve_visibility_scope(db, current_user)).leaves
+    if employee_id:
+        if not visible.can_see(employee_id):
+            # Employee not in visible hierarchy or different department
+            return [], None
+        query = query.filter(LeaveRequest.employee_id == employee_id)
     else:
-        # For roles with rank 3+ (VP, MANAGER, EMPLOYEE, etc.)
-        # They can only see employees in the same department
-        
-        # First, get all subordinate IDs in the hierarchy (same department only)
-        subordinate_ids = []
-        if current_user_rank <= 4:  # VP (3) and MANAGER (4) can see their hierarchy
-            # Get all subordinates in the reporting hierarchy
-            all_subordinate_ids = get_subordinate_ids(db, current_user.id)
-            
-            # Filter subordinates to only those in the same department
-            for sub_id in all_subordinate_ids:
-                # Check if subordinate is in the same department
-                sub_employee = db.query(Employee).filter(Employee.id == sub_id).first()
-                if sub_employee and sub_employee.department_id == current_user.department_id:
-                    subordinate_ids.append(sub_id)
-        
-        # Always include the current user's own leaves
-        subordinate_ids.append(current_user.id)
-        
-        if employee_id:
-            # Specific employee requested
-            if employee_id == current_user.id:
-                # "My leaves" for current user
-                query = query.filter(LeaveRequest.employee_id == current_user.id)
-            elif employee_id not in subordinate_ids:
-                # Employee not in visible hierarchy or different department
-                return []
-            else:
-                # Employee is in visible hierarchy and same department
-                query = query.filter(LeaveRequest.employee_id == employee_id)
-        else:
-            # No specific employee requested, show all visible leaves
-            if subordinate_ids:
-                # Show leaves for all visible employees (same department hierarchy)
-                query = query.filter(LeaveRequest.employee_id.in_(subordinate_ids))
-            else:
-                # No visible subordinates, return only current user's own leaves
-                query = query.filter(LeaveRequest.employee_id == current_user.id)
-        
-        # Additional department filter to ensure only same department leaves are visible
-        query = query.join(Employee, LeaveRequest.employee_id == Employee.id)
-        query = query.filter(Employee.department_id == current_user.department_id)
+        query = query.filter(visible.filter(LeaveRequest.employee_id))
     
     # Apply date filters
     if from_date:
         query = query.filter(LeaveRequest.to_date >= from_date)
     if to_date:
         query = query.filter(LeaveRequest.from_date <= to_date)
+    if updated_since:
+        query = changed_since(query, LeaveRequest.updated_at, ensure_utc(updated_since))
     
     # Order by applied_at descending (most recent first)
-    return query.order_by(LeaveRequest.applied_at.desc()).all()
+    return paginate(query, LeaveRequest.applied_at, LeaveRequest.id, cursor, limit, descending=True)
 
 
 def compute_split(
@@ -817,9 +1005,10 @@ def get_or_create_balance(
 ) -> Optional[LeaveBalance]:
     """
     Ensure wallet exists for employee/year and return the CL balance row (for backward compat).
+    Only writes when the wallet is missing; accrued is the persisted snapshot.
     Prefer using leave_wallet_service.get_wallet_balances for per-type balances.
     """
-    wallet.ensure_wallet_for_employee(db, employee_id, year)
+    wallet.init_wallet_if_missing(db, employee_id, year)
     return (
         db.query(LeaveBalance)
         .filter(
@@ -892,9 +1081,7 @@ def validate_approval_authority(
     # VP (rank=3) and MANAGER (rank=4) can approve leaves for their hierarchical subordinates (recursive)
     if approver_rank <= 4:  # VP and MANAGER
         # Check if employee is in the approver's hierarchical subtree (recursive, all departments)
-        subordinate_ids = get_subordinate_ids(db, approver.id)
-        
-        if leave_request.employee_id in subordinate_ids:
+        if is_subordinate(db, approver.id, leave_request.employee_id):
             return
         else:
             raise HTTPException(
@@ -943,13 +1130,36 @@ def can_approve_leave(
     
     # VP (rank=3) and MANAGER (rank=4) can approve leaves for their hierarchical subordinates
     if approver_rank <= 4:
-        subordinate_ids = get_subordinate_ids(db, approver.id)
-        return leave_request.employee_id in subordinate_ids
+        return is_subordinate(db, approver.id, leave_request.employee_id)
     
     # No approval authority for other roles (EMPLOYEE, etc.)
     return False
 
 
+def _notify_leave_approved(db: Session, leave_request_id: int, uid: int) -> None:
+    """Queue a push to the employee whose leave was approved"""
+    try:
+        tokens = [r[0] for r in db.query(NotificationDevice.fcm_token)
+                  .filter(NotificationDevice.user_id == uid, NotificationDevice.is_active.is_(True))
+                  .all()]
+        logger.info(
+            "leave approval notify: employee_id=%s tokens_found=%s title=%s body=%s",
+            uid, len(tokens), "Leave Approved", "Your leave request has been approved."
+        )
+        if tokens:
+            send_push_in_background(
+                tokens,
+                title="Leave Approved",
+                body="Your leave request has been approved.",
+                data={"type": "LEAVE_APPROVED", "leave_request_id": str(leave_request_id)},
+                label=f"leave approval notify: employee_id={uid}",
+            )
+        else:
+            logger.info("leave approval notify: no active tokens for employee_id=%s", uid)
+    except Exception as e:
+        logger.exception("leave approval notify: exception while queueing push employee_id=%s", uid)
+
+
 def approve_leave(
     db: Session,
     leave_request_id: int,
@@ -998,9 +1208,30 @@ def approve_leave(
             detail="Employee not found"
         )
     
+    _approve_pending(db, leave_request, employee, approver, remarks)
+    leave_id, uid = leave_request.id, leave_request.employee_id
+    after_commit(db, lambda: _notify_leave_approved(db, leave_id, uid))
+
+    return leave_request
+
+
+def _approve_pending(
+    db: Session,
+    leave_request: LeaveRequest,
+    employee: Employee,
+    approver: Employee,
+    remarks: Optional[str],
+) -> None:
+    """
+    Approve a PENDING leave whose approval authority is already checked:
+    policy re-validation, wallet/comp-off deduction, approval row and audit.
+    No notification; callers send it after commit.
+    """
+    leave_request_id = leave_request.id
+
     # Get policy settings
     year = leave_request.from_date.year
-    settings = get_or_create_policy_settings(db, year)
+    settings = policy_cache.get(db, year)
     today = date.today()
     
     # If override_policy is true, validate that approver is HR and remark is present
@@ -1055,8 +1286,8 @@ def approve_leave(
         )
     elif leave_request.leave_type in WALLET_LEAVE_TYPES:
         # Wallet: deduct and set paid_days/lwp_days, approver/remark/at
+        # Same identity-map object: updated in place
         wallet.apply_leave_approval(db, leave_request_id, approver.id, remarks)
-        db.refresh(leave_request)
         paid_days = leave_request.paid_days
         lwp_days = leave_request.lwp_days
     else:
@@ -1087,9 +1318,7 @@ def approve_leave(
         remarks=remarks
     )
     db.add(approval)
-    db.commit()
-    db.refresh(leave_request)
-    db.refresh(approval)
+    commit_or_flush(db, leave_request, approval)
     
     # Log audit
     audit_action = "LEAVE_APPROVE_COMPOFF" if leave_request.leave_type == LeaveType.COMPOFF else "LEAVE_APPROVE"
@@ -1114,32 +1343,6 @@ def approve_leave(
         entity_id=leave_request.id,
         meta=audit_meta
     )
-    try:
-        # Send push notification to the employee whose leave was approved
-        uid = leave_request.employee_id
-        tokens = [r[0] for r in db.query(NotificationDevice.fcm_token)
-                  .filter(NotificationDevice.user_id == uid, NotificationDevice.is_active.is_(True))
-                  .all()]
-        logger.info(
-            "leave approval notify: employee_id=%s tokens_found=%s title=%s body=%s",
-            uid, len(tokens), "Leave Approved", "Your leave request has been approved."
-        )
-        if tokens:
-            res = send_push_to_tokens(
-                tokens,
-                title="Leave Approved",
-                body="Your leave request has been approved.",
-                data={"type": "LEAVE_APPROVED", "leave_request_id": str(leave_request.id)}
-            )
-            ok = bool(res.get("success")) and int(res.get("success_count", 0)) > 0
-            if not ok:
-                logger.error("leave approval notify failed: employee_id=%s error=%s", uid, res.get("error"))
-        else:
-            logger.info("leave approval notify: no active tokens for employee_id=%s", uid)
-    except Exception as e:
-        logger.exception("leave approval notify: exception while sending push employee_id=%s", leave_request.employee_id)
-
-    return leave_request
 
 
 def reject_leave(
@@ -1178,9 +1381,24 @@ def reject_leave(
         )
     validate_approval_authority(db, leave_request, approver)
 
+    _reject_pending(db, leave_request, approver, remarks)
+    leave_id, uid = leave_request.id, leave_request.employee_id
+    after_commit(db, lambda: _notify_leave_rejected(db, leave_id, uid))
+
+    return leave_request
+
+
+def _reject_pending(
+    db: Session,
+    leave_request: LeaveRequest,
+    approver: Employee,
+    remarks: str,
+) -> None:
+    """Reject a PENDING leave whose authority is already checked: status, approval row and audit"""
+    leave_request_id = leave_request.id
     before_status = leave_request.status.value
+    # Same identity-map object: updated in place
     wallet.apply_leave_rejection(db, leave_request_id, approver.id, remarks)
-    db.refresh(leave_request)
     logger.info(
         "leave status transition: leave_request_id=%s before=%s after=REJECTED action=reject",
         leave_request_id, before_status,
@@ -1193,9 +1411,7 @@ def reject_leave(
         remarks=remarks
     )
     db.add(approval)
-    db.commit()
-    db.refresh(leave_request)
-    db.refresh(approval)
+    commit_or_flush(db, leave_request, approval)
 
     # Log audit
     log_audit(
@@ -1211,8 +1427,11 @@ def reject_leave(
             "remarks": remarks
         }
     )
+
+
+def _notify_leave_rejected(db: Session, leave_request_id: int, uid: int) -> None:
+    """Queue a push to the employee whose leave was rejected"""
     try:
-        uid = leave_request.employee_id
         tokens = [r[0] for r in db.query(NotificationDevice.fcm_token)
                   .filter(NotificationDevice.user_id == uid, NotificationDevice.is_active.is_(True))
                   .all()]
@@ -1221,21 +1440,139 @@ def reject_leave(
             uid, len(tokens), "Leave Rejected", "Your leave request has been rejected."
         )
         if tokens:
-            res = send_push_to_tokens(
+            send_push_in_background(
                 tokens,
                 title="Leave Rejected",
                 body="Your leave request has been rejected.",
-                data={"type": "LEAVE_REJECTED", "leave_request_id": str(leave_request.id)}
+                data={"type": "LEAVE_REJECTED", "leave_request_id": str(leave_request_id)},
+                label=f"leave reject notify: employee_id={uid}",
             )
-            ok = bool(res.get("success")) and int(res.get("success_count", 0)) > 0
-            if not ok:
-                logger.error("leave reject notify failed: employee_id=%s error=%s", uid, res.get("error"))
         else:
             logger.info("leave reject notify: no active tokens for employee_id=%s", uid)
     except Exception:
-        logger.exception("leave reject notify: exception while sending push employee_id=%s", leave_request.employee_id)
+        logger.exception("leave reject notify: exception while queueing push employee_id=%s", uid)
 
-    return leave_request
+
+def _validate_authority_in_scope(
+    leave_request: LeaveRequest,
+    approver: Employee,
+    approvals: ScopeView,
+) -> None:
+    """validate_approval_authority against a pre-resolved approvals scope (no queries)"""
+    if approver.id == leave_request.employee_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Employee cannot approve their own leave"
+        )
+    if not approvals.can_see(leave_request.employee_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only approve leaves for your hierarchical subordinates"
+        )
+
+
+def bulk_leave_action(
+    db: Session,
+    leave_request_ids: List[int],
+    action: ApprovalAction,
+    approver: Employee,
+    remarks: Optional[str] = None,
+    scope: Optional[VisibilityScope] = None,
+) -> List[Dict]:
+    """
+    Approve or reject many PENDING leaves in one transaction (approver month-end queue).
+
+    Authority comes from the approver's visibility scope (resolved once), the
+    leaves and their employees load in one query, and policy settings come
+    from the per-year cache. Each item runs in a SAVEPOINT: a failing item is
+    rolled back and reported with the status/detail the single-item endpoint
+    would return, the others still apply. Everything commits once (joining
+    the caller's unit of work if there is one); pushes go out as one
+    multicast per action after the commit.
+
+    Returns one dict per distinct id, in request order.
+    """
+    if action not in (ApprovalAction.APPROVE, ApprovalAction.REJECT):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported bulk action {action.value}"
+        )
+    if action == ApprovalAction.REJECT and not (remarks or "").strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="remarks are required to reject leave requests"
+        )
+    scope = scope or resolve_visibility_scope(db, approver)
+    ids = list(dict.fromkeys(leave_request_ids))
+    leaves = {
+        lr.id: lr
+        for lr in db.query(LeaveRequest)
+        .options(joinedload(LeaveRequest.employee))
+        .filter(LeaveRequest.id.in_(ids))
+        .all()
+    }
+    verb = "approve" if action == ApprovalAction.APPROVE else "reject"
+
+    results = []
+    decided: Dict[int, int] = {}  # leave_request_id -> employee_id
+    with unit_of_work(db):
+        for leave_request_id in ids:
+            item = {"leave_request_id": leave_request_id}
+            leave_request = leaves.get(leave_request_id)
+            try:
+                if leave_request is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=f"Leave request with id {leave_request_id} not found"
+                    )
+                if leave_request.status != LeaveStatus.PENDING:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Cannot {verb} leave request with status {leave_request.status.value}"
+                    )
+                _validate_authority_in_scope(leave_request, approver, scope.approvals)
+                with db.begin_nested():
+                    if action == ApprovalAction.APPROVE:
+                        _approve_pending(db, leave_request, leave_request.employee, approver, remarks)
+                    else:
+                        _reject_pending(db, leave_request, approver, remarks)
+            except HTTPException as exc:
+                item.update(ok=False, error_status=exc.status_code, error_detail=str(exc.detail))
+            else:
+                item.update(ok=True, status=leave_request.status)
+                decided[leave_request_id] = leave_request.employee_id
+            results.append(item)
+
+        if decided:
+            employee_ids = set(decided.values())
+            after_commit(db, lambda: _notify_leaves_decided(db, action, employee_ids))
+
+    logger.info(
+        "bulk leave %s: approver_id=%s requested=%s succeeded=%s",
+        verb, approver.id, len(ids), len(decided),
+    )
+    return results
+
+
+def _notify_leaves_decided(db: Session, action: ApprovalAction, employee_ids: Set[int]) -> None:
+    """Queue one multicast push to every active device of the employees whose leaves were decided"""
+    if action == ApprovalAction.APPROVE:
+        title, body, kind = "Leave Approved", "Your leave request has been approved.", "LEAVE_APPROVED"
+    else:
+        title, body, kind = "Leave Rejected", "Your leave request has been rejected.", "LEAVE_REJECTED"
+    try:
+        tokens = [r[0] for r in db.query(NotificationDevice.fcm_token)
+                  .filter(NotificationDevice.user_id.in_(sorted(employee_ids)), NotificationDevice.is_active.is_(True))
+                  .all()]
+        logger.info(
+            "bulk leave notify: employees=%s tokens_found=%s title=%s", len(employee_ids), len(tokens), title
+        )
+        if not tokens:
+            return
+        # One message for all recipients: no per-leave id, the app refreshes its list
+        send_push_in_background(tokens, title=title, body=body, data={"type": kind}, label="bulk leave notify")
+    except Exception:
+        logger.exception("bulk leave notify: exception while queueing push")
 
 
 def cancel_leave(
@@ -1305,69 +1642,172 @@ def cancel_leave(
             uid, len(tokens), "Leave Cancelled", "Your approved leave has been cancelled."
         )
         if tokens:
-            res = send_push_to_tokens(
+            send_push_in_background(
                 tokens,
                 title="Leave Cancelled",
                 body="Your approved leave has been cancelled.",
-                data={"type": "LEAVE_CANCELLED", "leave_request_id": str(leave_request.id)}
+                data={"type": "LEAVE_CANCELLED", "leave_request_id": str(leave_request.id)},
+                label=f"leave cancel notify: employee_id={uid}",
             )
-            ok = bool(res.get("success")) and int(res.get("success_count", 0)) > 0
-            if not ok:
-                logger.error("leave cancel notify failed: employee_id=%s error=%s", uid, res.get("error"))
         else:
             logger.info("leave cancel notify: no active tokens for employee_id=%s", uid)
     except Exception:
-        logger.exception("leave cancel notify: exception while sending push employee_id=%s", leave_request.employee_id)
+        logger.exception("leave cancel notify: exception while queueing push employee_id=%s", leave_request.employee_id)
     return leave_request
 
 def list_pending_for_approver(
     db: Session,
-    current_user: Employee
-) -> List[LeaveRequest]:
+    current_user: Employee,
+    scope: Optional[VisibilityScope] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    updated_since: Optional[datetime] = None,
+) -> Tuple[List[LeaveRequest], Optional[str]]:
     """
     List pending leave requests for the current user based on role_rank and reporting hierarchy
     
     Args:
         db: Database session
         current_user: Current authenticated user
+        cursor / limit: keyset page on (applied_at, id), oldest first
+        updated_since: only rows changed at or after this instant
     
     Returns:
-        List of pending LeaveRequest instances
+        (pending LeaveRequest instances, next_cursor or None on the last page)
     
     Role_rank-based scoping:
         - ADMIN (rank=1) and MD (rank=2): all pending requests across all departments
         - VP (rank=3) and MANAGER (rank=4): pending requests for hierarchical subordinates (recursive)
         - EMPLOYEE (rank=5+): empty list (cannot approve)
     """
-    query = db.query(LeaveRequest).options(
-        joinedload(LeaveRequest.employee),
-        joinedload(LeaveRequest.approver),
-        joinedload(LeaveRequest.rejected_by),
-        joinedload(LeaveRequest.cancelled_by)
-    ).filter(LeaveRequest.status == LeaveStatus.PENDING)
-
-    # Get current user's role_rank for permission checking
-    current_user_rank = get_role_rank(db, current_user)
-    
-    # ADMIN (rank=1) and MD (rank=2) can see all pending requests across all departments
-    if current_user_rank <= 2:
-        pass  # No additional filtering needed
-    
-    # VP (rank=3) and MANAGER (rank=4) can see pending requests for hierarchical subordinates (recursive)
-    elif current_user_rank <= 4:
-        # Get all subordinate IDs in the hierarchy (recursive, all departments)
-        subordinate_ids = get_subordinate_ids(db, current_user.id)
-        
-        if subordinate_ids:
-            # Show leaves from hierarchical subordinates (recursive reporting tree)
-            query = query.filter(LeaveRequest.employee_id.in_(subordinate_ids))
-        else:
-            # No subordinates, return empty list
-            query = query.filter(LeaveRequest.employee_id == -1)  # Force empty result
-    
-    else:
-        # EMPLOYEE (rank=5+) and other roles: empty list (cannot approve)
-        query = query.filter(LeaveRequest.employee_id == -1)  # Force empty result
+    query = db.query(LeaveRequest).options(*LEAVE_LIST_LOAD).filter(LeaveRequest.status == LeaveStatus.PENDING)
+
+    # scope.approvals: everyone for ADMIN/MD, the hierarchical subtree for
+    # VP/MANAGER, nobody for other roles
+    visible = (scope or resolve_visibility_scope(db, current_user)).approvals
+    query = query.filter(visible.filter(LeaveRequest.employee_id))
+    if updated_since:
+        query = changed_since(query, LeaveRequest.updated_at, ensure_utc(updated_since))
     
     # Order by applied_at ascending (oldest first, so approvers see oldest requests first)
-    return query.order_by(LeaveRequest.applied_at.asc()).all()
+    return paginate(query, LeaveRequest.applied_at, LeaveRequest.id, cursor, limit)
+
+
+def recompute_pending_leave_days(
+    db: Session,
+    year: int,
+    actor_id: Optional[int] = None
+) -> dict:
+    """
+    Recompute computed_days / computed_days_by_month (and the paid/LWP estimate)
+    of every PENDING leave starting in `year` against the current holiday and
+    event calendar, e.g. after HR edits the calendar mid-year.
+
+    One query for the pending rows, one for the wallet balances, one calendar
+    build for the year, then a single bulk UPDATE of the rows that changed.
+    Not changed (reported instead):
+    - auto-converted LWP leaves (the original type that decided the sandwich rule is not stored)
+    - leaves whose every day is now non-working (zero days; HR should cancel or reject them)
+
+    Returns:
+        Summary dict: year, pending, updated (ids), unchanged, zero_day (ids), skipped_auto_lwp (ids)
+    """
+    try:
+        settings = policy_cache.get(db, year)
+        include_events = getattr(settings, 'treat_event_as_non_working_for_sandwich', True)
+    except Exception:
+        include_events = True
+    mask = NON_WORKING | EVENT if include_events else NON_WORKING
+
+    pending = db.execute(
+        select(
+            LeaveRequest.id,
+            LeaveRequest.employee_id,
+            LeaveRequest.leave_type,
+            LeaveRequest.from_date,
+            LeaveRequest.to_date,
+            LeaveRequest.duration,
+            LeaveRequest.auto_converted_to_lwp,
+            LeaveRequest.computed_days,
+            LeaveRequest.computed_days_by_month,
+        ).where(
+            LeaveRequest.status == LeaveStatus.PENDING,
+            LeaveRequest.from_date >= date(year, 1, 1),
+            LeaveRequest.from_date <= date(year, 12, 31),
+        )
+    ).all()
+
+    remaining: Dict[Tuple[int, LeaveType], float] = {}
+    employee_ids = {row.employee_id for row in pending}
+    if employee_ids:
+        for emp_id, leave_type, left in db.execute(
+            select(LeaveBalance.employee_id, LeaveBalance.leave_type, LeaveBalance.remaining).where(
+                LeaveBalance.year == year,
+                LeaveBalance.employee_id.in_(employee_ids),
+            )
+        ):
+            remaining[(emp_id, leave_type)] = float(left)
+
+    updates = []
+    unchanged = 0
+    zero_day: List[int] = []
+    skipped_auto_lwp: List[int] = []
+    for row in pending:
+        if row.auto_converted_to_lwp:
+            skipped_auto_lwp.append(row.id)
+            continue
+        if row.duration == LeaveDuration.HALF_DAY:
+            if work_calendar.has(db, row.from_date, mask):
+                zero_day.append(row.id)
+            else:
+                unchanged += 1
+            continue
+
+        days, by_month = count_leave_days(db, row.leave_type, row.from_date, row.to_date, include_events)
+        if days <= 0:
+            zero_day.append(row.id)
+            continue
+        old_by_month = json.loads(row.computed_days_by_month) if row.computed_days_by_month else {}
+        if float(row.computed_days) == days and old_by_month == by_month:
+            unchanged += 1
+            continue
+
+        if row.leave_type in WALLET_LEAVE_TYPES and row.leave_type != LeaveType.RH:
+            paid, lwp = compute_split(row.leave_type, days, remaining.get((row.employee_id, row.leave_type), 0.0))
+        else:
+            paid, lwp = Decimal('0'), Decimal('0')
+        updates.append({
+            "id": row.id,
+            "computed_days": Decimal(str(days)),
+            "computed_days_by_month": json.dumps(by_month),
+            "paid_days": paid,
+            "lwp_days": lwp,
+        })
+
+    if updates:
+        db.execute(update(LeaveRequest), updates)
+        # Bulk UPDATE bypasses the ORM flush hook that maintains the month rows
+        replace_month_days(db, {u["id"]: u["computed_days_by_month"] for u in updates})
+    db.commit()
+
+    summary = {
+        "year": year,
+        "pending": len(pending),
+        "updated": [u["id"] for u in updates],
+        "unchanged": unchanged,
+        "zero_day": zero_day,
+        "skipped_auto_lwp": skipped_auto_lwp,
+    }
+    if actor_id and updates:
+        log_audit(
+            db=db,
+            actor_id=actor_id,
+            action="LEAVE_DAYS_RECOMPUTE",
+            entity_type="leave_requests",
+            meta=summary,
+        )
+    logger.info(
+        "Recomputed pending leave days for %s: %s updated, %s unchanged, %s zero-day, %s auto-LWP skipped",
+        year, len(updates), unchanged, len(zero_day), len(skipped_auto_lwp),
+    )
+    return summary
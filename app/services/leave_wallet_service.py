@@ -7,11 +7,15 @@ Leave Wallet Service - ACS policy (Jan–Dec year).
   - Nov–Dec: PL +0.5, FL +0.5, SL +0.5
 - PL/FL usable only after 6 months from join_date (accrual before eligibility is locked at UI).
 - On APPROVE: deduct from wallet; on REJECT: no deduct; on CANCEL: optional recredit.
+- Reads (get_wallet_balances) are SELECT-only: accrued is a snapshot written by
+  accrual runs and ledger events (accrued_as_of); a snapshot from an earlier
+  month is brought forward in memory, never written back on read.
 """
 import logging
+from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
@@ -26,7 +30,8 @@ from app.models.leave import (
     WALLET_LEAVE_TYPES,
 )
 from app.models.employee import Employee
-from app.services.policy_validator import get_or_create_policy_settings
+from app.db.unit_of_work import commit_or_flush
+from app.services.policy_cache import PolicySnapshot, policy_cache
 from app.utils.datetime_utils import now_utc
 
 logger = logging.getLogger(__name__)
@@ -35,8 +40,8 @@ logger = logging.getLogger(__name__)
 DEFAULT_PL_CARRY_FORWARD_CAP = 30
 
 
-def _entitlements_from_policy(db: Session, year: int) -> Dict[str, Any]:
-    policy = get_or_create_policy_settings(db, year)
+def _entitlements_from_policy(db: Session, year: int, policy: Optional[PolicySnapshot] = None) -> Dict[str, Any]:
+    policy = policy or policy_cache.get(db, year)
     return {
         "cl": int(getattr(policy, "annual_cl", 5)),
         "sl": int(getattr(policy, "annual_sl", 6)),
@@ -81,10 +86,63 @@ def _add_months(d: date, months: int) -> date:
         return date(year, month, 31)
 
 
+def pl_eligible_from(join_date: date) -> date:
+    """First date PL/FL can be used: 6 months from join_date."""
+    return _add_months(join_date, 6)
+
+
 def is_pl_eligible(employee: Employee, as_of_date: date) -> bool:
     """PL can be used only after employee completes 6 months from join_date."""
-    eligibility_date = _add_months(employee.join_date, 6)
-    return as_of_date >= eligibility_date
+    return as_of_date >= pl_eligible_from(employee.join_date)
+
+
+def _accrued_amounts(ent: Dict[str, Any], year: int, start_month: int, as_of: date) -> Dict[LeaveType, Any]:
+    """
+    Accrued per leave type for the year as of as_of, counting from start_month
+    (join month for that year's joiners, else January).
+    """
+    # Monthly accrual rules:
+    # Jan–Oct: PL +0.5, CL +0.5, SL +0.5
+    # Nov–Dec: PL +0.5, FL +0.5, SL +0.5
+    end_month = as_of.month
+    if as_of.year > year:
+        end_month = 12
+    if as_of.year < year:
+        end_month = 0
+    months_range = [m for m in range(start_month, end_month + 1) if 1 <= m <= 12]
+    pl_credits = sum(0.5 for m in months_range)
+    cl_credits = sum(0.5 for m in months_range if m <= 10)
+    sl_credits = sum(0.5 for m in months_range)
+    fl_credits = sum(0.5 for m in months_range if m >= 11)
+    pl_accrued = min(ent["pl"], pl_credits)
+    # December PL bonus (+1) once per year when processing December of the same year
+    if as_of.year == year and as_of.month == 12:
+        pl_accrued = min(ent["pl"], pl_accrued + 1.0)
+    return {
+        LeaveType.CL: float(min(ent["cl"], cl_credits)),
+        LeaveType.SL: float(min(ent["sl"], sl_credits)),
+        LeaveType.PL: float(pl_accrued),
+        LeaveType.FL: float(min(ent["fl"], fl_credits)),
+        LeaveType.RH: int(ent["rh"]),
+    }
+
+
+def accrual_by_start_month(
+    db: Session,
+    year: int,
+    as_of: date,
+    policy: Optional[PolicySnapshot] = None,
+) -> Dict[int, Dict[LeaveType, Decimal]]:
+    """
+    Accrued per leave type for every start month 1..12 as of as_of. An
+    employee's accrual depends on join_date only through its start month, so
+    a bulk run computes these twelve vectors once and maps employees onto them.
+    """
+    ent = _entitlements_from_policy(db, year, policy)
+    return {
+        start_month: {lt: Decimal(str(v)) for lt, v in _accrued_amounts(ent, year, start_month, as_of).items()}
+        for start_month in range(1, 13)
+    }
 
 
 def compute_accrual(
@@ -92,50 +150,33 @@ def compute_accrual(
     employee: Employee,
     year: int,
     as_of_date: Optional[date] = None,
+    policy: Optional[PolicySnapshot] = None,
 ) -> Dict[LeaveType, Dict[str, Any]]:
     """
     Compute accrued/remaining per leave type for the year as of as_of_date.
     Pro-rata for new joiners (from join month). PL accrues but is eligible only after 6 months.
     Returns dict of leave_type -> {accrued, remaining, total_entitlement, eligible (for PL)}.
+    Pass policy to use already loaded settings.
     """
     as_of = as_of_date or date.today()
-    ent = _entitlements_from_policy(db, year)
+    ent = _entitlements_from_policy(db, year, policy)
     months = _months_elapsed_in_year(employee.join_date, year, as_of)
     pl_eligible = is_pl_eligible(employee, as_of)
 
-    # Monthly accrual rules:
-    # Jan–Oct: PL +0.5, CL +0.5, SL +0.5
-    # Nov–Dec: PL +0.5, FL +0.5, SL +0.5
     start_month = employee.join_date.month if employee.join_date.year == year else 1
-    end_month = as_of.month
-    if as_of.year > year:
-        end_month = 12
-    if as_of.year < year:
-        end_month = 0
-    months_range = [m for m in range(start_month, end_month + 1) if 1 <= m <= 12]
-    pl_credits = sum(0.5 for m in months_range)
-    cl_credits = sum(0.5 for m in months_range if m <= 10)
-    sl_credits = sum(0.5 for m in months_range)
-    fl_credits = sum(0.5 for m in months_range if m >= 11)
+    accrued = _accrued_amounts(ent, year, start_month, as_of)
     cl_cap = ent["cl"]
     pl_cap = ent["pl"]
     sl_cap = ent["sl"]
     fl_cap = ent["fl"]
-    cl_accrued = min(cl_cap, cl_credits)
-    pl_accrued = min(pl_cap, pl_credits)
-    # December PL bonus (+1) once per year when processing December of the same year
-    if as_of.year == year and as_of.month == 12:
-        pl_accrued = min(pl_cap, pl_accrued + 1.0)
-    sl_accrued = min(sl_cap, sl_credits)
-    fl_accrued = min(fl_cap, fl_credits)
     rh_entitlement = ent["rh"]
 
     return {
-        LeaveType.CL: {"accrued": float(cl_accrued), "total_entitlement": cl_cap, "eligible": True},
-        LeaveType.SL: {"accrued": float(sl_accrued), "total_entitlement": sl_cap, "eligible": True},
-        LeaveType.PL: {"accrued": float(pl_accrued), "total_entitlement": pl_cap, "eligible": pl_eligible},
-        LeaveType.FL: {"accrued": float(fl_accrued), "total_entitlement": fl_cap, "eligible": pl_eligible},
-        LeaveType.RH: {"accrued": int(rh_entitlement), "total_entitlement": rh_entitlement, "eligible": True},
+        LeaveType.CL: {"accrued": accrued[LeaveType.CL], "total_entitlement": cl_cap, "eligible": True},
+        LeaveType.SL: {"accrued": accrued[LeaveType.SL], "total_entitlement": sl_cap, "eligible": True},
+        LeaveType.PL: {"accrued": accrued[LeaveType.PL], "total_entitlement": pl_cap, "eligible": pl_eligible},
+        LeaveType.FL: {"accrued": accrued[LeaveType.FL], "total_entitlement": fl_cap, "eligible": pl_eligible},
+        LeaveType.RH: {"accrued": accrued[LeaveType.RH], "total_entitlement": rh_entitlement, "eligible": True},
     }
 
 
@@ -179,28 +220,135 @@ def ensure_wallet_for_employee(
         info = acc[lt]
         accrued_val = Decimal(str(info["accrued"]))
         bal.accrued = accrued_val
+        bal.accrued_as_of = as_of
         # remaining = opening + accrued + carry_forward - used
         bal.remaining = bal.opening + bal.accrued + bal.carry_forward - bal.used
         rows.append(bal)
-    db.commit()
-    for r in rows:
-        db.refresh(r)
+    commit_or_flush(db, *rows)
     return rows
 
 
+def preview_remaining(
+    db: Session,
+    employee: Employee,
+    year: int,
+    policy: PolicySnapshot,
+    as_of_date: Optional[date] = None,
+) -> Dict[LeaveType, float]:
+    """
+    Remaining per wallet type as get_wallet_balances reports it, also for an
+    employee whose wallet rows don't exist yet (quotes / previews never create them).
+    """
+    acc = compute_accrual(db, employee, year, as_of_date, policy=policy)
+    rows = {
+        b.leave_type: b
+        for b in db.query(LeaveBalance).filter(
+            LeaveBalance.employee_id == employee.id,
+            LeaveBalance.year == year,
+        )
+    }
+    remaining = {}
+    for lt in WALLET_LEAVE_TYPES:
+        accrued = Decimal(str(acc[lt]["accrued"]))
+        bal = rows.get(lt)
+        if bal is None:
+            remaining[lt] = float(accrued)
+        else:
+            remaining[lt] = float(bal.opening + accrued + bal.carry_forward - bal.used)
+    return remaining
+
+
+@dataclass(frozen=True)
+class WalletBalance:
+    """Read-only wallet row for one leave type; remaining = opening + accrued + carry_forward - used"""
+    leave_type: LeaveType
+    opening: Decimal
+    accrued: Decimal
+    used: Decimal
+    carry_forward: Decimal
+    remaining: Decimal
+
+
+def _accrual_period(year: int, as_of: Optional[date]) -> Tuple[int, int]:
+    """(year, last accrued month) that an accrual as of `as_of` covers; (0, 0) when never computed"""
+    if as_of is None:
+        return (0, 0)
+    if as_of.year > year:
+        return (year, 12)
+    if as_of.year < year:
+        return (year, 0)
+    return (year, as_of.month)
+
+
+def init_wallet_if_missing(db: Session, employee_id: int, year: int) -> bool:
+    """
+    Lazy initialization: create the wallet rows only if some are missing.
+    One SELECT when the wallet exists. Returns True if rows were written.
+    """
+    count = db.query(LeaveBalance).filter(
+        LeaveBalance.employee_id == employee_id,
+        LeaveBalance.year == year,
+        LeaveBalance.leave_type.in_(WALLET_LEAVE_TYPES),
+    ).count()
+    if count >= len(WALLET_LEAVE_TYPES):
+        return False
+    ensure_wallet_for_employee(db, employee_id, year)
+    return True
+
+
 def get_wallet_balances(
     db: Session,
     employee_id: int,
     year: int,
-) -> List[LeaveBalance]:
-    """Get all wallet rows for employee/year. Ensures wallet exists first."""
-    ensure_wallet_for_employee(db, employee_id, year)
-    return (
+    as_of_date: Optional[date] = None,
+) -> List[WalletBalance]:
+    """
+    Wallet balances for employee/year as of as_of_date (default today), without writing.
+
+    Reads the persisted rows. Rows are only created (lazy initialization) when
+    the wallet does not exist yet. If a row's accrual snapshot covers an
+    earlier month than as_of_date (monthly run not done yet), accrued and
+    remaining are brought forward in memory; the rows are left untouched.
+    """
+    rows = (
         db.query(LeaveBalance)
         .filter(LeaveBalance.employee_id == employee_id, LeaveBalance.year == year)
         .order_by(LeaveBalance.leave_type)
         .all()
     )
+    if len({b.leave_type for b in rows} & set(WALLET_LEAVE_TYPES)) < len(WALLET_LEAVE_TYPES):
+        ensure_wallet_for_employee(db, employee_id, year, as_of_date)
+        rows = (
+            db.query(LeaveBalance)
+            .filter(LeaveBalance.employee_id == employee_id, LeaveBalance.year == year)
+            .order_by(LeaveBalance.leave_type)
+            .all()
+        )
+
+    as_of = as_of_date or date.today()
+    period = _accrual_period(year, as_of)
+    accrued = {b.leave_type: b.accrued for b in rows}
+    stale = [
+        b for b in rows
+        if b.leave_type in WALLET_LEAVE_TYPES and _accrual_period(year, b.accrued_as_of) < period
+    ]
+    if stale:
+        employee = db.get(Employee, employee_id)
+        acc = compute_accrual(db, employee, year, as_of)
+        for b in stale:
+            accrued[b.leave_type] = Decimal(str(acc[b.leave_type]["accrued"]))
+
+    return [
+        WalletBalance(
+            leave_type=b.leave_type,
+            opening=b.opening,
+            accrued=accrued[b.leave_type],
+            used=b.used,
+            carry_forward=b.carry_forward,
+            remaining=b.opening + accrued[b.leave_type] + b.carry_forward - b.used,
+        )
+        for b in rows
+    ]
 
 
 def _get_balance_row(
@@ -306,9 +454,7 @@ def apply_leave_approval(
     leave.approved_at = now_utc()
     leave.paid_days = Decimal(str(paid))
     leave.lwp_days = Decimal(str(max(0, days - paid)))
-    db.commit()
-    db.refresh(leave)
-    db.refresh(bal)
+    commit_or_flush(db, leave, bal)
     return leave
 
 
@@ -331,8 +477,7 @@ def apply_leave_rejection(
     leave.rejected_by_id = approver_id
     leave.rejected_remark = remark
     leave.rejected_at = now_utc()
-    db.commit()
-    db.refresh(leave)
+    commit_or_flush(db, leave)
     return leave
 
 
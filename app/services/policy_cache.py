@@ -0,0 +1,76 @@
+"""
+Policy cache - process-wide, year-keyed policy settings snapshots
+
+Leave, wallet, WFH and accrual code read policy settings for a year on every
+call (apply, approve, accrual runs once per employee, admin balances once per
+row). PolicyCache loads each year's PolicySetting row once into an immutable
+PolicySnapshot and reuses it until update_policy_settings invalidates the year
+or POLICY_CACHE_TTL_SECONDS passes (updates made by other workers).
+
+Reading never writes: a year without a row is served from the unsaved
+defaults, so snapshots are safe on read-replica sessions. Admin endpoints that
+edit or must persist the row keep using get_or_create_policy_settings.
+"""
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.versioned_cache import VersionedCache
+from app.models.policy import PolicySetting
+from app.services.policy_validator import _default_policy_settings, ensure_policy_schema
+
+
+class PolicySnapshot:
+    """Read-only copy of one PolicySetting row; attribute access like the ORM object"""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: Mapping[str, Any]):
+        object.__setattr__(self, "_values", MappingProxyType(dict(values)))
+
+    @classmethod
+    def from_row(cls, row: PolicySetting) -> "PolicySnapshot":
+        return cls({attr.key: getattr(row, attr.key) for attr in inspect(PolicySetting).column_attrs})
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("PolicySnapshot is read-only")
+
+    def __repr__(self) -> str:
+        return f"PolicySnapshot(year={self._values.get('year')})"
+
+
+class PolicyCache:
+    """Process-wide cache of PolicySnapshot per year (one VersionedCache entry per year)"""
+
+    def __init__(self):
+        self._cache: VersionedCache[PolicySnapshot] = VersionedCache(lambda: settings.POLICY_CACHE_TTL_SECONDS)
+
+    def _load(self, db: Session, year: int) -> PolicySnapshot:
+        ensure_policy_schema(db)
+        row = db.query(PolicySetting).filter(PolicySetting.year == year).first()
+        return PolicySnapshot.from_row(row if row is not None else _default_policy_settings(year))
+
+    def get(self, db: Session, year: int) -> PolicySnapshot:
+        """Policy for the year (stored row, else defaults); one query on a miss"""
+        return self._cache.get(year, lambda: self._load(db, year))
+
+    def invalidate(self, year: Optional[int] = None) -> None:
+        """Drop one year (or every year) so the next lookup reloads it"""
+        self._cache.invalidate(year)
+
+    def stats(self) -> Dict[str, int]:
+        stats = self._cache.stats()
+        stats["years"] = stats.pop("entries")
+        return stats
+
+
+policy_cache = PolicyCache()
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.models.policy import PolicySetting
 from app.services.audit_service import log_audit
+from app.services.policy_cache import policy_cache
 from app.services.policy_validator import get_or_create_policy_settings
 
 
@@ -161,6 +162,7 @@ def update_policy_settings(
     
     db.commit()
     db.refresh(policy)
+    policy_cache.invalidate(year)
     
     # Log audit
     if actor_id:
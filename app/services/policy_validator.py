@@ -1,16 +1,20 @@
 """
 Policy validation service - validates leave requests against policy rules
 """
+import logging
 from datetime import date, timedelta
 from typing import Dict, Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from app.models.leave import LeaveRequest, LeaveType, LeaveStatus
+from app.db.unit_of_work import commit_or_flush
+from app.models.leave import LeaveType
 from app.models.employee import Employee, Role
 from app.models.policy import PolicySetting
-import json
+from app.services.leave_month_days import monthly_totals
 from sqlalchemy import text
 
+logger = logging.getLogger(__name__)
+
 
 def is_in_probation(join_date: date, today: date, probation_months: int) -> bool:
     """
@@ -56,6 +60,85 @@ def is_in_probation(join_date: date, today: date, probation_months: int) -> bool
     return today < probation_end_date
 
 
+def _default_policy_settings(year: int) -> PolicySetting:
+    """Unsaved PolicySetting with the default ACS policy for a year"""
+    # Default ACS policy (2026 final): PL=7, CL=5, SL=6, RH=1, FL=1
+    annual_pl = 7
+    annual_cl = 5
+    annual_sl = 6
+    return PolicySetting(
+        year=year,
+        # Annual entitlements
+        annual_pl=annual_pl,
+        annual_cl=annual_cl,
+        annual_sl=annual_sl,
+        annual_rh=1,
+        annual_fl=1,
+        public_holiday_total=14,
+        # Monthly credits
+        monthly_credit_pl=0.5,
+        monthly_credit_cl=0.5,
+        monthly_credit_sl=0.5,
+        # PL eligibility (replaces probation lock)
+        pl_eligibility_months=6,
+        # Backdated leave
+        backdated_max_days=7,
+        # Carry forward / encashment
+        carry_forward_pl_max=4,
+        # WFH policy
+        wfh_max_days=12,
+        wfh_day_value=0.5,
+        # Old rules (OFF by default)
+        probation_months=3,  # DEPRECATED
+        cl_pl_notice_days=3,
+        cl_pl_monthly_cap=4.0,
+        enforce_monthly_cap=False,  # OFF by default (not in PDF)
+        enforce_notice_days=False,  # Configurable, default OFF
+        notice_days_cl_pl=3,
+        # Sick intimation (shift-dependent, default OFF)
+        enforce_sick_intimation=False,
+        sick_intimation_min_minutes=120,
+        # Sandwich rule
+        weekly_off_day=7,
+        sandwich_enabled=True,
+        sandwich_include_weekly_off=True,
+        sandwich_include_holidays=True,
+        sandwich_include_rh=False,
+        treat_event_as_non_working_for_sandwich=True,
+        # HR override
+        allow_hr_override=True
+    )
+
+
+_schema_checked = False
+
+
+def ensure_policy_schema(db: Session) -> None:
+    """
+    Ensure 'annual_fl' column exists for LOCAL SQLITE only (skip for PostgreSQL).
+    Runs once per process: at app startup, or on the first policy load in scripts.
+    """
+    global _schema_checked
+    if _schema_checked:
+        return
+    _schema_checked = True
+    try:
+        bind = db.get_bind()
+        if bind is not None and getattr(bind.dialect, "name", None) == "sqlite":
+            rows = db.execute(text("PRAGMA table_info('policy_settings')")).fetchall()
+            col_names = {r[1] for r in rows} if rows else set()
+            if rows and "annual_fl" not in col_names:
+                db.execute(text("ALTER TABLE policy_settings ADD COLUMN annual_fl INTEGER NOT NULL DEFAULT 1"))
+                db.commit()
+    except Exception:
+        # Roll back failed DDL/PRAGMA so the session stays usable
+        logger.exception("policy_settings schema probe failed")
+        try:
+            db.rollback()
+        except Exception:
+            pass
+
+
 def get_or_create_policy_settings(db: Session, year: int) -> PolicySetting:
     """
     Get policy settings for a year, creating default if not exists.
@@ -74,74 +157,13 @@ def get_or_create_policy_settings(db: Session, year: int) -> PolicySetting:
     Returns:
         PolicySetting instance
     """
-    # Ensure 'annual_fl' column exists for LOCAL SQLITE only (skip for PostgreSQL)
-    try:
-        bind = db.get_bind()
-        if bind is not None and getattr(bind.dialect, "name", None) == "sqlite":
-            rows = db.execute(text("PRAGMA table_info('policy_settings')")).fetchall()
-            col_names = {r[1] for r in rows} if rows else set()
-            if "annual_fl" not in col_names:
-                db.execute(text("ALTER TABLE policy_settings ADD COLUMN annual_fl INTEGER NOT NULL DEFAULT 1"))
-                db.commit()
-    except Exception:
-        # Roll back failed DDL/PRAGMA so the session is usable on PostgreSQL
-        try:
-            db.rollback()
-        except Exception:
-            pass
-    
+    ensure_policy_schema(db)
     policy = db.query(PolicySetting).filter(PolicySetting.year == year).first()
     
     if not policy:
-        # Default ACS policy (2026 final): PL=7, CL=5, SL=6, RH=1, FL=1
-        annual_pl = 7
-        annual_cl = 5
-        annual_sl = 6
-        policy = PolicySetting(
-            year=year,
-            # Annual entitlements
-            annual_pl=annual_pl,
-            annual_cl=annual_cl,
-            annual_sl=annual_sl,
-            annual_rh=1,
-            annual_fl=1,
-            public_holiday_total=14,
-            # Monthly credits
-            monthly_credit_pl=0.5,
-            monthly_credit_cl=0.5,
-            monthly_credit_sl=0.5,
-            # PL eligibility (replaces probation lock)
-            pl_eligibility_months=6,
-            # Backdated leave
-            backdated_max_days=7,
-            # Carry forward / encashment
-            carry_forward_pl_max=4,
-            # WFH policy
-            wfh_max_days=12,
-            wfh_day_value=0.5,
-            # Old rules (OFF by default)
-            probation_months=3,  # DEPRECATED
-            cl_pl_notice_days=3,
-            cl_pl_monthly_cap=4.0,
-            enforce_monthly_cap=False,  # OFF by default (not in PDF)
-            enforce_notice_days=False,  # Configurable, default OFF
-            notice_days_cl_pl=3,
-            # Sick intimation (shift-dependent, default OFF)
-            enforce_sick_intimation=False,
-            sick_intimation_min_minutes=120,
-            # Sandwich rule
-            weekly_off_day=7,
-            sandwich_enabled=True,
-            sandwich_include_weekly_off=True,
-            sandwich_include_holidays=True,
-            sandwich_include_rh=False,
-            treat_event_as_non_working_for_sandwich=True,
-            # HR override
-            allow_hr_override=True
-        )
+        policy = _default_policy_settings(year)
         db.add(policy)
-        db.commit()
-        db.refresh(policy)
+        commit_or_flush(db, policy)
     
     return policy
 
@@ -307,7 +329,7 @@ def validate_monthly_cap(
         employee_id: Employee ID
         request_by_month: computed_days_by_month from the new request (dict with "YYYY-MM" keys)
         settings: Policy settings
-        year: Calendar year
+        year: Calendar year (implied by the "YYYY-MM" keys; kept for callers)
         exclude_leave_request_id: Leave request ID to exclude from existing totals (for approval-time validation)
     
     Raises:
@@ -317,36 +339,12 @@ def validate_monthly_cap(
     if not settings.enforce_monthly_cap:
         return
     
-    # Get all approved leave requests for this employee in this year
-    # Types: CL, PL, RH (RH counts as PL for monthly cap)
-    # COMPOFF is excluded from monthly cap
-    query = db.query(LeaveRequest).filter(
-        LeaveRequest.employee_id == employee_id,
-        LeaveRequest.status == LeaveStatus.APPROVED,
-        LeaveRequest.leave_type.in_([LeaveType.CL, LeaveType.PL, LeaveType.RH]),
-        LeaveRequest.from_date >= date(year, 1, 1),
-        LeaveRequest.to_date <= date(year, 12, 31)
+    # Approved CL/PL/RH days per month (RH counts as PL, COMPOFF excluded),
+    # summed from leave_request_month_days for the requested months only
+    existing_by_month = monthly_totals(
+        db, employee_id, request_by_month.keys(), exclude_leave_request_id=exclude_leave_request_id
     )
     
-    if exclude_leave_request_id:
-        query = query.filter(LeaveRequest.id != exclude_leave_request_id)
-    
-    approved_requests = query.all()
-    
-    # Build monthly totals from existing approved requests
-    existing_by_month: Dict[str, float] = {}
-    
-    for req in approved_requests:
-        if req.computed_days_by_month:
-            try:
-                req_by_month = json.loads(req.computed_days_by_month)
-                for month_key, days in req_by_month.items():
-                    existing_by_month[month_key] = existing_by_month.get(month_key, 0.0) + float(days)
-            except (json.JSONDecodeError, TypeError):
-                # Fallback: if JSON parsing fails, estimate from date range
-                # This shouldn't happen if computed_days_by_month was set correctly
-                pass
-    
     # Check each month in the new request
     for month_key, request_days in request_by_month.items():
         existing_days = existing_by_month.get(month_key, 0.0)
@@ -1,5 +1,7 @@
+import importlib.util
 import logging
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 from app.core.config import settings
 import json
@@ -9,15 +11,29 @@ logger = logging.getLogger(__name__)
 _firebase_initialized = False
 _firebase_error: Optional[str] = None
 
-try:
-    import firebase_admin
-    from firebase_admin import credentials, messaging
-    _import_ok = True
-except Exception as e:
-    firebase_admin = None  # type: ignore
-    messaging = None  # type: ignore
-    _firebase_error = f"firebase_admin not available: {e}"
-    _import_ok = False
+# firebase_admin (and the google-cloud stack behind it) is imported on first push, not at startup
+firebase_admin = None  # type: ignore
+credentials = None  # type: ignore
+messaging = None  # type: ignore
+_import_ok: Optional[bool] = None  # None = import not attempted yet
+
+# FCM sends are blocking HTTP calls; request-path notifications run them on this pool
+_push_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _import_firebase() -> bool:
+    global firebase_admin, credentials, messaging, _import_ok, _firebase_error
+    if _import_ok is not None:
+        return _import_ok
+    try:
+        import firebase_admin as _firebase_admin
+        from firebase_admin import credentials as _credentials, messaging as _messaging
+        firebase_admin, credentials, messaging = _firebase_admin, _credentials, _messaging
+        _import_ok = True
+    except Exception as e:
+        _firebase_error = f"firebase_admin not available: {e}"
+        _import_ok = False
+    return _import_ok
 
 
 def _ensure_firebase() -> None:
@@ -30,7 +46,7 @@ def _ensure_firebase() -> None:
         if not sa_cfg:
             _firebase_error = "FCM disabled: FCM_ENABLED=False and FCM_SERVICE_ACCOUNT_JSON not set"
             return
-    if firebase_admin is None or messaging is None:
+    if not _import_firebase():
         return
     sa_cfg = settings.FCM_SERVICE_ACCOUNT_JSON
     if not sa_cfg:
@@ -71,7 +87,7 @@ def diagnose_fcm_config() -> Dict[str, Any]:
         "service_account_path_exists": path_exists,
         "initialized": _firebase_initialized,
         "init_error": _firebase_error,
-        "firebase_admin_present": firebase_admin is not None,
+        "firebase_admin_present": importlib.util.find_spec("firebase_admin") is not None,
         "firebase_admin_import_ok": _import_ok,
     }
 
@@ -182,3 +198,34 @@ def send_push_to_tokens(
     except Exception as e:
         logger.exception("Failed to send FCM")
         return {"success": False, "error": str(e)}
+
+
+def _get_push_executor() -> ThreadPoolExecutor:
+    global _push_executor
+    if _push_executor is None:
+        _push_executor = ThreadPoolExecutor(max_workers=settings.PUSH_SEND_WORKERS, thread_name_prefix="push")
+    return _push_executor
+
+
+def _send_and_log(tokens: List[str], title: str, body: str, data: Optional[Dict[str, Any]], label: str) -> None:
+    try:
+        res = send_push_to_tokens(tokens, title=title, body=body, data=data)
+        ok = bool(res.get("success")) and int(res.get("success_count", 0)) > 0
+        if not ok:
+            logger.error("%s failed: error=%s", label, res.get("error"))
+    except Exception:
+        logger.exception("%s: exception while sending push", label)
+
+
+def send_push_in_background(
+    tokens: List[str],
+    title: str,
+    body: str,
+    data: Optional[Dict[str, Any]] = None,
+    label: str = "push",
+) -> Future:
+    """
+    send_push_to_tokens on the push pool, so the caller (an event-loop thread
+    inside run_sync) never waits on FCM. Failures are logged under label.
+    """
+    return _get_push_executor().submit(_send_and_log, tokens, title, body, data, label)
@@ -5,8 +5,6 @@ import os
 import logging
 from datetime import datetime
 from typing import Optional, BinaryIO
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -39,13 +37,16 @@ class R2StorageService:
             raise ValueError("R2 configuration incomplete. Please set R2_ENDPOINT, R2_ACCESS_KEY_ID, and R2_SECRET_ACCESS_KEY")
         
         try:
+            # boto3/botocore are imported on first use to keep app startup light
+            import boto3
+            from botocore.config import Config
             self._client = boto3.client(
                 's3',
                 endpoint_url=self._endpoint_url,
                 aws_access_key_id=self._aws_access_key_id,
                 aws_secret_access_key=self._aws_secret_access_key,
                 region_name="auto",
-                config=boto3.session.Config(signature_version='s3v4')
+                config=Config(signature_version='s3v4')
             )
             logger.info(f"R2 client initialized for bucket: {self._bucket_name}")
         except Exception as e:
@@ -54,6 +55,7 @@ class R2StorageService:
     
     def upload_file(self, file_data: BinaryIO, object_key: str, content_type: str) -> bool:
         """Upload file to R2 bucket"""
+        from botocore.exceptions import ClientError, NoCredentialsError
         try:
             self._ensure_client()
             logger.info(f"Uploading to R2: bucket={self._bucket_name}, key={object_key}, type={content_type}")
@@ -80,6 +82,7 @@ class R2StorageService:
     
     def get_file(self, object_key: str) -> Optional[bytes]:
         """Get file from R2 bucket"""
+        from botocore.exceptions import ClientError
         try:
             self._ensure_client()
             logger.debug(f"Fetching from R2: {object_key}")
@@ -132,9 +135,12 @@ class R2StorageService:
             logger.error(f"Failed to generate pre-signed URL for {object_key}: {e}")
             return None
 
-# Global instance
-r2_storage = R2StorageService()
+# Global instance, created on first use
+_r2_storage: Optional[R2StorageService] = None
 
 def get_r2_storage_service() -> R2StorageService:
     """Returns the global R2StorageService instance."""
-    return r2_storage
+    global _r2_storage
+    if _r2_storage is None:
+        _r2_storage = R2StorageService()
+    return _r2_storage
@@ -9,9 +9,9 @@ from app.models.employee import Employee
 from app.models.attendance_session import AttendanceSession
 from app.models.notification_device import NotificationDevice
 from app.models.notification_reminder import NotificationReminder, ReminderType, DeliveryStatus
-from app.models.holiday import Holiday
 from app.models.leave import LeaveRequest, LeaveStatus
 from app.services.push_service import send_push_to_tokens
+from app.services.work_calendar import HOLIDAY, work_calendar
 from app.utils.datetime_utils import now_utc
 
 _log = logging.getLogger(__name__)
@@ -23,7 +23,7 @@ def _today_ist() -> date:
 
 
 def _is_public_holiday(db: Session, d: date) -> bool:
-    return db.query(Holiday).filter(Holiday.date == d, Holiday.active.is_(True)).first() is not None
+    return work_calendar.has(db, d, HOLIDAY)
 
 
 def _employees_on_approved_leave(db: Session, d: date) -> Set[int]:
@@ -12,7 +12,7 @@ from app.models.attendance_session import AttendanceSession
 from app.models.leave import LeaveRequest, LeaveStatus, LeaveType
 from app.models.department import Department
 from app.models.compoff import CompoffRequest, CompoffRequestStatus
-from app.services.leave_service import get_subordinate_ids, get_role_rank
+from app.services.visibility_scope import HIERARCHY_RANK, VisibilityScope, resolve_visibility_scope
 
 
 def get_attendance_rows(
@@ -21,7 +21,8 @@ def get_attendance_rows(
     from_date: date,
     to_date: date,
     employee_id: Optional[int] = None,
-    department_id: Optional[int] = None
+    department_id: Optional[int] = None,
+    scope: Optional[VisibilityScope] = None
 ) -> List[Dict]:
     """
     Get attendance rows for export with role-based scoping
@@ -63,9 +64,9 @@ def get_attendance_rows(
 
     # Apply role-based scoping using role_rank
     session_results: List[Dict] = []
-    current_user_rank = get_role_rank(db, current_user)
+    scope = scope or resolve_visibility_scope(db, current_user)
 
-    if current_user_rank <= 3:
+    if scope.all:
         # ADMIN/MD/VP (and HR configured as high-privilege): all employees
         if employee_id:
             session_query = session_query.filter(Employee.id == employee_id)
@@ -74,29 +75,24 @@ def get_attendance_rows(
         session_results = session_query.order_by(
             AttendanceSession.work_date, Employee.emp_code
         ).all()
-    elif current_user_rank == 4:
+    elif scope.role_rank == HIERARCHY_RANK:
         # MANAGER: subtree + self
-        subordinate_ids = get_subordinate_ids(db, current_user.id) or []
-        visible_ids = [current_user.id] + subordinate_ids
-        if not visible_ids:
-            session_results = []
-        else:
-            session_query = session_query.filter(Employee.id.in_(visible_ids))
-            if employee_id:
-                if employee_id not in visible_ids:
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail="You can only export attendance for employees in your reporting hierarchy",
-                    )
-                session_query = session_query.filter(Employee.id == employee_id)
-            if department_id:
+        session_query = session_query.filter(scope.filter(Employee.id))
+        if employee_id:
+            if not scope.can_see(employee_id):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Only HR/ADMIN can filter by department",
+                    detail="You can only export attendance for employees in your reporting hierarchy",
                 )
-            session_results = session_query.order_by(
-                AttendanceSession.work_date, Employee.emp_code
-            ).all()
+            session_query = session_query.filter(Employee.id == employee_id)
+        if department_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only HR/ADMIN can filter by department",
+            )
+        session_results = session_query.order_by(
+            AttendanceSession.work_date, Employee.emp_code
+        ).all()
     else:
         # EMPLOYEE: only self
         session_query = session_query.filter(Employee.id == current_user.id)
@@ -156,19 +152,15 @@ def get_attendance_rows(
     )
 
     # Apply role-rank scoping for legacy logs
-    if current_user_rank <= 3:
+    if scope.all:
         if employee_id:
             query = query.filter(Employee.id == employee_id)
         if department_id:
             query = query.filter(Department.id == department_id)
-    elif current_user_rank == 4:
-        subordinate_ids = get_subordinate_ids(db, current_user.id) or []
-        visible_ids = [current_user.id] + subordinate_ids
-        if not visible_ids:
-            return []
-        query = query.filter(Employee.id.in_(visible_ids))
+    elif scope.role_rank == HIERARCHY_RANK:
+        query = query.filter(scope.filter(Employee.id))
         if employee_id:
-            if employee_id not in visible_ids:
+            if not scope.can_see(employee_id):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="You can only export attendance for your direct reportees",
@@ -223,7 +215,8 @@ def get_leave_rows(
     employee_id: Optional[int] = None,
     department_id: Optional[int] = None,
     status_filter: Optional[str] = None,
-    leave_type_filter: Optional[str] = None
+    leave_type_filter: Optional[str] = None,
+    scope: Optional[VisibilityScope] = None
 ) -> List[Dict]:
     """
     Get leave rows for export with role-based scoping and date overlap filtering
@@ -270,20 +263,16 @@ def get_leave_rows(
     )
     
     # Apply role-based scoping via role_rank
-    current_user_rank = get_role_rank(db, current_user)
-    if current_user_rank <= 3:
+    scope = scope or resolve_visibility_scope(db, current_user)
+    if scope.all:
         if employee_id:
             query = query.filter(Employee.id == employee_id)
         if department_id:
             query = query.filter(Department.id == department_id)
-    elif current_user_rank == 4:
-        subordinate_ids = get_subordinate_ids(db, current_user.id) or []
-        visible_ids = [current_user.id] + subordinate_ids
-        if not visible_ids:
-            return []
-        query = query.filter(Employee.id.in_(visible_ids))
+    elif scope.role_rank == HIERARCHY_RANK:
+        query = query.filter(scope.filter(Employee.id))
         if employee_id:
-            if employee_id not in visible_ids:
+            if not scope.can_see(employee_id):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="You can only export leaves for employees in your reporting hierarchy",
@@ -381,7 +370,8 @@ def get_compoff_rows(
     current_user: Employee,
     from_date: date,
     to_date: date,
-    employee_id: Optional[int] = None
+    employee_id: Optional[int] = None,
+    scope: Optional[VisibilityScope] = None
 ) -> List[Dict]:
     """
     Get comp-off request rows for export with role-based scoping
@@ -421,18 +411,14 @@ def get_compoff_rows(
     )
     
     # Apply role-based scoping (role_rank)
-    current_user_rank = get_role_rank(db, current_user)
-    if current_user_rank <= 3:
+    scope = scope or resolve_visibility_scope(db, current_user)
+    if scope.all:
         if employee_id:
             query = query.filter(Employee.id == employee_id)
-    elif current_user_rank == 4:
-        subordinate_ids = get_subordinate_ids(db, current_user.id) or []
-        visible_ids = [current_user.id] + subordinate_ids
-        if not visible_ids:
-            return []  # No subordinates
-        query = query.filter(Employee.id.in_(visible_ids))
+    elif scope.role_rank == HIERARCHY_RANK:
+        query = query.filter(scope.filter(Employee.id))
         if employee_id:
-            if employee_id not in visible_ids:
+            if not scope.can_see(employee_id):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="You can only export comp-off requests for employees in your reporting hierarchy"
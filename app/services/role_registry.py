@@ -0,0 +1,75 @@
+"""
+Role registry - process-wide role name -> role_rank map
+
+Loaded from the roles table once and reused until a role write invalidates it
+or ROLE_REGISTRY_TTL_SECONDS passes (scripts, other workers, direct DB edits),
+so rank lookups in guards and services don't query RoleModel on every call.
+DEFAULT_ROLE_RANKS is the single fallback for roles missing from the table.
+"""
+from typing import Dict
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.versioned_cache import VersionedCache
+from app.models.role import RoleModel
+from app.utils.roles import role_name
+
+# Fallback ranks for roles without an active row in the roles table
+DEFAULT_ROLE_RANKS: Dict[str, int] = {
+    "ADMIN": 1,
+    "MD": 2,
+    "VP": 3,
+    "MANAGER": 4,
+    "HR": 5,
+    "EMPLOYEE": 99,
+}
+UNKNOWN_ROLE_RANK = 99
+
+
+def fallback_rank(role) -> int:
+    """Rank used when a role has no active row in the roles table"""
+    return DEFAULT_ROLE_RANKS.get(role_name(role), UNKNOWN_ROLE_RANK)
+
+
+class RoleRegistry:
+    """Cache of active role ranks (one VersionedCache entry)"""
+
+    _KEY = "ranks"
+
+    def __init__(self):
+        self._cache: VersionedCache[Dict[str, int]] = VersionedCache(lambda: settings.ROLE_REGISTRY_TTL_SECONDS)
+
+    def _load(self, db: Session) -> Dict[str, int]:
+        rows = (
+            db.query(RoleModel.name, RoleModel.role_rank)
+            .filter(RoleModel.is_active == True)
+            .all()
+        )
+        return {name: rank for name, rank in rows}
+
+    def ranks(self, db: Session) -> Dict[str, int]:
+        """Active role name -> role_rank (loads on first use after invalidation or expiry)"""
+        return self._cache.get(self._KEY, lambda: self._load(db))
+
+    def rank_for(self, db: Session, role) -> int:
+        """role_rank for a role (enum or string), falling back to DEFAULT_ROLE_RANKS"""
+        rank = self.ranks(db).get(role_name(role))
+        return rank if rank is not None else fallback_rank(role)
+
+    def invalidate(self) -> None:
+        self._cache.invalidate()
+
+    def stats(self) -> Dict[str, int]:
+        stats = self._cache.stats()
+        ranks = self._cache.peek(self._KEY)
+        return {
+            "version": stats["version"],
+            "loaded": ranks is not None,
+            "roles": len(ranks or {}),
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+        }
+
+
+role_registry = RoleRegistry()
@@ -7,9 +7,11 @@ from fastapi import HTTPException, status
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core.principal_cache import principal_cache
 from app.models.role import RoleModel
 from app.schemas.role import RoleCreate, RoleUpdate
 from app.services.audit_service import log_audit
+from app.services.role_registry import role_registry
 
 
 def create_role(
@@ -42,6 +44,7 @@ def create_role(
     db.add(role)
     db.commit()
     db.refresh(role)
+    role_registry.invalidate()
 
     log_audit(
         db=db,
@@ -95,6 +98,7 @@ def update_role(
         )
 
     update_dict = role_data.dict(exclude_unset=True)
+    previous_name = role.name
 
     # Enforce unique name if being updated
     if "name" in update_dict and update_dict["name"] is not None:
@@ -125,6 +129,9 @@ def update_role(
 
     db.commit()
     db.refresh(role)
+    role_registry.invalidate()
+    # Principals snapshot role_rank; drop tokens of everyone holding this role
+    principal_cache.evict_role(previous_name)
 
     log_audit(
         db=db,
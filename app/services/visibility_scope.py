@@ -0,0 +1,108 @@
+"""
+Role-rank visibility scope
+
+Who a user may see in leave lists, approval queues, attendance views and
+report exports. Resolved once per request (role rank from the role registry
+plus, for VP/MANAGER, the active reporting subtree with each subordinate's
+department in one recursive query) and cached on request.state, so every
+consumer in the request shares it.
+
+The rank rules differ per area and are exposed as views with the same API
+(`all`, `employee_ids`, `can_see`, `filter`):
+- the scope itself (attendance / reports): ADMIN/MD/VP all; MANAGER self + subtree; others self
+- `leaves`: ADMIN/MD all; VP/MANAGER self + same-department subtree; others self
+- `approvals`: ADMIN/MD all; VP/MANAGER subtree; others nobody
+"""
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional
+
+from fastapi import Request
+from sqlalchemy import select, true
+from sqlalchemy.orm import Session
+
+from app.services.hierarchy_service import active_subtree_cte
+from app.services.role_registry import role_registry
+
+# role_rank thresholds (lower rank = more privilege)
+ALL_EMPLOYEES_RANK = 3  # ADMIN/MD/VP: every employee in attendance and reports
+ALL_LEAVES_RANK = 2  # ADMIN/MD: every leave request, every approval
+HIERARCHY_RANK = 4  # VP/MANAGER: their reporting subtree
+
+
+@dataclass(frozen=True)
+class ScopeView:
+    """Visible employees under one rule: everyone (`all`) or an explicit id set"""
+
+    all: bool
+    employee_ids: FrozenSet[int]
+
+    def can_see(self, employee_id: int) -> bool:
+        return self.all or employee_id in self.employee_ids
+
+    def filter(self, column):
+        """SQL criterion on an employee-id column (always true when `all`)"""
+        if self.all:
+            return true()
+        return column.in_(sorted(self.employee_ids))
+
+
+@dataclass(frozen=True)
+class VisibilityScope(ScopeView):
+    user_id: int = 0
+    department_id: Optional[int] = None
+    role_rank: int = 99
+    # Active direct and indirect reports -> department_id (VP/MANAGER only)
+    subordinates: Dict[int, Optional[int]] = field(default_factory=dict)
+
+    @property
+    def subordinate_ids(self) -> FrozenSet[int]:
+        return frozenset(self.subordinates)
+
+    @property
+    def leaves(self) -> ScopeView:
+        if self.role_rank <= ALL_LEAVES_RANK:
+            return ScopeView(all=True, employee_ids=frozenset())
+        same_department = {
+            emp_id for emp_id, dept_id in self.subordinates.items() if dept_id == self.department_id
+        }
+        return ScopeView(all=False, employee_ids=frozenset(same_department | {self.user_id}))
+
+    @property
+    def approvals(self) -> ScopeView:
+        if self.role_rank <= ALL_LEAVES_RANK:
+            return ScopeView(all=True, employee_ids=frozenset())
+        return ScopeView(all=False, employee_ids=self.subordinate_ids)
+
+
+def resolve_visibility_scope(db: Session, current_user) -> VisibilityScope:
+    """Rank lookup (registry, usually no query) + at most one recursive subtree query"""
+    role_rank = role_registry.rank_for(db, current_user.role)
+    subordinates: Dict[int, Optional[int]] = {}
+    if ALL_LEAVES_RANK < role_rank <= HIERARCHY_RANK:
+        subtree = active_subtree_cte(current_user.id)
+        subordinates = dict(db.execute(select(subtree.c.id, subtree.c.department_id)).all())
+
+    if role_rank <= ALL_EMPLOYEES_RANK:
+        visible, everyone = frozenset(), True
+    elif role_rank <= HIERARCHY_RANK:
+        visible, everyone = frozenset(subordinates) | {current_user.id}, False
+    else:
+        visible, everyone = frozenset({current_user.id}), False
+
+    return VisibilityScope(
+        all=everyone,
+        employee_ids=visible,
+        user_id=current_user.id,
+        department_id=current_user.department_id,
+        role_rank=role_rank,
+        subordinates=subordinates,
+    )
+
+
+def request_visibility_scope(request: Request, db: Session, current_user) -> VisibilityScope:
+    """The request's scope, resolved on first use and cached on request.state"""
+    scope = getattr(request.state, "visibility_scope", None)
+    if scope is None or scope.user_id != current_user.id:
+        scope = resolve_visibility_scope(db, current_user)
+        request.state.visibility_scope = scope
+    return scope
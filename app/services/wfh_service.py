@@ -14,9 +14,9 @@ from decimal import Decimal
 from app.models.wfh import WFHRequest, WFHStatus
 from app.models.employee import Employee, Role
 from app.models.role import RoleModel
-from app.models.policy import PolicySetting
 from app.services.audit_service import log_audit
-from app.services.policy_validator import get_or_create_policy_settings
+from app.services.hierarchy_service import is_subordinate
+from app.services.policy_cache import policy_cache
 
 
 def validate_wfh_yearly_cap(
@@ -40,7 +40,7 @@ def validate_wfh_yearly_cap(
     year = request_date.year
     
     # Get policy settings
-    settings = get_or_create_policy_settings(db, year)
+    settings = policy_cache.get(db, year)
     wfh_max_days = settings.wfh_max_days if hasattr(settings, 'wfh_max_days') else 12
     
     # Count approved WFH requests for this year
@@ -75,7 +75,7 @@ def compute_employee_wfh_balance(
     Returns (entitled, accrued, used, remaining).
     """
     # Entitled from policy (fallback 12)
-    settings: PolicySetting = get_or_create_policy_settings(db, year)
+    settings = policy_cache.get(db, year)
     entitled = getattr(settings, "wfh_max_days", 12)
 
     # Used: count of APPROVED WFH requests for this employee in that year
@@ -163,7 +163,7 @@ def apply_wfh(
     
     # Get policy settings for day_value
     year = request_date.year
-    settings = get_or_create_policy_settings(db, year)
+    settings = policy_cache.get(db, year)
     day_value = Decimal(str(settings.wfh_day_value)) if hasattr(settings, 'wfh_day_value') else Decimal('0.5')
     
     # Create WFH request
@@ -259,10 +259,7 @@ def approve_wfh(
     # VP (rank=3) and MANAGER (rank=4) can approve WFH for their hierarchical subordinates (recursive)
     elif approver_rank <= 4:  # VP and MANAGER
         # Check if employee is in the approver's hierarchical subtree (recursive, all departments)
-        from app.services.leave_service import get_subordinate_ids
-        subordinate_ids = get_subordinate_ids(db, approver.id)
-        
-        if employee.id not in subordinate_ids:
+        if not is_subordinate(db, approver.id, employee.id):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You can only approve WFH for your hierarchical subordinates"
@@ -0,0 +1,238 @@
+"""
+Work calendar - precomputed per-year day flags
+
+Each calendar year is loaded once (one query each for holidays, restricted
+holidays and company events) into a bytearray with one flag byte per day:
+WEEKLY_OFF (Sunday), HOLIDAY, RH and EVENT. Range counts use a prefix-sum array
+per flag mask, so "how many non-working days between a and b" is two array
+lookups instead of a query plus a day-by-day timedelta loop.
+
+Years are rebuilt on first use after invalidation. Any ORM write of a Holiday,
+RestrictedHoliday or CompanyEvent (holiday_service, the events endpoints,
+scripts) invalidates the affected years at flush and again at commit/rollback,
+so a calendar built from uncommitted rows is never kept. Other processes pick
+up changes after WORK_CALENDAR_TTL_SECONDS.
+"""
+import threading
+from array import array
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.versioned_cache import VersionedCache
+from app.models.event import CompanyEvent
+from app.models.holiday import Holiday, RestrictedHoliday
+
+# Day flags (bit mask)
+WEEKLY_OFF = 1  # Sunday
+HOLIDAY = 2  # active row in holidays
+RH = 4  # active row in restricted_holidays
+EVENT = 8  # active row in company_events
+
+# Sundays + holidays: the days leave and attendance never count
+NON_WORKING = WEEKLY_OFF | HOLIDAY
+
+_INFO_KEY = "work_calendar_years"
+
+
+class YearCalendar:
+    """Immutable day flags for one calendar year plus lazily built prefix sums per mask"""
+
+    def __init__(self, year: int, flags: bytearray):
+        self.year = year
+        self.first = date(year, 1, 1)
+        self.flags = flags
+        self._prefix: Dict[int, array] = {}
+        self._lock = threading.Lock()
+
+    def index(self, d: date) -> int:
+        return (d - self.first).days
+
+    def prefix(self, mask: int) -> array:
+        """prefix[i] = number of days before day index i with any flag in mask"""
+        sums = self._prefix.get(mask)
+        if sums is None:
+            sums = array("H", [0])
+            running = 0
+            for f in self.flags:
+                if f & mask:
+                    running += 1
+                sums.append(running)
+            with self._lock:
+                sums = self._prefix.setdefault(mask, sums)
+        return sums
+
+    def count(self, start: date, end: date, mask: int) -> int:
+        """Days in [start, end] (both within this year) with any flag in mask"""
+        sums = self.prefix(mask)
+        return sums[self.index(end) + 1] - sums[self.index(start)]
+
+    def first_clear(self, start: date, end: date, mask: int, reverse: bool = False) -> Optional[date]:
+        """First (or last, with reverse) day in [start, end] with no flag in mask"""
+        indexes = range(self.index(start), self.index(end) + 1)
+        flags = self.flags
+        for i in reversed(indexes) if reverse else indexes:
+            if not flags[i] & mask:
+                return self.first + timedelta(days=i)
+        return None
+
+    def dates(self, start: date, end: date, mask: int) -> List[date]:
+        flags = self.flags
+        return [
+            self.first + timedelta(days=i)
+            for i in range(self.index(start), self.index(end) + 1)
+            if flags[i] & mask
+        ]
+
+
+def _year_bounds(year: int) -> Tuple[date, date]:
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+def build_year(db: Session, year: int) -> YearCalendar:
+    """Load one year's holidays, RHs and company events into a YearCalendar"""
+    first, last = _year_bounds(year)
+    flags = bytearray((last - first).days + 1)
+    # First Sunday of the year, then every 7th day
+    for i in range((6 - first.weekday()) % 7, len(flags), 7):
+        flags[i] |= WEEKLY_OFF
+
+    sources = (
+        (Holiday, HOLIDAY, ()),
+        (RestrictedHoliday, RH, ()),
+        (CompanyEvent, EVENT, (CompanyEvent.year == year,)),
+    )
+    for model, flag, extra in sources:
+        rows = db.query(model.date).filter(
+            model.active == True,
+            model.date >= first,
+            model.date <= last,
+            *extra,
+        ).all()
+        for (d,) in rows:
+            flags[(d - first).days] |= flag
+    return YearCalendar(year, flags)
+
+
+class WorkCalendar:
+    """Process-wide cache of YearCalendar objects (one VersionedCache entry per year)"""
+
+    def __init__(self):
+        self._cache: VersionedCache[YearCalendar] = VersionedCache(lambda: settings.WORK_CALENDAR_TTL_SECONDS)
+
+    def year(self, db: Session, year: int) -> YearCalendar:
+        return self._cache.get(year, lambda: build_year(db, year))
+
+    def _spans(self, db: Session, from_date: date, to_date: date):
+        """(YearCalendar, start, end) for each calendar year the range touches"""
+        for year in range(from_date.year, to_date.year + 1):
+            first, last = _year_bounds(year)
+            yield self.year(db, year), max(from_date, first), min(to_date, last)
+
+    def count(self, db: Session, from_date: date, to_date: date, mask: int) -> int:
+        """Days in [from_date, to_date] with any flag in mask"""
+        if from_date > to_date:
+            return 0
+        return sum(cal.count(start, end, mask) for cal, start, end in self._spans(db, from_date, to_date))
+
+    def dates(self, db: Session, from_date: date, to_date: date, mask: int) -> Set[date]:
+        """Set of days in [from_date, to_date] with any flag in mask"""
+        found: Set[date] = set()
+        if from_date > to_date:
+            return found
+        for cal, start, end in self._spans(db, from_date, to_date):
+            if cal.count(start, end, mask):
+                found.update(cal.dates(start, end, mask))
+        return found
+
+    def first_clear(self, db: Session, from_date: date, to_date: date, mask: int, reverse: bool = False) -> Optional[date]:
+        """First (or last, with reverse) day in [from_date, to_date] with no flag in mask"""
+        if from_date > to_date:
+            return None
+        spans = list(self._spans(db, from_date, to_date))
+        for cal, start, end in reversed(spans) if reverse else spans:
+            found = cal.first_clear(start, end, mask, reverse)
+            if found is not None:
+                return found
+        return None
+
+    def has(self, db: Session, d: date, mask: int) -> bool:
+        cal = self.year(db, d.year)
+        return bool(cal.flags[cal.index(d)] & mask)
+
+    def days_back(self, db: Session, upto: date, count: int, mask: int = NON_WORKING) -> List[date]:
+        """The last `count` days on/before `upto` with no flag in mask, oldest first"""
+        days: List[date] = []
+        cal: Optional[YearCalendar] = None
+        cur = upto
+        while len(days) < count:
+            if cal is None or cal.year != cur.year:
+                cal = self.year(db, cur.year)
+            if not cal.flags[cal.index(cur)] & mask:
+                days.append(cur)
+            cur -= timedelta(days=1)
+        return list(reversed(days))
+
+    def invalidate(self, year: Optional[int] = None) -> None:
+        """Drop one year (or every year) so the next lookup rebuilds it"""
+        self._cache.invalidate(year)
+
+    def stats(self) -> Dict[str, int]:
+        stats = self._cache.stats()
+        stats["years"] = stats.pop("entries")
+        return stats
+
+
+work_calendar = WorkCalendar()
+
+
+_CALENDAR_MODELS = (Holiday, RestrictedHoliday, CompanyEvent)
+
+
+def _keep_previous_value(target, value, oldvalue, initiator):
+    pass
+
+
+# active_history loads the old date/year on assignment, even on a row expired by
+# a commit, so _touched_years can read it from history.deleted
+for _model in _CALENDAR_MODELS:
+    event.listen(_model.date, "set", _keep_previous_value, active_history=True)
+    event.listen(_model.year, "set", _keep_previous_value, active_history=True)
+
+
+def _touched_years(session: Session) -> Set[int]:
+    """Years of calendar rows written in this flush, before and after the change"""
+    years = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(obj, _CALENDAR_MODELS):
+            continue
+        attrs = inspect(obj).attrs
+        # A row moved to another date/year also invalidates the year it left
+        for value in (obj.date, *attrs.date.history.deleted):
+            if value is not None:
+                years.add(value.year)
+        for value in (obj.year, *attrs.year.history.deleted):
+            if value is not None:
+                years.add(value)
+    return years
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_on_flush(session: Session, flush_context) -> None:
+    years = _touched_years(session)
+    if years:
+        session.info.setdefault(_INFO_KEY, set()).update(years)
+        for year in years:
+            work_calendar.invalidate(year)
+
+
+def _invalidate_pending(session: Session) -> None:
+    for year in session.info.pop(_INFO_KEY, ()):
+        work_calendar.invalidate(year)
+
+
+event.listen(Session, "after_commit", _invalidate_pending)
+event.listen(Session, "after_rollback", _invalidate_pending)
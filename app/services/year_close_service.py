@@ -10,7 +10,7 @@ from app.models.leave import LeaveBalance, LeaveTransaction, LeaveType, LeaveTra
 from app.models.employee import Employee
 from app.models.hr_actions import HRPolicyAction, HRPolicyActionType
 from app.services.audit_service import log_audit
-from app.services.policy_validator import get_or_create_policy_settings
+from app.services.policy_cache import policy_cache
 from app.services import leave_wallet_service as wallet
 
 
@@ -24,7 +24,7 @@ def run_year_close(
     Create next year's wallet rows: CL/SL/RH opening=0; PL opening=carry_forward.
     """
     next_year = year + 1
-    settings = get_or_create_policy_settings(db, year)
+    settings = policy_cache.get(db, year)
     carry_forward_max = int(getattr(settings, "carry_forward_pl_max", 4))
 
     pl_rows = db.query(LeaveBalance).filter(
@@ -0,0 +1,93 @@
+"""
+Startup-time profile for the API process
+
+Prints where cold start goes: module import times for `app.main` (measured in a
+fresh interpreter with -X importtime) and the wall time of each startup hook.
+Run it before/after changes that touch imports or startup to catch regressions.
+
+Usage:
+  python -m app.startup_profile [--top 25] [--skip-hooks]
+"""
+import argparse
+import asyncio
+import inspect
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+# Optional dependencies that must stay lazy (imported on first use, not at startup)
+LAZY_MODULES = ("firebase_admin", "boto3", "botocore", "PIL")
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def _import_times() -> List[Tuple[str, int, int, int]]:
+    """Import `app.main` in a fresh interpreter; return (module, self_us, cumulative_us, depth)."""
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"import app.main failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m:
+            self_us, cum_us, indent, name = m.groups()
+            rows.append((name, int(self_us), int(cum_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def _print_import_breakdown(top: int) -> None:
+    rows = _import_times()
+    total = next((cum for name, _, cum, _ in rows if name == "app.main"), 0)
+    print(f"import app.main: {total / 1000:.0f} ms")
+
+    print(f"\nTop {top} modules by cumulative import time:")
+    for name, self_us, cum_us, depth in sorted(rows, key=lambda r: r[2], reverse=True)[:top]:
+        print(f"  {cum_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {'  ' * min(depth, 6)}{name}")
+
+    loaded = sorted({name.split(".")[0] for name, _, _, _ in rows} & set(LAZY_MODULES))
+    if loaded:
+        print(f"\nWARNING: lazy dependencies imported at startup: {', '.join(loaded)}")
+    else:
+        print(f"\nLazy dependencies not imported at startup: {', '.join(LAZY_MODULES)}")
+
+
+def _print_hook_breakdown() -> None:
+    t0 = time.perf_counter()
+    from app.main import app
+    print(f"\nimport app.main (in-process, warm caches): {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    print("Startup hooks:")
+    for handler in app.router.on_startup:
+        t0 = time.perf_counter()
+        try:
+            result = handler()
+            if inspect.isawaitable(result):
+                asyncio.run(result)
+            status = "ok"
+        except Exception as e:
+            status = f"error: {e}"
+        print(f"  {(time.perf_counter() - t0) * 1000:8.1f} ms  {handler.__name__} ({status})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-time and startup-hook profile")
+    parser.add_argument("--top", type=int, default=25, help="Number of modules to list")
+    parser.add_argument("--skip-hooks", action="store_true", help="Only profile imports (hooks touch the DB)")
+    args = parser.parse_args()
+
+    _print_import_breakdown(args.top)
+    if not args.skip_hooks:
+        _print_hook_breakdown()
+
+
+if __name__ == "__main__":
+    main()
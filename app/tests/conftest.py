@@ -3,6 +3,8 @@ Pytest configuration and fixtures
 """
 import os
 import sys
+import tempfile
+from datetime import date
 # Ensure project root is on sys.path so 'app' package is importable in all environments
 _here = os.path.dirname(__file__)
 _root = os.path.abspath(os.path.join(_here, "..", ".."))
@@ -11,12 +13,21 @@ if _root not in sys.path:
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 from sqlalchemy.engine import Engine
 from app.main import app
 from app.db.base import Base
-from app.core.deps import get_db
+from app.core.deps import get_db, get_read_db, get_async_db
+from app.core.principal_cache import principal_cache
+from app.core.security import hash_password
+from app.db.query_stats import count_queries
+from app.db.read_routing import read_only
+from app.models.employee import Role
+from app.services.policy_cache import policy_cache
+from app.services.role_registry import role_registry
+from app.services.work_calendar import work_calendar
 
 # Import all models to ensure they're registered with Base.metadata
 from app.models import (
@@ -41,8 +52,11 @@ from app.models import (
 )  # noqa
 
 
-# Use in-memory SQLite for testing
-SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
+# Use a per-process SQLite file for testing so the sync engine and the async engine
+# (aiosqlite, used by async endpoints) see the same data.
+_TEST_DB_PATH = os.path.join(tempfile.gettempdir(), f"acs_hrms_test_{os.getpid()}.db")
+SQLALCHEMY_TEST_DATABASE_URL = f"sqlite:///{_TEST_DB_PATH}"
+SQLALCHEMY_TEST_ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{_TEST_DB_PATH}"
 
 engine = create_engine(
     SQLALCHEMY_TEST_DATABASE_URL,
@@ -50,6 +64,9 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 
+# NullPool: TestClient runs each request on a fresh event loop, so async connections must not be reused
+async_engine = create_async_engine(SQLALCHEMY_TEST_ASYNC_DATABASE_URL, poolclass=NullPool)
+
 # Enable foreign keys for SQLite
 @event.listens_for(Engine, "connect")
 def set_sqlite_pragma(dbapi_conn, connection_record):
@@ -58,6 +75,9 @@ def set_sqlite_pragma(dbapi_conn, connection_record):
     cursor.close()
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
 
 @pytest.fixture(scope="function")
@@ -81,6 +101,10 @@ def db():
         traceback.print_exc()
         raise
     
+    # Roles are seeded per test; don't serve ranks loaded from a previous test's DB
+    role_registry.invalidate()
+    work_calendar.invalidate()
+    policy_cache.invalidate()
     db = TestingSessionLocal()
     try:
         yield db
@@ -105,6 +129,98 @@ def client(db):
         finally:
             pass
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
+        # Writes went through another connection: drop stale identity-map state in the test session
+        db.expire_all()
+
+    def override_get_read_db():
+        # Same guard as production: replica-routed endpoints must not write
+        read_db = read_only(TestingSessionLocal())
+        try:
+            yield read_db
+        finally:
+            read_db.close()
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # Every test rebuilds the DB with the same ids; don't serve principals from a previous test
+    principal_cache.clear()
     yield TestClient(app)
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Assert an upper bound on SQL statements executed inside a block.
+
+    Usage:
+        with query_budget(5):
+            client.get("/api/v1/leaves/my")
+    """
+    from contextlib import contextmanager
+
+    @contextmanager
+    def _budget(max_queries: int):
+        with count_queries() as statements:
+            yield statements
+        if len(statements) > max_queries:
+            listing = "\n".join(f"  {i + 1}. {' '.join(s.split())[:200]}" for i, s in enumerate(statements))
+            pytest.fail(f"Query budget exceeded: {len(statements)} > {max_queries}\n{listing}")
+
+    return _budget
+
+
+@pytest.fixture
+def make_employee(db):
+    """
+    Add an employee (flushed, not committed); defaults to an EMPLOYEE in a
+    shared "Ops" department who joined 2024-01-01.
+
+    Usage:
+        manager = make_employee("MGR1", role=Role.MANAGER)
+        report = make_employee("EMP1", manager=manager, password="pass1234")
+    """
+    departments = []
+
+    def _make(emp_code, role=Role.EMPLOYEE, manager=None, department=None,
+              join_date=date(2024, 1, 1), password=None, **fields):
+        if department is None:
+            if not departments:
+                departments.append(Department(name="Ops", active=True))
+                db.add(departments[0])
+                db.flush()
+            department = departments[0]
+        employee = Employee(
+            emp_code=emp_code,
+            name=fields.pop("name", emp_code),
+            role=role,
+            department_id=department.id,
+            join_date=join_date,
+            reporting_manager_id=manager.id if manager else None,
+            password_hash=hash_password(password) if password else None,
+            **fields,
+        )
+        db.add(employee)
+        db.flush()
+        return employee
+
+    return _make
+
+
+@pytest.fixture
+def manager_and_employee(db, make_employee):
+    """A MANAGER (joined 2020-01-01) and an EMPLOYEE (joined 2024-01-01) reporting to them"""
+    manager = make_employee("MGR001", role=Role.MANAGER, join_date=date(2020, 1, 1), name="Manager")
+    employee = make_employee("EMP001", manager=manager, name="Employee")
+    db.commit()
+    return manager, employee
+
+
+@pytest.fixture
+def employee(manager_and_employee):
+    """The reporting employee from manager_and_employee"""
+    return manager_and_employee[1]
@@ -0,0 +1,101 @@
+"""
+Tests for the chunked, resumable bulk monthly accrual run
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.query_stats import count_commits, count_queries
+from app.models.accrual_run import AccrualRun, AccrualRunStatus
+from app.models.leave import LeaveBalance, LeaveType, WALLET_LEAVE_TYPES
+from app.services import accrual_service
+from app.services import leave_wallet_service as wallet
+from app.services.accrual_service import run_monthly_accrual
+
+
+@pytest.fixture
+def staff(db: Session, make_employee):
+    """Five long-standing employees, two mid-2026 joiners and one inactive employee"""
+    joins = [date(2024, 1, 1)] * 5 + [date(2026, 2, 10), date(2026, 4, 1)]
+    people = [make_employee(f"BULK{i}", join_date=d) for i, d in enumerate(joins)]
+    people.append(make_employee("BULKX", active=False))
+    db.commit()
+    return people
+
+
+def _balances(db: Session):
+    return {(b.employee_id, b.leave_type): b for b in db.query(LeaveBalance).filter(LeaveBalance.year == 2026)}
+
+
+def test_bulk_run_matches_per_employee_accrual(db: Session, staff):
+    actor = staff[0]
+    with count_commits() as commits, count_queries() as statements:
+        result = run_monthly_accrual(db, 2026, 3, actor.id, chunk_size=2)
+    assert result["status"] == "COMPLETED"
+    # Six active employees joined by March; the April joiner and the inactive one are left out
+    assert (result["credited_count"], result["skipped_not_eligible"]) == (6, 1)
+    assert [(c["employees"], c["error"]) for c in result["chunks"]] == [(2, None)] * 3
+    assert all(c["seconds"] >= 0 for c in result["chunks"])
+    # Checkpoint, one commit per chunk, final status with the audit row
+    assert len(commits) == 5
+    assert len([s for s in statements if s.startswith("INSERT INTO leave_balances")]) == 3
+
+    balances = _balances(db)
+    assert len(balances) == 6 * len(WALLET_LEAVE_TYPES)
+    for emp in staff[:6]:
+        expected = wallet.compute_accrual(db, emp, 2026, date(2026, 3, 31))
+        for lt in WALLET_LEAVE_TYPES:
+            row = balances[(emp.id, lt)]
+            assert row.accrued == Decimal(str(expected[lt]["accrued"]))
+            assert row.accrued_as_of == date(2026, 3, 31)
+    assert balances[(staff[5].id, LeaveType.CL)].accrued == Decimal("1.0")  # Feb joiner: Feb-Mar
+
+
+def test_rerun_keeps_used_and_carry_forward(db: Session, staff):
+    run_monthly_accrual(db, 2026, 3, staff[0].id)
+    cl = db.query(LeaveBalance).filter(
+        LeaveBalance.employee_id == staff[0].id, LeaveBalance.leave_type == LeaveType.CL
+    ).one()
+    cl.used = Decimal("1")
+    cl.carry_forward = Decimal("2")
+    db.commit()
+
+    result = run_monthly_accrual(db, 2026, 4, staff[0].id)
+    assert result["credited_count"] == 7
+    db.refresh(cl)
+    assert (cl.accrued, cl.remaining) == (Decimal("2.0"), Decimal("3.0"))
+    assert db.query(LeaveBalance).count() == 7 * len(WALLET_LEAVE_TYPES)
+
+
+def test_failed_chunk_stops_run_and_resume_continues(db: Session, staff, monkeypatch):
+    upsert = accrual_service._upsert_balances
+    calls = []
+
+    def flaky_upsert(db, rows):
+        calls.append(rows)
+        if len(calls) == 2:
+            raise RuntimeError("connection reset")
+        return upsert(db, rows)
+
+    monkeypatch.setattr(accrual_service, "_upsert_balances", flaky_upsert)
+    result = run_monthly_accrual(db, 2026, 3, staff[0].id, chunk_size=2)
+    assert result["status"] == "FAILED" and "connection reset" in result["error"]
+    assert [c["error"] for c in result["chunks"]] == [None, "connection reset"]
+    assert result["credited_count"] == 2
+    run = db.query(AccrualRun).one()
+    assert (run.status, run.last_employee_id, run.chunks_done) == (AccrualRunStatus.FAILED, staff[1].id, 1)
+    assert {emp_id for emp_id, _ in _balances(db)} == {staff[0].id, staff[1].id}
+
+    result = run_monthly_accrual(db, 2026, 3, staff[0].id, chunk_size=2)
+    assert result["status"] == "COMPLETED"
+    assert result["resumed_after_employee_id"] == staff[1].id
+    assert [c["index"] for c in result["chunks"]] == [1, 2]
+    assert result["credited_count"] == 6
+    assert len(_balances(db)) == 6 * len(WALLET_LEAVE_TYPES)
+
+    # A completed month starts over from the first employee
+    result = run_monthly_accrual(db, 2026, 3, staff[0].id, chunk_size=10)
+    assert result["resumed_after_employee_id"] is None and result["credited_count"] == 6
+    assert db.query(AccrualRun).count() == 1
@@ -106,6 +106,71 @@ def test_auth_login_wrong_password(client, test_employee):
     assert "detail" in data
 
 
+def test_password_hash_async_roundtrip():
+    """Async hash/verify run on the hashing pool and interoperate with the sync API"""
+    import asyncio
+    from app.core.security import hash_password_async, verify_password, verify_password_async
+
+    async def roundtrip():
+        hashed = await hash_password_async("S3cure!pass")
+        return (
+            hashed,
+            await verify_password_async("S3cure!pass", hashed),
+            await verify_password_async("wrong", hashed),
+        )
+
+    hashed, ok, bad = asyncio.run(roundtrip())
+    assert ok is True
+    assert bad is False
+    assert verify_password("S3cure!pass", hashed)
+
+
+def _bearer(employee):
+    from fastapi.security import HTTPAuthorizationCredentials
+    from app.core.security import create_access_token
+    token = create_access_token({"sub": str(employee.id), "emp_code": employee.emp_code, "role": employee.role})
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_principal_cache_serves_repeat_token_without_db(db, test_employee):
+    """Second request with the same token is identified from the cache, not the DB"""
+    from app.core.deps import get_current_user
+    from app.core.principal_cache import principal_cache
+
+    principal_cache.clear()
+    creds = _bearer(test_employee)
+    first = get_current_user(credentials=creds, db=db)
+    second = get_current_user(credentials=creds, db=None)  # no session: must be a cache hit
+
+    assert second is first
+    assert first.id == test_employee.id
+    assert first.department_id == test_employee.department_id
+    assert first.role_rank == 99
+
+
+def test_principal_cache_evicted_on_deactivation(db, test_employee):
+    """Deactivating through update_employee drops cached principals for that employee"""
+    from fastapi import HTTPException
+    from app.core.deps import get_current_user
+    from app.core.principal_cache import principal_cache
+    from app.schemas.employee import EmployeeUpdate
+    from app.services.employee_service import update_employee
+
+    from app.models.role import RoleModel
+
+    db.add(RoleModel(name="EMPLOYEE", role_rank=99, wfh_enabled=False, is_active=True))
+    db.commit()
+    principal_cache.clear()
+    creds = _bearer(test_employee)
+    get_current_user(credentials=creds, db=db)
+
+    update_employee(db, test_employee.id, EmployeeUpdate(active=False), actor_id=test_employee.id)
+
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(credentials=creds, db=db)
+    assert exc.value.status_code == status.HTTP_403_FORBIDDEN
+
+
 def test_auth_login_invalid_emp_code(client):
     """Test login with invalid emp_code returns 401"""
     response = client.post(
@@ -0,0 +1,135 @@
+"""
+Tests for the employee_leave_balance_view read model and the admin balance grid
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import status
+from sqlalchemy.orm import Session
+
+from app.db.query_stats import count_queries
+from app.models.department import Department
+from app.models.employee import Role
+from app.models.leave import LeaveBalance, LeaveType, WALLET_LEAVE_TYPES
+from app.models.leave_balance_view import EmployeeLeaveBalanceView
+from app.services.accrual_service import run_monthly_accrual
+from app.services.balance_view_service import is_eligible, list_balances, refresh_balance_view
+from app.services.leave_service import apply_leave, approve_leave, cancel_leave
+from app.services.year_close_service import run_year_close
+
+
+@pytest.fixture
+def org(db: Session, make_employee):
+    """An ADMIN in Ops; staff in Ops and Sales, one of them joined 2026-08-01 (PL/FL not yet eligible)"""
+    ops = Department(name="Ops", active=True)
+    sales = Department(name="Sales", active=True)
+    db.add_all([ops, sales])
+    db.flush()
+    admin = make_employee(
+        "VADM", role=Role.ADMIN, department=ops, join_date=date(2020, 1, 1), password="admpass123", name="Admin"
+    )
+    staff = [
+        make_employee("V001", manager=admin, department=ops, name="Asha"),
+        make_employee("V002", manager=admin, department=sales, name="Bala"),
+        make_employee("V003", manager=admin, department=sales, join_date=date(2026, 8, 1), name="Chitra"),
+    ]
+    db.commit()
+    return admin, staff, ops, sales
+
+
+def _view(db: Session, employee_id, leave_type, year=2026):
+    db.expire_all()
+    return db.get(EmployeeLeaveBalanceView, (employee_id, year, leave_type))
+
+
+def test_accrual_and_leave_lifecycle_keep_view_current(db: Session, org):
+    admin, (asha, bala, chitra), ops, _ = org
+    run_monthly_accrual(db, 2026, 10, admin.id)
+    assert db.query(EmployeeLeaveBalanceView).count() == 4 * len(WALLET_LEAVE_TYPES)
+
+    row = _view(db, asha.id, LeaveType.CL)
+    assert (row.accrued, row.allocated, row.remaining) == (Decimal("5.00"), Decimal("5.00"), Decimal("5.00"))
+    assert (row.emp_code, row.department_id, row.eligible_from) == ("V001", ops.id, None)
+    pl = _view(db, chitra.id, LeaveType.PL)
+    assert pl.eligible_from == date(2027, 2, 1)
+    assert not is_eligible(pl, date(2026, 10, 16)) and is_eligible(pl, date(2027, 2, 1))
+
+    leave = apply_leave(db, asha.id, LeaveType.CL, date(2026, 11, 2), date(2026, 11, 2))
+    approve_leave(db, leave.id, admin)
+    assert (_view(db, asha.id, LeaveType.CL).used, _view(db, asha.id, LeaveType.CL).remaining) == (
+        Decimal("1.00"), Decimal("4.00"),
+    )
+    cancel_leave(db, leave.id, admin, "plans changed")
+    assert _view(db, asha.id, LeaveType.CL).used == Decimal("0.00")
+
+
+def test_employee_edits_and_rollbacks(db: Session, org):
+    admin, (asha, _, _), _, sales = org
+    run_monthly_accrual(db, 2026, 3, admin.id)
+
+    asha.name = "Asha R"
+    asha.department_id = sales.id
+    db.commit()
+    row = _view(db, asha.id, LeaveType.SL)
+    assert (row.employee_name, row.department_id) == ("Asha R", sales.id)
+
+    balance = db.query(LeaveBalance).filter(
+        LeaveBalance.employee_id == asha.id, LeaveBalance.leave_type == LeaveType.SL
+    ).one()
+    balance.used = Decimal("1")
+    db.flush()
+    db.rollback()
+    assert _view(db, asha.id, LeaveType.SL).used == Decimal("0.00")
+
+    # Raw edits are picked up by an explicit rebuild
+    db.query(LeaveBalance).filter(LeaveBalance.employee_id == asha.id).update(
+        {LeaveBalance.used: Decimal("0.5")}, synchronize_session=False
+    )
+    assert refresh_balance_view(db, 2026) == 3 * len(WALLET_LEAVE_TYPES)  # Chitra joins in August
+    db.commit()
+    assert _view(db, asha.id, LeaveType.SL).used == Decimal("0.50")
+
+
+def test_year_close_fills_next_year(db: Session, org):
+    admin, (asha, _, _), _, _ = org
+    run_monthly_accrual(db, 2026, 12, admin.id)
+    run_year_close(db, 2026, admin.id)
+    row = _view(db, asha.id, LeaveType.PL, year=2027)
+    assert row is not None and row.opening == row.carry_forward > 0
+
+
+def test_grid_is_one_query_with_filters_sort_and_pages(db: Session, org):
+    admin, (asha, bala, chitra), ops, sales = org
+    run_monthly_accrual(db, 2026, 10, admin.id)
+    sales_id, chitra_id = sales.id, chitra.id
+
+    with count_queries() as statements:
+        rows, total = list_balances(db, 2026, department_id=sales_id, sort="employee_name", descending=True, limit=3)
+    assert len(statements) == 1
+    assert total == 2 * len(WALLET_LEAVE_TYPES)
+    assert [(r[0].emp_code, r[1]) for r in rows] == [("V003", "Sales")] * 3
+
+    rows, total = list_balances(db, 2026, leave_type=LeaveType.PL, sort="remaining")
+    assert total == 4 and [r[0].employee_id for r in rows][0] == chitra_id
+
+    rows, total = list_balances(db, 2026, leave_type=LeaveType.PL, offset=10, limit=5)
+    assert rows == [] and total == 4
+
+
+def test_admin_balances_endpoint(client, db: Session, org):
+    admin, (asha, bala, chitra), ops, sales = org
+    run_monthly_accrual(db, 2026, 10, admin.id)
+    token = client.post("/api/v1/auth/login", json={"emp_code": "VADM", "password": "admpass123"}).json()["access_token"]
+
+    response = client.get(
+        "/api/v1/admin/leaves/balances",
+        params={"year": 2026, "leave_type": "CL", "sort": "emp_code", "order": "desc", "limit": 2, "offset": 1},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["total"], data["offset"], data["limit"]) == (4, 1, 2)
+    # VADM sorts first
+    assert [i["emp_code"] for i in data["items"]] == ["V003", "V002"]
+    assert data["items"][1]["department_name"] == "Sales" and data["items"][1]["allocated"] == 5.0
@@ -0,0 +1,84 @@
+"""
+Tests for connection pool configuration and metrics
+"""
+import asyncio
+import os
+import tempfile
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.db.pool_metrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, PoolMetrics, percentile
+from app.db.session import pool_kwargs
+
+
+def test_pool_kwargs_from_settings():
+    """File databases get the DB_POOL_* settings; in-memory SQLite keeps its singleton pool"""
+    kwargs = pool_kwargs("postgresql://u:p@localhost/db")
+    assert set(kwargs) == {"pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"}
+    assert pool_kwargs("sqlite://") == {"pool_pre_ping": kwargs["pool_pre_ping"]}
+
+
+def test_pool_metrics_track_in_use_and_timeouts():
+    """Checkout events, wait times and QueuePool timeouts are reported"""
+    path = os.path.join(tempfile.gettempdir(), f"acs_hrms_pool_{os.getpid()}.db")
+    engine = create_engine(
+        f"sqlite:///{path}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    metrics = PoolMetrics("test").attach(engine)
+    try:
+        held = engine.connect()
+        snap = metrics.snapshot()
+        assert snap["in_use"] == 1
+        assert snap["checkouts_total"] == 1
+
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+        held.close()
+        snap = metrics.snapshot()
+        assert snap["timeouts_total"] == 1
+        assert snap["in_use"] == 0
+        assert snap["wait_ms_max"] >= 50
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def test_async_pool_reports_checkout_waits():
+    """The async engine's pool times checkouts too (primary_async wait percentiles)"""
+    path = os.path.join(tempfile.gettempdir(), f"acs_hrms_async_pool_{os.getpid()}.db")
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    metrics = PoolMetrics("test_async").attach(engine.sync_engine)
+
+    async def scenario():
+        async with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+        await engine.dispose()
+
+    try:
+        asyncio.run(scenario())
+        snap = metrics.snapshot()
+        assert snap["pool_class"] == "InstrumentedAsyncAdaptedQueuePool"
+        assert snap["timeouts_total"] == 1
+        assert snap["wait_ms_max"] >= 50
+    finally:
+        os.remove(path)
+
+
+def test_percentile_nearest_rank():
+    assert percentile([], 95) == 0.0
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile([3.0], 99) == 3.0
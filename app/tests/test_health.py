@@ -14,3 +14,12 @@ def test_health_endpoint(client):
     assert data["status"] == "ok"
     assert data["service"] == "acs-hrms-backend"
     assert data["credit"] == SYSTEM_CREDIT
+
+
+def test_health_reports_hashing_self_test(client):
+    """Hashing self-test runs on /health (not at import) and reports each backend"""
+    response = client.get("/api/v1/health")
+
+    hashing = response.json()["hashing"]
+    assert set(hashing) == {"argon2", "bcrypt"}
+    assert any(hashing.values())
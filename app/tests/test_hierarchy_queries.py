@@ -0,0 +1,169 @@
+"""
+Property tests: recursive-CTE and closure-table hierarchy queries match the
+per-node walks they replaced
+"""
+import random
+from collections import deque
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.query_stats import count_queries
+from app.models.department import Department
+from app.models.employee import Employee, Role
+from app.models.employee_hierarchy import EmployeeHierarchyClosure
+from app.services.employee_service import _check_reporting_hierarchy_cycle
+from app.services.hierarchy_service import is_subordinate, rebuild_closure
+from app.services.leave_service import get_manager_chain_ids, get_subordinate_ids
+
+
+# Reference implementations: the previous one-query-per-node walks
+
+def _subordinates_walk(db: Session, manager_id: int):
+    ids = []
+    queue = deque([manager_id])
+    while queue:
+        current = queue.popleft()
+        for (emp_id,) in db.query(Employee.id).filter(
+            Employee.reporting_manager_id == current, Employee.active == True
+        ).all():
+            ids.append(emp_id)
+            queue.append(emp_id)
+    return ids
+
+
+def _manager_chain_walk(db: Session, employee_id: int):
+    chain = []
+    current, depth = employee_id, 0
+    while current and depth < 20:
+        depth += 1
+        emp = db.query(Employee).filter(Employee.id == current, Employee.active == True).first()
+        if not emp or not emp.reporting_manager_id:
+            break
+        chain.append(emp.reporting_manager_id)
+        current = emp.reporting_manager_id
+    return chain
+
+
+def _cycle_walk(db: Session, employee_id: int, reporting_manager_id: int):
+    if employee_id == reporting_manager_id:
+        return True
+    visited, current = set(), reporting_manager_id
+    while current is not None:
+        if current == employee_id:
+            return True
+        if current in visited:
+            break
+        visited.add(current)
+        manager = db.query(Employee).filter(Employee.id == current).first()
+        if not manager or not manager.reporting_manager_id:
+            break
+        current = manager.reporting_manager_id
+    return False
+
+
+def _build_org(db: Session, rng: random.Random, size: int, allow_cycles: bool):
+    """Random reporting forest (managers always created earlier); optionally rewire some edges into cycles"""
+    dept = Department(name=f"Dept {rng.random()}", active=True)
+    db.add(dept)
+    db.flush()
+    employees = []
+    for i in range(size):
+        emp = Employee(
+            emp_code=f"H{rng.randrange(10**9):09d}{i}",
+            name=f"Emp {i}",
+            role=Role.EMPLOYEE,
+            department_id=dept.id,
+            join_date=date(2024, 1, 1),
+            active=rng.random() > 0.15,
+            reporting_manager_id=rng.choice(employees).id if employees and rng.random() > 0.1 else None,
+        )
+        db.add(emp)
+        db.flush()
+        employees.append(emp)
+    if allow_cycles:
+        for emp in rng.sample(employees, max(1, size // 10)):
+            emp.reporting_manager_id = rng.choice(employees).id
+        db.flush()
+    db.commit()
+    return [e.id for e in employees]
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_subordinate_ids_match_walk(db: Session, seed: int):
+    rng = random.Random(seed)
+    ids = _build_org(db, rng, size=40, allow_cycles=False)
+    for manager_id in ids + [max(ids) + 1]:
+        assert sorted(get_subordinate_ids(db, manager_id)) == sorted(_subordinates_walk(db, manager_id))
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_manager_chain_matches_walk(db: Session, seed: int):
+    rng = random.Random(seed)
+    ids = _build_org(db, rng, size=40, allow_cycles=seed % 2 == 1)
+    for employee_id in ids:
+        assert get_manager_chain_ids(db, employee_id) == _manager_chain_walk(db, employee_id)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_cycle_check_matches_walk(db: Session, seed: int):
+    """Closure lookup agrees with the walk (the closure only models acyclic trees, which the services enforce)"""
+    rng = random.Random(seed)
+    ids = _build_org(db, rng, size=40, allow_cycles=False)
+    for _ in range(60):
+        employee_id, manager_id = rng.choice(ids + [0]), rng.choice(ids)
+        assert _check_reporting_hierarchy_cycle(db, employee_id, manager_id) == _cycle_walk(db, employee_id, manager_id)
+
+
+def _closure_pairs(db: Session):
+    return sorted(
+        (r.ancestor_id, r.descendant_id, r.depth) for r in db.query(EmployeeHierarchyClosure).all()
+    )
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_closure_maintained_on_moves_and_deletes(db: Session, seed: int):
+    """Incremental maintenance equals a full rebuild after manager changes and leaf deletes"""
+    rng = random.Random(seed)
+    ids = _build_org(db, rng, size=30, allow_cycles=False)
+    for _ in range(15):
+        emp = db.get(Employee, rng.choice(ids))
+        manager_id = rng.choice(ids + [None])
+        if manager_id is None or not _check_reporting_hierarchy_cycle(db, emp.id, manager_id):
+            emp.reporting_manager_id = manager_id
+            db.commit()
+    leaves = [i for i in ids if not db.query(Employee).filter(Employee.reporting_manager_id == i).count()]
+    for leaf_id in leaves[:3]:
+        db.delete(db.get(Employee, leaf_id))
+    db.commit()
+
+    incremental = _closure_pairs(db)
+    rebuild_closure(db)
+    db.commit()
+    assert incremental == _closure_pairs(db)
+
+    remaining = [e.id for e in db.query(Employee).all()]
+    for manager_id in remaining:
+        expected = set(get_subordinate_ids(db, manager_id))
+        for employee_id in remaining:
+            assert is_subordinate(db, manager_id, employee_id) == (employee_id in expected)
+
+
+def test_subordinate_ids_single_round_trip(db: Session):
+    """Depth of the tree no longer multiplies the query count"""
+    ids = _build_org(db, random.Random(99), size=60, allow_cycles=False)
+    with count_queries() as statements:
+        get_subordinate_ids(db, ids[0])
+    assert len(statements) == 1
+
+
+def test_subordinate_ids_terminate_on_cycle(db: Session):
+    """Bad data with a reporting cycle must not hang the CTE"""
+    ids = _build_org(db, random.Random(7), size=3, allow_cycles=False)
+    a, b, c = (db.get(Employee, i) for i in ids)
+    for emp in (a, b, c):
+        emp.active = True
+    a.reporting_manager_id, b.reporting_manager_id, c.reporting_manager_id = c.id, a.id, b.id
+    db.commit()
+    assert sorted(get_subordinate_ids(db, a.id)) == sorted(ids)
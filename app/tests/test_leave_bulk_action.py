@@ -0,0 +1,158 @@
+"""
+Tests for bulk approve/reject of pending leave requests
+"""
+import threading
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.db.query_stats import count_commits
+from app.models.audit_log import AuditLog
+from app.models.employee import Role
+from app.models.leave import ApprovalAction, LeaveApproval, LeaveRequest, LeaveStatus, LeaveType
+from app.models.notification_device import NotificationDevice
+from app.services import leave_service, push_service
+from app.services.leave_service import bulk_leave_action
+
+
+@pytest.fixture
+def team(db: Session, make_employee):
+    """Manager with two reports (each with a push token) and one employee outside the team"""
+    manager = make_employee("BMGR", role=Role.MANAGER, join_date=date(2020, 1, 1), password="mgrpass123")
+    outsider = make_employee("BOUT", join_date=date(2020, 1, 1))
+    reports = [make_employee(f"BEMP{i}", manager=manager, join_date=date(2020, 1, 1)) for i in range(2)]
+    for i, emp in enumerate(reports):
+        db.add(NotificationDevice(user_id=emp.id, fcm_token=f"token-{i}", platform="android", is_active=True))
+    db.commit()
+    return manager, reports, outsider
+
+
+def _pending(db: Session, employee, day, leave_type=LeaveType.LWP):
+    leave = LeaveRequest(
+        employee_id=employee.id,
+        leave_type=leave_type,
+        from_date=date(2026, 11, day),
+        to_date=date(2026, 11, day),
+        status=LeaveStatus.PENDING,
+        computed_days=Decimal("1"),
+    )
+    db.add(leave)
+    db.commit()
+    return leave
+
+
+@pytest.fixture
+def pushes(monkeypatch):
+    sent = []
+
+    def fake_send(tokens, title, body, data=None, label="push"):
+        sent.append((sorted(tokens), title, data))
+
+    monkeypatch.setattr(leave_service, "send_push_in_background", fake_send)
+    return sent
+
+
+def test_bulk_approve_one_commit_per_item_results_and_one_push(db: Session, team, pushes):
+    manager, (first, second), outsider = team
+    a = _pending(db, first, 2)
+    b = _pending(db, first, 3)
+    c = _pending(db, second, 2)
+    foreign = _pending(db, outsider, 2)
+    done = _pending(db, second, 4)
+    done.status = LeaveStatus.APPROVED
+    db.commit()
+
+    ids = [a.id, b.id, foreign.id, c.id, done.id, 9999, a.id]
+    with count_commits() as commits:
+        items = bulk_leave_action(db, ids, ApprovalAction.APPROVE, manager, remarks="month end")
+    assert len(commits) == 1
+
+    assert [i["leave_request_id"] for i in items] == [a.id, b.id, foreign.id, c.id, done.id, 9999]
+    assert [i["ok"] for i in items] == [True, True, False, True, False, False]
+    assert [i.get("error_status") for i in items if not i["ok"]] == [403, 400, 404]
+    assert all(i["status"] == LeaveStatus.APPROVED for i in items if i["ok"])
+
+    db.expire_all()
+    assert db.get(LeaveRequest, foreign.id).status == LeaveStatus.PENDING
+    assert db.query(LeaveApproval).filter(LeaveApproval.action == ApprovalAction.APPROVE).count() == 3
+    assert db.query(AuditLog).filter(AuditLog.action == "LEAVE_APPROVE").count() == 3
+    assert pushes == [(["token-0", "token-1"], "Leave Approved", {"type": "LEAVE_APPROVED"})]
+
+
+def test_failing_item_rolls_back_alone(db: Session, team, pushes, monkeypatch):
+    manager, (first, second), _ = team
+    ok = _pending(db, first, 2)
+    broken = _pending(db, second, 2)
+    log_audit = leave_service.log_audit
+
+    def flaky_audit(db, **kwargs):
+        # Fails after the status change and approval row were flushed
+        if kwargs["entity_id"] == broken.id:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="audit conflict")
+        return log_audit(db, **kwargs)
+
+    monkeypatch.setattr(leave_service, "log_audit", flaky_audit)
+    items = bulk_leave_action(db, [broken.id, ok.id], ApprovalAction.REJECT, manager, remarks="no cover")
+    assert [(i["ok"], i.get("error_status")) for i in items] == [(False, 409), (True, None)]
+
+    db.expire_all()
+    assert db.get(LeaveRequest, broken.id).status == LeaveStatus.PENDING
+    assert db.get(LeaveRequest, ok.id).status == LeaveStatus.REJECTED
+    assert db.query(LeaveApproval).filter(LeaveApproval.leave_request_id == broken.id).count() == 0
+    assert pushes == [(["token-0"], "Leave Rejected", {"type": "LEAVE_REJECTED"})]
+
+
+def test_bulk_reject_requires_remarks(db: Session, team, pushes):
+    manager, (first, _), _ = team
+    leave = _pending(db, first, 2)
+    with pytest.raises(HTTPException) as exc:
+        bulk_leave_action(db, [leave.id], ApprovalAction.REJECT, manager, remarks=" ")
+    assert exc.value.status_code == 400
+    assert pushes == []
+
+
+def test_bulk_action_endpoint(client, db: Session, team, pushes):
+    manager, (first, second), _ = team
+    ids = [_pending(db, first, 2).id, _pending(db, second, 2).id]
+    token = client.post("/api/v1/auth/login", json={"emp_code": "BMGR", "password": "mgrpass123"}).json()["access_token"]
+
+    response = client.post(
+        "/api/v1/leaves/bulk-action",
+        json={"leave_request_ids": ids, "action": "APPROVE", "remarks": "ok"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["succeeded"], data["failed"]) == (2, 0)
+    assert [i["status"] for i in data["items"]] == ["APPROVED", "APPROVED"]
+    assert len(pushes) == 1
+
+
+def test_push_sent_off_the_calling_thread(db: Session, team, monkeypatch):
+    """A slow FCM call doesn't hold up the request: the send runs on the push pool"""
+    manager, (first, _), _ = team
+    leave = _pending(db, first, 2)
+    release, senders = threading.Event(), []
+
+    def blocking_send(tokens, title, body, data=None):
+        senders.append(threading.current_thread().name)
+        release.wait(5)
+        return {"success": True, "success_count": len(tokens)}
+
+    futures = []
+    send_in_background = push_service.send_push_in_background
+    monkeypatch.setattr(push_service, "send_push_to_tokens", blocking_send)
+    monkeypatch.setattr(
+        leave_service, "send_push_in_background", lambda *a, **kw: futures.append(send_in_background(*a, **kw))
+    )
+
+    items = bulk_leave_action(db, [leave.id], ApprovalAction.APPROVE, manager, remarks="ok")
+    assert items[0]["ok"]
+    assert len(futures) == 1 and not futures[0].done()  # returned while FCM is still "in flight"
+
+    release.set()
+    futures[0].result(timeout=5)
+    assert senders and senders[0].startswith("push")
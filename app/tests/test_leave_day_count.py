@@ -0,0 +1,144 @@
+"""
+Property tests: linear sandwich-rule day count matches the previous O(n^2)
+implementation, plus the bulk recompute of PENDING leaves
+"""
+import json
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.event import CompanyEvent
+from app.models.holiday import Holiday
+from app.models.leave import LeaveDuration, LeaveRequest, LeaveStatus, LeaveType
+from app.services.leave_service import (
+    calculate_days_with_sandwich,
+    count_leave_days,
+    get_non_working_days_in_range,
+    recompute_pending_leave_days,
+)
+
+
+def _sandwich_reference(db: Session, leave_type, from_date, to_date, include_events):
+    """The previous implementation: every non-working day checked against every counted day"""
+    non_working_days = get_non_working_days_in_range(db, from_date, to_date, include_company_events=include_events)
+    baseline_counted = set()
+    d = from_date
+    while d <= to_date:
+        if d not in non_working_days:
+            baseline_counted.add(d)
+        d += timedelta(days=1)
+    included = set(baseline_counted)
+    if leave_type in (LeaveType.CL, LeaveType.PL, LeaveType.SL):
+        for x in non_working_days:
+            if any(c < x for c in baseline_counted) and any(c > x for c in baseline_counted):
+                included.add(x)
+    by_month = {}
+    for d in included:
+        key = f"{d.year}-{d.month:02d}"
+        by_month[key] = by_month.get(key, 0.0) + 1.0
+    return float(len(included)), by_month
+
+
+def _seed_calendar(db: Session, rng: random.Random, year: int = 2026):
+    days = [date(year, 1, 1) + timedelta(days=i) for i in range(365)]
+    # Dense holidays make non-working runs at range edges likely
+    for d in rng.sample(days, 40):
+        db.add(Holiday(year=year, date=d, name=f"H {d}", active=rng.random() > 0.1))
+    for d in rng.sample(days, 15):
+        db.add(CompanyEvent(year=year, date=d, name=f"E {d}", active=True))
+    db.commit()
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_linear_count_matches_reference(db: Session, seed: int):
+    rng = random.Random(seed)
+    _seed_calendar(db, rng)
+    for _ in range(60):
+        start = date(2026, 1, 1) + timedelta(days=rng.randrange(365))
+        end = min(date(2026, 12, 31), start + timedelta(days=rng.randrange(45)))
+        leave_type = rng.choice(list(LeaveType))
+        include_events = rng.random() > 0.3
+        assert count_leave_days(db, leave_type, start, end, include_events) == _sandwich_reference(
+            db, leave_type, start, end, include_events
+        )
+
+
+def test_calculate_days_with_sandwich_edges(db: Session):
+    db.add(Holiday(year=2026, date=date(2026, 3, 2), name="Mon holiday", active=True))
+    db.commit()
+    # Sat 28 Feb, Sun 1 Mar, Mon 2 Mar (holiday), Tue 3 Mar: both gaps sandwiched across the month edge
+    assert calculate_days_with_sandwich(db, LeaveType.CL, date(2026, 2, 28), date(2026, 3, 3)) == (
+        4.0,
+        {"2026-02": 1.0, "2026-03": 3.0},
+    )
+    # Range starts on the non-working days: no sandwich at the edge
+    assert calculate_days_with_sandwich(db, LeaveType.PL, date(2026, 3, 1), date(2026, 3, 3)) == (
+        1.0,
+        {"2026-03": 1.0},
+    )
+    # Only non-working days
+    assert calculate_days_with_sandwich(db, LeaveType.SL, date(2026, 3, 1), date(2026, 3, 2)) == (0.0, {})
+    # No sandwich for LWP
+    assert calculate_days_with_sandwich(db, LeaveType.LWP, date(2026, 2, 28), date(2026, 3, 3)) == (
+        2.0,
+        {"2026-02": 1.0, "2026-03": 1.0},
+    )
+
+
+def _pending(db: Session, employee, leave_type, from_date, to_date, **kwargs):
+    days, by_month = calculate_days_with_sandwich(db, leave_type, from_date, to_date)
+    leave = LeaveRequest(
+        employee_id=employee.id,
+        leave_type=leave_type,
+        from_date=from_date,
+        to_date=to_date,
+        status=LeaveStatus.PENDING,
+        computed_days=Decimal(str(kwargs.pop("days", days))),
+        computed_days_by_month=json.dumps(by_month),
+        **kwargs,
+    )
+    db.add(leave)
+    db.commit()
+    return leave
+
+
+def test_recompute_pending_after_holiday_edit(db: Session, employee):
+    # Mon 9 Mar - Fri 13 Mar 2026: 5 days
+    week = _pending(db, employee, LeaveType.CL, date(2026, 3, 9), date(2026, 3, 13))
+    half = _pending(
+        db, employee, LeaveType.SL, date(2026, 3, 11), date(2026, 3, 11),
+        days=0.5, duration=LeaveDuration.HALF_DAY,
+    )
+    untouched = _pending(db, employee, LeaveType.PL, date(2026, 4, 6), date(2026, 4, 7))
+    auto_lwp = _pending(
+        db, employee, LeaveType.LWP, date(2026, 3, 16), date(2026, 3, 16), auto_converted_to_lwp=True
+    )
+    approved = _pending(db, employee, LeaveType.CL, date(2026, 3, 17), date(2026, 3, 17))
+    approved.status = LeaveStatus.APPROVED
+    assert float(week.computed_days) == 5.0
+
+    # Holiday on the first day shortens the CL; the half day falls on the other one
+    db.add(Holiday(year=2026, date=date(2026, 3, 9), name="Monday", active=True))
+    db.add(Holiday(year=2026, date=date(2026, 3, 11), name="Mid-week", active=True))
+    db.commit()
+
+    summary = recompute_pending_leave_days(db, 2026)
+    assert summary["pending"] == 4
+    assert summary["updated"] == [week.id]
+    assert summary["zero_day"] == [half.id]
+    assert summary["skipped_auto_lwp"] == [auto_lwp.id]
+    assert summary["unchanged"] == 1
+
+    db.refresh(week)
+    db.refresh(untouched)
+    # 11 Mar sits between counted days, so it stays sandwiched; only 9 Mar drops out
+    assert float(week.computed_days) == 4.0
+    assert json.loads(week.computed_days_by_month) == {"2026-03": 4.0}
+    assert (float(week.paid_days), float(week.lwp_days)) == (0.0, 4.0)  # no wallet rows: all LWP
+    assert float(untouched.computed_days) == 2.0
+
+    # Second run is a no-op
+    assert recompute_pending_leave_days(db, 2026)["updated"] == []
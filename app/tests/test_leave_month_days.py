@@ -0,0 +1,94 @@
+"""
+Tests for the leave_request_month_days rows behind the monthly cap check
+"""
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.db.query_stats import count_queries
+from app.models.holiday import Holiday
+from app.models.leave import LeaveRequest, LeaveRequestMonthDays, LeaveStatus, LeaveType
+from app.models.policy import PolicySetting
+from app.services.leave_month_days import monthly_totals, parse_by_month, rebuild_month_days
+from app.services.leave_service import apply_leave, recompute_pending_leave_days
+from app.services.policy_cache import policy_cache
+from app.services.policy_validator import validate_monthly_cap
+
+
+def _month_rows(db: Session, leave_id: int):
+    rows = db.query(LeaveRequestMonthDays).filter(LeaveRequestMonthDays.leave_request_id == leave_id)
+    return {r.month: float(r.days) for r in rows}
+
+
+def _approved(db: Session, employee, leave_type, by_month, day=2):
+    leave = LeaveRequest(
+        employee_id=employee.id,
+        leave_type=leave_type,
+        from_date=date(2026, 11, day),
+        to_date=date(2026, 11, day),
+        computed_days=Decimal(str(sum(by_month.values()))),
+        computed_days_by_month=json.dumps(by_month),
+        status=LeaveStatus.APPROVED,
+    )
+    db.add(leave)
+    db.commit()
+    return leave
+
+
+def test_rows_follow_apply_update_and_recompute(db: Session, employee):
+    # Mon 30 Nov - Wed 2 Dec 2026 spans two months
+    leave = apply_leave(db, employee.id, LeaveType.CL, date(2026, 11, 30), date(2026, 12, 2))
+    assert _month_rows(db, leave.id) == json.loads(leave.computed_days_by_month) == {"2026-11": 1.0, "2026-12": 2.0}
+
+    leave.computed_days_by_month = json.dumps({"2026-12": 2.0})
+    db.commit()
+    assert _month_rows(db, leave.id) == {"2026-12": 2.0}
+
+    # Bulk recompute bypasses the ORM; rows still follow
+    db.add(Holiday(year=2026, date=date(2026, 12, 2), name="Wednesday", active=True))
+    db.commit()
+    summary = recompute_pending_leave_days(db, 2026)
+    assert summary["updated"] == [leave.id]
+    assert _month_rows(db, leave.id) == {"2026-11": 1.0, "2026-12": 1.0}
+
+    db.delete(leave)
+    db.commit()
+    assert db.query(LeaveRequestMonthDays).count() == 0
+
+
+def test_monthly_cap_single_grouped_query(db: Session, employee):
+    db.add(PolicySetting(year=2026, enforce_monthly_cap=True, cl_pl_monthly_cap=4))
+    db.commit()
+    settings = policy_cache.get(db, 2026)
+    _approved(db, employee, LeaveType.CL, {"2026-10": 1.0, "2026-11": 2.0})
+    _approved(db, employee, LeaveType.RH, {"2026-11": 1.0}, day=3)
+    _approved(db, employee, LeaveType.SL, {"2026-11": 3.0}, day=4)  # not capped
+    excluded_id = _approved(db, employee, LeaveType.PL, {"2026-11": 1.0}, day=5).id
+    employee_id = employee.id
+
+    with count_queries() as statements:
+        validate_monthly_cap(db, employee_id, {"2026-11": 1.0}, settings, 2026, exclude_leave_request_id=excluded_id)
+    assert len(statements) == 1
+
+    with pytest.raises(HTTPException) as exc:
+        validate_monthly_cap(db, employee.id, {"2026-11": 1.5}, settings, 2026)
+    assert exc.value.status_code == 409
+    assert "Existing approved days: 4.0" in exc.value.detail
+    assert monthly_totals(db, employee.id, ["2026-10", "2026-12"]) == {"2026-10": 1.0}
+
+
+def test_rebuild_and_bad_json(db: Session, employee):
+    leave = _approved(db, employee, LeaveType.CL, {"2026-11": 0.5})
+    broken = _approved(db, employee, LeaveType.CL, {"2026-11": 1.0}, day=3)
+    db.query(LeaveRequestMonthDays).delete()
+    db.query(LeaveRequest).filter(LeaveRequest.id == broken.id).update({"computed_days_by_month": "{not json"})
+    db.commit()
+
+    assert rebuild_month_days(db) == 1
+    db.commit()
+    assert _month_rows(db, leave.id) == {"2026-11": 0.5}
+    assert parse_by_month("{not json") == {} and parse_by_month({"2026-01": 0}) == {}
@@ -0,0 +1,120 @@
+"""
+Tests for the leave overlap probe and the database-enforced overlap constraint
+"""
+import threading
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.db.query_stats import count_queries
+from app.models.leave import LeaveDuration, LeaveRequest, LeaveStatus, LeaveType
+from app.services import leave_service
+from app.services.leave_service import apply_leave, validate_overlap
+from app.services.leave_wallet_service import ensure_wallet_for_employee
+from app.services.policy_validator import get_or_create_policy_settings
+
+
+def _leave(db: Session, employee, from_date, to_date, status=LeaveStatus.APPROVED, **kwargs):
+    leave = LeaveRequest(
+        employee_id=employee.id,
+        leave_type=LeaveType.CL,
+        from_date=from_date,
+        to_date=to_date,
+        status=status,
+        computed_days=Decimal("1"),
+        **kwargs,
+    )
+    db.add(leave)
+    db.commit()
+    return leave
+
+
+def test_overlap_probe_is_a_single_light_query(db: Session, employee):
+    _leave(db, employee, date(2026, 11, 2), date(2026, 11, 4))
+    employee_id = employee.id
+    db.expire_all()
+
+    with count_queries() as statements:
+        with pytest.raises(HTTPException) as exc:
+            validate_overlap(db, employee_id, date(2026, 11, 4), date(2026, 11, 6))
+    assert exc.value.status_code == 409
+    assert len(statements) == 1
+    assert "JOIN" not in statements[0].upper() and "LIMIT" in statements[0].upper()
+
+    # Adjacent dates don't conflict
+    validate_overlap(db, employee_id, date(2026, 11, 5), date(2026, 11, 6))
+
+
+def test_constraint_rejects_overlapping_full_day_rows(db: Session, employee):
+    _leave(db, employee, date(2026, 11, 2), date(2026, 11, 4))
+    with pytest.raises(IntegrityError) as exc:
+        _leave(db, employee, date(2026, 11, 4), date(2026, 11, 4), status=LeaveStatus.PENDING)
+    assert leave_service._is_overlap_violation(exc.value)
+    db.rollback()
+
+    # Rejected rows, half days and adjacent ranges are outside the constraint
+    _leave(db, employee, date(2026, 11, 3), date(2026, 11, 3), status=LeaveStatus.REJECTED)
+    _leave(db, employee, date(2026, 11, 3), date(2026, 11, 3), status=LeaveStatus.PENDING,
+           duration=LeaveDuration.HALF_DAY)
+    cancelled = _leave(db, employee, date(2026, 11, 5), date(2026, 11, 5), status=LeaveStatus.CANCELLED)
+
+    # Re-activating a row into an overlap is rejected too; a row never conflicts with itself
+    active = _leave(db, employee, date(2026, 11, 5), date(2026, 11, 6), status=LeaveStatus.PENDING)
+    cancelled.status = LeaveStatus.PENDING
+    with pytest.raises(IntegrityError):
+        db.commit()
+    db.rollback()
+    active.to_date = date(2026, 11, 7)
+    db.commit()
+
+
+def test_race_past_overlap_check_returns_409(db: Session, employee, monkeypatch):
+    _leave(db, employee, date(2026, 11, 2), date(2026, 11, 2), status=LeaveStatus.PENDING)
+    # Simulate a concurrent apply committing between the overlap check and our insert
+    monkeypatch.setattr(leave_service, "_overlapping_leaves", lambda *args, **kwargs: [])
+
+    with pytest.raises(HTTPException) as exc:
+        apply_leave(db, employee.id, LeaveType.CL, date(2026, 11, 2), date(2026, 11, 2))
+    assert exc.value.status_code == 409
+    assert db.query(LeaveRequest).count() == 1
+
+
+def test_parallel_applies_create_one_leave(db: Session, employee):
+    # Wallet and policy rows exist up front so the threads only race on the leave insert
+    ensure_wallet_for_employee(db, employee.id, 2026)
+    get_or_create_policy_settings(db, 2026)
+    db.commit()
+    # Separate connections per thread (the shared test engine uses a single connection)
+    thread_engine = create_engine(db.get_bind().url, poolclass=NullPool, connect_args={"timeout": 30})
+    ThreadSession = sessionmaker(bind=thread_engine, autoflush=False)
+    employee_id = employee.id
+    barrier = threading.Barrier(4)
+    outcomes = []
+
+    def _apply():
+        session = ThreadSession()
+        try:
+            barrier.wait()
+            apply_leave(session, employee_id, LeaveType.CL, date(2026, 11, 2), date(2026, 11, 3))
+            outcomes.append(201)
+        except HTTPException as exc:
+            outcomes.append(exc.status_code)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=_apply) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    thread_engine.dispose()
+
+    assert sorted(outcomes) == [201, 409, 409, 409]
+    db.expire_all()
+    assert db.query(LeaveRequest).filter(LeaveRequest.employee_id == employee_id).count() == 1
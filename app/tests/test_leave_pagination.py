@@ -0,0 +1,149 @@
+"""
+Tests for keyset pagination and delta sync of leave listings
+"""
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.db.keyset import decode_cursor, encode_cursor
+from app.models.employee import Role
+from app.models.leave import LeaveRequest, LeaveStatus, LeaveType
+from app.services.leave_service import list_leaves, list_pending_for_approver
+
+BASE = datetime(2026, 10, 1, 9, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def team(db: Session, make_employee):
+    """An ADMIN (sees every leave and approval) and three staff reporting to them"""
+    admin = make_employee("PADM", role=Role.ADMIN, join_date=date(2020, 1, 1), password="admpass123")
+    staff = [make_employee(f"PEMP{i}", manager=admin, join_date=date(2020, 1, 1)) for i in range(3)]
+    db.commit()
+    return admin, staff
+
+
+def _leaves(db: Session, staff, count):
+    """count leaves spread over staff; applied_at repeats in pairs to exercise id tie-breaks"""
+    leaves = []
+    for i in range(count):
+        leave = LeaveRequest(
+            employee_id=staff[i % len(staff)].id,
+            leave_type=LeaveType.LWP,
+            from_date=date(2026, 11, 2) + timedelta(days=i),
+            to_date=date(2026, 11, 2) + timedelta(days=i),
+            status=LeaveStatus.PENDING,
+            computed_days=Decimal("1"),
+            applied_at=BASE + timedelta(hours=i // 2),
+        )
+        db.add(leave)
+        leaves.append(leave)
+    db.commit()
+    return leaves
+
+
+def _walk(fetch, limit):
+    ids, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = fetch(cursor=cursor, limit=limit)
+        ids.extend(r.id for r in rows)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+def test_pages_cover_every_row_once_in_order(db: Session, team):
+    admin, staff = team
+    leaves = _leaves(db, staff, 7)
+    newest_first = [lr.id for lr in sorted(leaves, key=lambda lr: (lr.applied_at, lr.id), reverse=True)]
+
+    ids, pages = _walk(lambda **kw: list_leaves(db, admin, **kw), limit=3)
+    assert ids == newest_first and pages == 3
+
+    ids, pages = _walk(lambda **kw: list_pending_for_approver(db, admin, **kw), limit=2)
+    assert ids == newest_first[::-1] and pages == 4
+
+    # No limit: everything, no cursor
+    rows, cursor = list_leaves(db, admin)
+    assert [r.id for r in rows] == newest_first and cursor is None
+
+
+def test_rows_inserted_mid_walk_do_not_shift_pages(db: Session, team):
+    admin, staff = team
+    leaves = _leaves(db, staff, 4)
+    first, cursor = list_leaves(db, admin, limit=2)
+    newer = LeaveRequest(
+        employee_id=staff[1].id, leave_type=LeaveType.LWP, from_date=date(2026, 12, 1), to_date=date(2026, 12, 1),
+        status=LeaveStatus.PENDING, computed_days=Decimal("1"), applied_at=BASE + timedelta(days=1),
+    )
+    db.add(newer)
+    db.commit()
+
+    second, cursor = list_leaves(db, admin, cursor=cursor, limit=2)
+    assert cursor is None
+    assert {r.id for r in first + second} == {lr.id for lr in leaves}
+
+
+def test_updated_since_returns_only_changes(db: Session, team):
+    admin, staff = team
+    leaves = _leaves(db, staff, 3)
+    db.query(LeaveRequest).update({LeaveRequest.updated_at: BASE}, synchronize_session=False)
+    db.query(LeaveRequest).filter(LeaveRequest.id == leaves[1].id).update(
+        {LeaveRequest.updated_at: BASE + timedelta(days=2)}, synchronize_session=False
+    )
+    db.commit()
+
+    since = BASE + timedelta(days=1)
+    rows, _ = list_leaves(db, admin, updated_since=since)
+    assert [r.id for r in rows] == [leaves[1].id]
+    # Naive timestamps are UTC
+    rows, _ = list_pending_for_approver(db, admin, updated_since=since.replace(tzinfo=None))
+    assert [r.id for r in rows] == [leaves[1].id]
+
+
+def test_updated_since_keeps_rows_from_the_same_second(db: Session, team):
+    """A server-default timestamp (no fraction on SQLite) equal to updated_since is included"""
+    admin, staff = team
+    leaves = _leaves(db, staff, 2)
+    db.refresh(leaves[0])
+    since = leaves[0].updated_at.replace(microsecond=0, tzinfo=timezone.utc)
+
+    rows, _ = list_leaves(db, admin, updated_since=since)
+    assert leaves[0].id in {r.id for r in rows}
+    rows, _ = list_pending_for_approver(db, admin, updated_since=since)
+    assert leaves[0].id in {r.id for r in rows}
+
+
+def test_cursor_round_trip_and_garbage():
+    ts = datetime(2026, 10, 1, 9, 0, 0, 123456)
+    assert decode_cursor(encode_cursor(ts, 42)) == (ts, 42)
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def test_list_endpoint_pages_with_bounded_queries(client, db: Session, team, query_budget):
+    admin, staff = team
+    _leaves(db, staff, 5)
+    token = client.post("/api/v1/auth/login", json={"emp_code": "PADM", "password": "admpass123"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/api/v1/leaves/list", params={"limit": 3}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total"] == 3 and data["next_cursor"]
+    assert all(item["employee"]["emp_code"].startswith("PEMP") for item in data["items"])
+    assert all(item["employee"]["reporting_manager_id"] == admin.id for item in data["items"])
+
+    # Page query, one IN query for reporting managers; the mostly-NULL actors add nothing
+    with query_budget(6):
+        response = client.get(
+            "/api/v1/leaves/list", params={"limit": 3, "cursor": data["next_cursor"]}, headers=headers
+        )
+    data = response.json()
+    assert data["total"] == 2 and data["next_cursor"] is None
+
+    response = client.get("/api/v1/leaves/list", params={"cursor": "%%%"}, headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
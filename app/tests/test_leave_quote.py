@@ -0,0 +1,117 @@
+"""
+Tests for the side-effect-free batch leave quote
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.security import create_access_token
+from app.db.query_stats import count_queries
+from app.models.audit_log import AuditLog
+from app.models.holiday import Holiday
+from app.models.leave import LeaveBalance, LeaveDuration, LeaveRequest, LeaveStatus, LeaveType
+from app.models.policy import PolicySetting
+from app.services.leave_service import apply_leave, quote_leaves
+
+
+@pytest.fixture(autouse=True)
+def tuesday_holiday(db: Session):
+    """2026-11-10 is a holiday for every candidate below"""
+    db.add(Holiday(year=2026, date=date(2026, 11, 10), name="Tuesday holiday", active=True))
+    db.commit()
+
+
+CANDIDATES = [
+    # Fri - Mon around a Sunday: sandwich charges the Sunday
+    {"leave_type": LeaveType.CL, "from_date": date(2026, 11, 6), "to_date": date(2026, 11, 9)},
+    # Starts on the Tuesday holiday: edge days are not sandwiched
+    {"leave_type": LeaveType.SL, "from_date": date(2026, 11, 10), "to_date": date(2026, 11, 11)},
+    {
+        "leave_type": LeaveType.SL,
+        "from_date": date(2026, 11, 12),
+        "to_date": date(2026, 11, 12),
+        "duration": LeaveDuration.HALF_DAY,
+    },
+    # Longer than the PL wallet: the excess is LWP
+    {"leave_type": LeaveType.PL, "from_date": date(2026, 11, 16), "to_date": date(2026, 12, 5)},
+    {"leave_type": LeaveType.LWP, "from_date": date(2026, 12, 7), "to_date": date(2026, 12, 8)},
+]
+
+
+def _row_counts(db: Session):
+    return [db.query(model).count() for model in (LeaveRequest, AuditLog, LeaveBalance, PolicySetting)]
+
+
+def test_quote_matches_apply_without_writes(db: Session, employee):
+    quotes = quote_leaves(db, employee.id, CANDIDATES)
+    db.rollback()
+    assert _row_counts(db) == [0, 0, 0, 0]
+    assert all(q["valid"] for q in quotes), quotes
+
+    assert quotes[0]["computed_days"] == 4.0
+    assert quotes[0]["sandwich_dates"] == [date(2026, 11, 8)]
+    assert quotes[1]["computed_days"] == 1.0 and quotes[1]["sandwich_dates"] == []
+    assert quotes[2]["half_day_session"] is not None
+
+    # Pending leaves do not consume the wallet, so applying in turn gives the same split
+    for candidate, quote in zip(CANDIDATES, quotes):
+        leave = apply_leave(db, employee.id, **candidate)
+        assert leave.leave_type == quote["effective_leave_type"]
+        assert float(leave.computed_days) == quote["computed_days"]
+        assert (float(leave.paid_days), float(leave.lwp_days)) == (quote["paid_days"], quote["lwp_days"])
+        assert leave.auto_lwp_reason == quote["auto_lwp_reason"]
+
+
+def test_quote_reports_violations_per_candidate(db: Session, employee):
+    db.add(LeaveRequest(
+        employee_id=employee.id,
+        leave_type=LeaveType.CL,
+        from_date=date(2026, 11, 18),
+        to_date=date(2026, 11, 18),
+        computed_days=1,
+        status=LeaveStatus.PENDING,
+    ))
+    db.commit()
+    quotes = quote_leaves(db, employee.id, [
+        {"leave_type": LeaveType.CL, "from_date": date(2026, 11, 17), "to_date": date(2026, 11, 19)},
+        {"leave_type": LeaveType.CL, "from_date": date(2026, 11, 20), "to_date": date(2026, 11, 19)},
+        {"leave_type": LeaveType.RH, "from_date": date(2026, 11, 20), "to_date": date(2026, 11, 20)},
+        {"leave_type": LeaveType.SL, "from_date": date(2026, 11, 8), "to_date": date(2026, 11, 8)},
+        {"leave_type": LeaveType.CL, "from_date": date(2026, 11, 20), "to_date": date(2026, 11, 20)},
+    ])
+    assert [(q["valid"], q.get("error_status")) for q in quotes] == [
+        (False, 409),  # overlaps the pending CL
+        (False, 400),  # date order
+        (False, 400),  # not an RH date
+        (False, 400),  # Sunday only: no valid day
+        (True, None),
+    ]
+    assert "overlaps" in quotes[0]["error_detail"]
+
+
+def test_quote_batch_shares_context(db: Session, employee):
+    quote_leaves(db, employee.id, CANDIDATES[:1])  # warm the work calendar
+    with count_queries() as one:
+        quote_leaves(db, employee.id, CANDIDATES[:1])
+    with count_queries() as many:
+        quote_leaves(db, employee.id, CANDIDATES * 4)
+    # Employee, policy, wallet and existing leaves load once per batch
+    assert len(many) == len(one)
+
+
+def test_quote_endpoint(client, db: Session, employee):
+    token = create_access_token({"sub": str(employee.id), "emp_code": employee.emp_code, "role": employee.role})
+    response = client.post(
+        "/api/v1/leaves/quote",
+        json={"candidates": [
+            {"leave_type": "CL", "from_date": "2026-11-06", "to_date": "2026-11-09"},
+            {"leave_type": "CL", "from_date": "2026-11-09", "to_date": "2026-11-06"},
+        ]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200, response.text
+    items = response.json()["items"]
+    assert items[0]["valid"] and items[0]["computed_days"] == 4.0
+    assert not items[1]["valid"] and items[1]["error_status"] == 400
+    assert _row_counts(db) == [0, 0, 0, 0]
@@ -0,0 +1,26 @@
+"""
+Tests that the alembic migration scripts load (alembic upgrade head runs on deploy)
+"""
+import py_compile
+from pathlib import Path
+
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+ROOT = Path(__file__).resolve().parents[2]
+VERSIONS = sorted((ROOT / "alembic" / "versions").glob("*.py"))
+
+
+@pytest.mark.parametrize("path", VERSIONS, ids=[p.name for p in VERSIONS])
+def test_migration_compiles(path: Path):
+    py_compile.compile(str(path), doraise=True)
+
+
+def test_revision_graph_has_one_head():
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    script = ScriptDirectory.from_config(config)
+    assert len(script.get_heads()) == 1
+    # Every revision loads and links back to the base
+    assert len(list(script.walk_revisions())) == len(VERSIONS)
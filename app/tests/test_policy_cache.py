@@ -0,0 +1,63 @@
+"""
+Tests for the per-year policy snapshot cache
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.query_stats import count_queries
+from app.models.department import Department
+from app.models.employee import Employee, Role
+from app.models.policy import PolicySetting
+from app.services.accrual_service import run_monthly_accrual
+from app.services.policy_cache import policy_cache
+from app.services.policy_service import update_policy_settings
+
+
+def _policy_statements(statements):
+    return [s for s in statements if "policy_settings" in s.lower()]
+
+
+def test_snapshot_cached_and_read_only(db: Session):
+    first = policy_cache.get(db, 2026)
+    # No row yet: defaults are served without creating one
+    assert first.annual_cl == 5 and first.id is None
+    assert db.query(PolicySetting).count() == 0
+
+    with count_queries() as statements:
+        assert policy_cache.get(db, 2026) is first
+    assert statements == []
+    with pytest.raises(AttributeError):
+        first.annual_cl = 9
+    assert getattr(first, "not_a_column", "fallback") == "fallback"
+
+
+def test_update_invalidates_year(db: Session):
+    assert policy_cache.get(db, 2026).wfh_max_days == 12
+    other_year = policy_cache.get(db, 2027)
+
+    update_policy_settings(db, 2026, wfh_max_days=20)
+    assert policy_cache.get(db, 2026).wfh_max_days == 20
+    assert policy_cache.get(db, 2027) is other_year
+
+
+def test_accrual_run_loads_policy_once(db: Session):
+    dept = Department(name="Ops", active=True)
+    db.add(dept)
+    db.flush()
+    for i in range(5):
+        db.add(Employee(
+            emp_code=f"ACC{i}", name=f"Acc {i}", role=Role.EMPLOYEE,
+            department_id=dept.id, join_date=date(2025, 1, 1),
+        ))
+    db.add(Employee(emp_code="ADM", name="Admin", role=Role.ADMIN, department_id=dept.id, join_date=date(2025, 1, 1)))
+    db.commit()
+    actor = db.query(Employee).filter(Employee.emp_code == "ADM").one()
+
+    with count_queries() as statements:
+        result = run_monthly_accrual(db, 2026, 3, actor.id)
+    assert result["credited_count"] == 6
+    # One policy load for the whole run, no schema PRAGMA per call
+    assert len(_policy_statements(statements)) == 1
+    assert not [s for s in statements if s.upper().startswith("PRAGMA")]
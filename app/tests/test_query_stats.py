@@ -0,0 +1,198 @@
+"""
+Tests for per-request query counting, N+1 detection and query budgets
+"""
+import logging
+import pytest
+from fastapi import status
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+from decimal import Decimal
+from app.models.department import Department
+from app.models.employee import Employee, Role
+from app.models.leave import LeaveBalance, LeaveRequest, LeaveStatus, LeaveType
+from app.models.role import RoleModel
+from app.core.security import hash_password
+from app.db.query_stats import RequestQueryStats, log_probable_n_plus_one
+
+
+@pytest.fixture
+def test_employee(db: Session):
+    """Create a test employee"""
+    dept = Department(name="IT", active=True)
+    db.add(dept)
+    db.commit()
+    employee = Employee(
+        emp_code="EMP001",
+        name="Test Employee",
+        role=Role.EMPLOYEE,
+        department_id=dept.id,
+        password_hash=hash_password("testpass123"),
+        join_date=date.today(),
+        active=True
+    )
+    db.add(employee)
+    db.commit()
+    db.refresh(employee)
+    return employee
+
+
+@pytest.fixture
+def manager_and_reportee(db: Session, test_employee):
+    """MGR001 (MANAGER) with test_employee reporting to them, a CL balance and two pending CL requests"""
+    for name, rank in (("MANAGER", 4), ("EMPLOYEE", 6)):
+        db.add(RoleModel(name=name, role_rank=rank, wfh_enabled=True, is_active=True))
+    manager = Employee(
+        emp_code="MGR001",
+        name="Manager",
+        role=Role.MANAGER,
+        department_id=test_employee.department_id,
+        password_hash=hash_password("mgrpass123"),
+        join_date=date.today(),
+        active=True
+    )
+    db.add(manager)
+    db.flush()
+    test_employee.reporting_manager_id = manager.id
+    db.add(LeaveBalance(
+        employee_id=test_employee.id,
+        year=date.today().year,
+        leave_type=LeaveType.CL,
+        opening=Decimal("0"),
+        accrued=Decimal("10.0"),
+        used=Decimal("0"),
+        remaining=Decimal("10.0"),
+        carry_forward=Decimal("0")
+    ))
+    pending = [
+        LeaveRequest(
+            employee_id=test_employee.id,
+            leave_type=LeaveType.CL,
+            from_date=date.today() + timedelta(days=offset),
+            to_date=date.today() + timedelta(days=offset),
+            reason="Pending leave",
+            status=LeaveStatus.PENDING,
+            computed_days=Decimal("1.0"),
+            paid_days=Decimal("0"),
+            lwp_days=Decimal("0")
+        )
+        for offset in (1, 2)
+    ]
+    db.add_all(pending)
+    db.commit()
+    return manager, pending
+
+
+def _auth_headers(client, emp_code="EMP001", password="testpass123"):
+    response = client.post("/api/v1/auth/login", json={"emp_code": emp_code, "password": password})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _next_working_day(start: date) -> date:
+    day = start
+    while day.weekday() == 6:  # Sunday
+        day += timedelta(days=1)
+    return day
+
+
+def test_server_timing_header(client):
+    """Every response reports DB time and statement count"""
+    response = client.get("/api/v1/health")
+
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert response.headers["server-timing"].endswith('desc="0 queries"')
+
+
+def test_attendance_today_query_budget(client, test_employee, query_budget):
+    """With the caller's principal cached, GET /attendance/today is a single SELECT"""
+    headers = _auth_headers(client)
+    client.get("/api/v1/attendance/today", headers=headers)  # warm principal cache
+
+    with query_budget(1):
+        response = client.get("/api/v1/attendance/today", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["server-timing"].endswith('desc="1 queries"')
+
+
+@pytest.mark.parametrize("path, login, budget", [
+    ("/api/v1/leaves/list", ("EMP001", "testpass123"), 2),
+    ("/api/v1/leaves/pending", ("MGR001", "mgrpass123"), 3),
+    (f"/api/v1/leaves/balance/me?year={date.today().year}", ("EMP001", "testpass123"), 2),
+])
+def test_leave_read_query_budgets(client, manager_and_reportee, query_budget, path, login, budget):
+    """Leave list, the pending queue and the wallet balance stay within a fixed statement count"""
+    headers = _auth_headers(client, *login)
+    client.get(path, headers=headers)  # warm principal and policy caches
+
+    with query_budget(budget):
+        response = client.get(path, headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def _apply(client, headers, day: date):
+    return client.post(
+        "/api/v1/leaves/apply",
+        json={"leave_type": "CL", "from_date": str(day), "to_date": str(day), "reason": "Budget"},
+        headers=headers,
+    )
+
+
+def test_leave_apply_query_budget(client, manager_and_reportee, query_budget):
+    """POST /leaves/apply with the wallet already synced for the year"""
+    headers = _auth_headers(client)
+    first = _next_working_day(date.today() + timedelta(days=7))
+    second = _next_working_day(first + timedelta(days=1))
+    assert _apply(client, headers, first).status_code == status.HTTP_201_CREATED  # warm caches, sync wallet
+
+    with query_budget(10):
+        response = _apply(client, headers, second)
+
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+def test_leave_approve_query_budget(client, manager_and_reportee, query_budget):
+    """POST /leaves/{id}/approve with the wallet already synced for the year"""
+    _, (first, second) = manager_and_reportee
+    headers = _auth_headers(client, "MGR001", "mgrpass123")
+
+    def approve(leave):
+        return client.post(f"/api/v1/leaves/{leave.id}/approve", json={"remarks": "OK"}, headers=headers)
+
+    assert approve(first).status_code == status.HTTP_200_OK  # warm caches, sync wallet
+
+    with query_budget(25):
+        response = approve(second)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_punch_in_and_out_query_budgets(client, test_employee, query_budget):
+    """POST /attendance/punch-in then /attendance/punch-out"""
+    headers = _auth_headers(client)
+    client.get("/api/v1/attendance/today", headers=headers)  # warm principal cache
+    geo = {"lat": 28.6139, "lng": 77.2090, "source": "WEB"}
+
+    with query_budget(8):
+        response = client.post("/api/v1/attendance/punch-in", json=geo, headers=headers)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    with query_budget(5):
+        response = client.post("/api/v1/attendance/punch-out", json=geo, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_repeated_statement_logged_as_n_plus_one(caplog):
+    """A statement shape repeated past the threshold is logged once with its count"""
+    stats = RequestQueryStats()
+    for _ in range(6):
+        stats.record("SELECT * FROM employees WHERE employees.id = ?", 0.1)
+    stats.record("SELECT * FROM leave_requests", 0.1)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.query_stats"):
+        log_probable_n_plus_one(stats, "GET /api/v1/leaves/list", threshold=5)
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert len(messages) == 1
+    assert "executed 6 times (7 queries total)" in messages[0]
+    assert "employees.id" in messages[0]
@@ -0,0 +1,93 @@
+"""
+Tests for read-replica routing (two SQLite files stand in for primary and replica)
+"""
+import os
+import tempfile
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, MetaData, String, Table, create_engine, text, update
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.middleware import ReadYourWritesMiddleware
+from app.db import session as db_session
+from app.db.read_routing import ReadOnlySessionError, recent_writers
+
+
+update_marker = update(Table("marker", MetaData(), Column("name", String))).values(name="written")
+
+
+def _marked_sessionmaker(path: str, name: str):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS marker (name TEXT)"))
+        conn.execute(text("DELETE FROM marker"))
+        conn.execute(text("INSERT INTO marker (name) VALUES (:n)"), {"n": name})
+    return engine, sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def routed_client(monkeypatch):
+    tmp = tempfile.gettempdir()
+    paths = [os.path.join(tmp, f"acs_hrms_{role}_{os.getpid()}.db") for role in ("primary", "replica")]
+    primary_engine, primary = _marked_sessionmaker(paths[0], "primary")
+    replica_engine, replica = _marked_sessionmaker(paths[1], "replica")
+    monkeypatch.setattr(db_session, "SessionLocal", primary)
+    monkeypatch.setattr(db_session, "ReadSessionLocal", replica)
+    recent_writers.clear()
+
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.get("/which")
+    def which(db: Session = Depends(db_session.get_read_db)):
+        return {"db": db.execute(text("SELECT name FROM marker")).scalar()}
+
+    @app.post("/write")
+    def write():
+        return {"ok": True}
+
+    @app.post("/write-through-read-session")
+    def write_through_read_session(db: Session = Depends(db_session.get_read_db)):
+        db.execute(update_marker)
+        return {"ok": True}
+
+    yield TestClient(app)
+    recent_writers.clear()
+    primary_engine.dispose()
+    replica_engine.dispose()
+    for path in paths:
+        os.remove(path)
+
+
+def test_reads_go_to_replica(routed_client):
+    """Without a recent write, read-only endpoints use the replica"""
+    resp = routed_client.get("/which", headers={"Authorization": "Bearer token-a"})
+    assert resp.json() == {"db": "replica"}
+
+
+def test_read_your_writes_sticks_to_primary(routed_client, monkeypatch):
+    """After a caller's own write their reads hit the primary; other callers stay on the replica"""
+    me = {"Authorization": "Bearer token-a"}
+    other = {"Authorization": "Bearer token-b"}
+
+    assert routed_client.post("/write", headers=me).status_code == 200
+    assert routed_client.get("/which", headers=me).json() == {"db": "primary"}
+    assert routed_client.get("/which", headers=other).json() == {"db": "replica"}
+
+    # Once the stickiness window has passed the caller is back on the replica
+    monkeypatch.setattr(recent_writers, "window_seconds", 0)
+    assert routed_client.get("/which", headers=me).json() == {"db": "replica"}
+
+
+def test_failed_write_does_not_stick(routed_client):
+    """Only successful writes pin the caller to the primary"""
+    me = {"Authorization": "Bearer token-a"}
+    assert routed_client.post("/missing", headers=me).status_code == 404
+    assert routed_client.get("/which", headers=me).json() == {"db": "replica"}
+
+
+def test_read_session_refuses_writes(routed_client):
+    """get_read_db sessions reject DML on either database, so a writing endpoint fails in tests too"""
+    with pytest.raises(ReadOnlySessionError):
+        routed_client.post("/write-through-read-session", headers={"Authorization": "Bearer token-a"})
+    assert routed_client.get("/which", headers={"Authorization": "Bearer token-a"}).json() == {"db": "replica"}
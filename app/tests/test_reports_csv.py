@@ -305,6 +305,21 @@ def test_export_writes_audit_log(client, db, hr_employee):
     assert audit_log.meta_json["to_date"] == str(today)
 
 
+@pytest.mark.parametrize("report", ["attendance", "leaves", "compoff"])
+def test_exports_audit_through_primary_not_read_session(client, db, hr_employee, report):
+    """Exports read through get_read_db (write-refusing in tests, as on a replica) and audit through the primary"""
+    hr_token = get_auth_token(client, "HR001", "hrpass123")
+    today = date.today()
+
+    response = client.get(
+        f"/api/v1/reports/{report}.csv?from={today}&to={today}",
+        headers={"Authorization": f"Bearer {hr_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    audit_log = db.query(AuditLog).filter(AuditLog.action == "REPORT_EXPORT").one()
+    assert audit_log.meta_json["report_type"] == report
+
+
 def test_export_filters(client, db, hr_employee, test_employee, reportee_employee):
     """Test export filters (employee_id, department_id, status, leave_type)"""
     hr_token = get_auth_token(client, "HR001", "hrpass123")
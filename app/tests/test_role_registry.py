@@ -0,0 +1,80 @@
+"""
+Tests for the in-process role registry
+"""
+import pytest
+from datetime import date
+from sqlalchemy.orm import Session
+from app.models.department import Department
+from app.models.employee import Employee, Role
+from app.core.config import settings
+from app.models.role import RoleModel
+from app.schemas.role import RoleCreate, RoleUpdate
+from app.services.role_registry import role_registry
+from app.services.role_service import create_role, update_role
+
+
+@pytest.fixture
+def admin_user(db: Session):
+    """Actor for role writes (audit rows need an actor)"""
+    dept = Department(name="Administration", active=True)
+    db.add(dept)
+    db.flush()
+    admin = Employee(
+        emp_code="ADM001",
+        name="Admin",
+        role=Role.ADMIN,
+        department_id=dept.id,
+        join_date=date.today(),
+        active=True
+    )
+    db.add(admin)
+    db.commit()
+    db.refresh(admin)
+    return admin
+
+
+def test_registry_loads_once_and_falls_back(db: Session):
+    """Ranks come from one load of the roles table; unknown roles use the default map"""
+    db.add(RoleModel(name="MANAGER", role_rank=7, wfh_enabled=True, is_active=True))
+    db.commit()
+
+    assert role_registry.rank_for(db, "MANAGER") == 7
+    before = role_registry.stats()
+    assert role_registry.rank_for(db, "MANAGER") == 7
+    assert role_registry.rank_for(db, "VP") == 3  # not in table: DEFAULT_ROLE_RANKS
+    assert role_registry.rank_for(db, "CONTRACTOR") == 99
+    after = role_registry.stats()
+
+    assert after["misses"] == before["misses"]
+    assert after["hits"] == before["hits"] + 3
+
+
+def test_registry_invalidated_by_role_writes(db: Session, admin_user):
+    """create_role and update_role bump the version so new ranks are visible immediately"""
+    assert role_registry.rank_for(db, "AUDITOR") == 99
+    version = role_registry.stats()["version"]
+
+    role = create_role(db, RoleCreate(name="AUDITOR", role_rank=6, wfh_enabled=False, is_active=True), actor_id=admin_user.id)
+    assert role_registry.stats()["version"] == version + 1
+    assert role_registry.rank_for(db, "AUDITOR") == 6
+
+    update_role(db, role.id, RoleUpdate(role_rank=4), actor_id=admin_user.id)
+    assert role_registry.rank_for(db, "AUDITOR") == 4
+
+    update_role(db, role.id, RoleUpdate(is_active=False), actor_id=admin_user.id)
+    assert role_registry.rank_for(db, "AUDITOR") == 99
+
+
+def test_registry_reloads_after_ttl(db: Session, monkeypatch):
+    """Edits made outside this process (scripts, other workers) show up once the TTL passes"""
+    role = RoleModel(name="MANAGER", role_rank=7, wfh_enabled=True, is_active=True)
+    db.add(role)
+    db.commit()
+    assert role_registry.rank_for(db, "MANAGER") == 7
+
+    db.query(RoleModel).filter(RoleModel.id == role.id).update({"role_rank": 3})
+    db.commit()
+    assert role_registry.rank_for(db, "MANAGER") == 7  # still within the TTL
+
+    monkeypatch.setattr(settings, "ROLE_REGISTRY_TTL_SECONDS", 0)
+    assert role_registry.rank_for(db, "MANAGER") == 3
@@ -0,0 +1,58 @@
+"""
+Tests for the slow-query log
+"""
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.query_stats import begin_request, end_request
+from app.db.slow_query_log import fingerprint, normalize_statement, parameter_shape, slow_query_log
+
+
+def test_fingerprint_ignores_values_and_in_list_length():
+    """Same statement shape -> same fingerprint regardless of literals and IN-list size"""
+    a = "SELECT * FROM employees WHERE id IN (?, ?, ?) AND active = 1"
+    b = "SELECT *\n  FROM employees WHERE id IN (?, ?) AND active = 0"
+    assert normalize_statement(a) == "SELECT * FROM employees WHERE id IN (?...) AND active = ?"
+    assert fingerprint(a) == fingerprint(b)
+    assert fingerprint("SELECT * FROM employees WHERE id = %(id_1)s") == fingerprint(
+        "SELECT * FROM employees WHERE id = $1"
+    )
+
+
+def test_parameter_shape_has_types_not_values():
+    assert parameter_shape({"emp_code": "E1", "id": 3}, False) == "{emp_code: str, id: int}"
+    assert parameter_shape([(1, "x"), (2, "y")], True) == "executemany[2] x (int, str)"
+
+
+def test_slow_statement_recorded_with_caller_and_plan(db, monkeypatch):
+    """Statements over the threshold are aggregated with caller and SQLite query plan"""
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0.000001)
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN", True)
+    slow_query_log.clear()
+    try:
+        for emp_id in (1, 2):
+            db.execute(text("SELECT id FROM employees WHERE id = :id"), {"id": emp_id}).all()
+        entry = next(q for q in slow_query_log.top(limit=50) if "FROM employees WHERE id = ?" in q["statement"])
+        assert entry["count"] == 2
+        assert entry["param_shape"] == "(int)"
+        assert entry["caller"].startswith("app.tests.test_slow_query_log.")
+        assert entry["plan"] and any("employees" in line for line in entry["plan"])
+    finally:
+        slow_query_log.clear()
+
+
+def test_request_stats_and_slow_log_share_one_timing(db, monkeypatch):
+    """Each statement is timed once; the request stats and the slow log see the same duration"""
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0.000001)
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN", False)
+    slow_query_log.clear()
+    stats, token = begin_request()
+    try:
+        db.execute(text("SELECT id FROM employees WHERE emp_code = :code"), {"code": "X"}).all()
+        entry = next(q for q in slow_query_log.top(limit=50) if "WHERE emp_code = ?" in q["statement"])
+        assert stats.count == 1
+        assert entry["count"] == 1
+        assert entry["total_ms"] == stats.total_ms
+    finally:
+        end_request(token)
+        slow_query_log.clear()
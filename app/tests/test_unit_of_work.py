@@ -0,0 +1,94 @@
+"""
+Tests for the single-commit unit of work used by apply/approve/punch
+"""
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.query_stats import count_commits
+from app.db.unit_of_work import after_commit, unit_of_work
+from app.models.attendance_daily import AttendanceDaily
+from app.models.attendance_session import AttendanceSession
+from app.models.audit_log import AuditLog
+from app.models.employee import Employee
+from app.models.leave import LeaveBalance, LeaveRequest, LeaveStatus, LeaveType
+from app.models.policy import PolicySetting
+from app.services import leave_service
+from app.services.attendance_session_service import punch_in
+from app.services.leave_service import apply_leave, approve_leave
+
+
+def _apply(db: Session, employee: Employee) -> LeaveRequest:
+    return apply_leave(db, employee.id, LeaveType.CL, date(2026, 11, 24), date(2026, 11, 25))
+
+
+def test_apply_commits_once_in_unit_of_work(db: Session, manager_and_employee):
+    _, emp = manager_and_employee
+    with count_commits() as before:
+        _apply(db, emp)
+    # wallet init, insert and audit each commit on their own
+    assert len(before) >= 3
+
+    db.query(LeaveRequest).delete()
+    db.query(AuditLog).delete()
+    db.commit()
+    with count_commits() as after:
+        with unit_of_work(db):
+            leave = _apply(db, emp)
+    assert len(after) == 1
+    assert leave.id is not None
+    assert db.query(AuditLog).filter(AuditLog.action == "LEAVE_APPLY", AuditLog.entity_id == leave.id).count() == 1
+
+
+def test_unit_of_work_rolls_back_everything_on_failure(db: Session, manager_and_employee, monkeypatch):
+    _, emp = manager_and_employee
+
+    def broken_audit(*args, **kwargs):
+        raise RuntimeError("audit store down")
+
+    monkeypatch.setattr(leave_service, "log_audit", broken_audit)
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db):
+            _apply(db, emp)
+    # Wallet rows and the policy default were part of the same transaction
+    assert [db.query(m).count() for m in (LeaveRequest, LeaveBalance, PolicySetting, AuditLog)] == [0, 0, 0, 0]
+
+
+def test_approve_commits_once_and_notifies_after_commit(db: Session, manager_and_employee, monkeypatch):
+    manager, emp = manager_and_employee
+    leave = _apply(db, emp)
+    notified = []
+    monkeypatch.setattr(leave_service, "_notify_leave_approved", lambda db, leave_id, uid: notified.append(leave_id))
+
+    with count_commits() as commits:
+        with unit_of_work(db):
+            approve_leave(db, leave.id, manager)
+            assert notified == []  # deferred until the commit
+    assert len(commits) == 1
+    assert notified == [leave.id]
+    db.refresh(leave)
+    assert leave.status == LeaveStatus.APPROVED
+
+
+def test_after_commit_dropped_on_rollback(db: Session):
+    calls = []
+    with pytest.raises(ValueError):
+        with unit_of_work(db):
+            after_commit(db, lambda: calls.append(1))
+            raise ValueError("boom")
+    assert calls == []
+    after_commit(db, lambda: calls.append(2))  # outside a unit of work: runs now
+    assert calls == [2]
+
+
+def test_punch_in_commits_once(db: Session, manager_and_employee):
+    _, emp = manager_and_employee
+    now = datetime(2026, 3, 4, 3, 30, tzinfo=timezone.utc)
+    with count_commits() as commits:
+        with unit_of_work(db):
+            session = punch_in(db, emp.id, now=now)
+    assert len(commits) == 1
+    assert db.query(AttendanceSession).filter(AttendanceSession.id == session.id).count() == 1
+    assert db.query(AttendanceDaily).filter(AttendanceDaily.user_id == emp.id).count() == 1
+    assert db.query(AuditLog).filter(AuditLog.action == "ATTENDANCE_SESSION_PUNCH_IN").count() == 1
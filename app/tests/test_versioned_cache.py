@@ -0,0 +1,45 @@
+"""
+Tests for the versioned TTL cache behind the role registry, policy and work calendar caches
+"""
+from app.core.versioned_cache import VersionedCache
+
+
+def test_hits_misses_and_ttl():
+    ttl = [60]
+    cache = VersionedCache(lambda: ttl[0])
+    loads = []
+
+    def load():
+        loads.append(1)
+        return len(loads)
+
+    assert cache.get("a", load) == 1
+    assert cache.get("a", load) == 1
+    ttl[0] = 0  # everything cached is now expired
+    assert cache.get("a", load) == 2
+    assert cache.stats() == {"version": 0, "entries": 1, "hits": 1, "misses": 2}
+
+
+def test_load_racing_invalidate_is_not_installed():
+    """A load that started before invalidate() returns its value but doesn't cache it"""
+    cache = VersionedCache(lambda: 60)
+
+    def stale_load():
+        cache.invalidate("a")  # a write lands while the load is in flight
+        return "stale"
+
+    assert cache.get("a", stale_load) == "stale"
+    assert cache.peek("a") is None
+    assert cache.get("a", lambda: "fresh") == "fresh"
+    assert cache.peek("a") == "fresh"
+
+
+def test_invalidate_one_key_or_all():
+    cache = VersionedCache(lambda: 60)
+    cache.get(2025, lambda: "a")
+    cache.get(2026, lambda: "b")
+    cache.invalidate(2025)
+    assert (cache.peek(2025), cache.peek(2026)) == (None, "b")
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["version"] == 2
@@ -0,0 +1,105 @@
+"""
+Tests for the request-scoped visibility scope
+"""
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.query_stats import count_queries
+from app.models.department import Department
+from app.models.employee import Employee, Role
+from app.models.leave import LeaveRequest, LeaveStatus, LeaveType
+from app.services.leave_service import list_leaves, list_pending_for_approver
+from app.services.role_registry import role_registry
+from app.services.visibility_scope import request_visibility_scope, resolve_visibility_scope
+
+
+@pytest.fixture
+def org(db: Session, make_employee):
+    """MD -> manager -> (report, report in other dept -> grand report); plus an unrelated employee"""
+    sales = Department(name="Sales", active=True)
+    ops = Department(name="Ops", active=True)
+    db.add_all([sales, ops])
+    db.flush()
+
+    md = make_employee("MD1", Role.MD, department=sales)
+    manager = make_employee("MGR1", Role.MANAGER, md, department=sales)
+    report = make_employee("EMP1", manager=manager, department=sales)
+    other_dept = make_employee("EMP2", manager=manager, department=ops)
+    grand = make_employee("EMP3", manager=other_dept, department=sales)
+    outsider = make_employee("EMP4", department=sales)
+    db.commit()
+    return SimpleNamespace(
+        md=md, manager=manager, report=report, other_dept=other_dept, grand=grand, outsider=outsider
+    )
+
+
+def _pending_leave(db: Session, employee: Employee) -> LeaveRequest:
+    leave = LeaveRequest(
+        employee_id=employee.id,
+        leave_type=LeaveType.CL,
+        from_date=date(2026, 3, 2),
+        to_date=date(2026, 3, 2),
+        computed_days=1,
+        status=LeaveStatus.PENDING,
+    )
+    db.add(leave)
+    db.commit()
+    return leave
+
+
+def test_manager_scope_views(db: Session, org):
+    scope = resolve_visibility_scope(db, org.manager)
+    subtree = {org.report.id, org.other_dept.id, org.grand.id}
+
+    assert not scope.all
+    assert scope.subordinate_ids == subtree
+    assert scope.employee_ids == subtree | {org.manager.id}
+    assert not scope.can_see(org.outsider.id)
+    # leaves: same-department subtree plus self
+    assert scope.leaves.employee_ids == {org.manager.id, org.report.id, org.grand.id}
+    # approvals: whole subtree, never self
+    assert scope.approvals.employee_ids == subtree
+
+
+def test_md_and_employee_scope_views(db: Session, org):
+    md_scope = resolve_visibility_scope(db, org.md)
+    assert md_scope.all and md_scope.leaves.all and md_scope.approvals.all
+    assert md_scope.subordinates == {}
+
+    emp_scope = resolve_visibility_scope(db, org.report)
+    assert emp_scope.employee_ids == {org.report.id}
+    assert emp_scope.leaves.employee_ids == {org.report.id}
+    assert emp_scope.approvals.employee_ids == frozenset()
+
+
+def test_scope_resolves_in_one_query(db: Session, org):
+    """Rank comes from the role registry; the subtree is a single recursive query"""
+    role_registry.ranks(db)
+    db.refresh(org.manager)
+    with count_queries() as statements:
+        resolve_visibility_scope(db, org.manager)
+    assert len(statements) == 1
+
+
+def test_scope_cached_on_request_state(db: Session, org):
+    request = SimpleNamespace(state=SimpleNamespace())
+    first = request_visibility_scope(request, db, org.manager)
+    with count_queries() as statements:
+        assert request_visibility_scope(request, db, org.manager) is first
+    assert statements == []
+    assert request.state.visibility_scope is first
+
+
+def test_list_functions_share_scope(db: Session, org):
+    for employee in (org.manager, org.report, org.other_dept, org.outsider):
+        _pending_leave(db, employee)
+    scope = resolve_visibility_scope(db, org.manager)
+
+    listed = {lr.employee_id for lr in list_leaves(db, org.manager, scope=scope)[0]}
+    assert listed == {org.manager.id, org.report.id}
+    pending = {lr.employee_id for lr in list_pending_for_approver(db, org.manager, scope=scope)[0]}
+    assert pending == {org.report.id, org.other_dept.id}
+    assert list_leaves(db, org.manager, employee_id=org.outsider.id, scope=scope) == ([], None)
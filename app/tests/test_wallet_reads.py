@@ -0,0 +1,65 @@
+"""
+Tests for side-effect-free wallet reads over the persisted accrual snapshot
+"""
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+from app.db.query_stats import count_commits, count_queries
+from app.models.leave import LeaveBalance, LeaveType, WALLET_LEAVE_TYPES
+from app.services import leave_wallet_service as wallet
+from app.services.leave_service import apply_leave
+
+
+def _writes(statements):
+    return [s for s in statements if not s.lstrip().upper().startswith("SELECT")]
+
+
+def test_read_with_current_snapshot_is_select_only(db: Session, employee):
+    employee_id = employee.id
+    wallet.ensure_wallet_for_employee(db, employee_id, 2026, as_of_date=date(2026, 3, 31))
+
+    with count_commits() as commits, count_queries() as statements:
+        balances = wallet.get_wallet_balances(db, employee_id, 2026, as_of_date=date(2026, 3, 15))
+    assert commits == [] and _writes(statements) == []
+    assert len(statements) == 1
+    by_type = {b.leave_type: b for b in balances}
+    assert set(by_type) == set(WALLET_LEAVE_TYPES)
+    assert by_type[LeaveType.CL].accrued == Decimal("1.5")  # Jan-Mar
+
+
+def test_stale_snapshot_brought_forward_in_memory_only(db: Session, employee):
+    wallet.ensure_wallet_for_employee(db, employee.id, 2026, as_of_date=date(2026, 3, 31))
+    cl = db.query(LeaveBalance).filter(LeaveBalance.leave_type == LeaveType.CL).one()
+    cl.used = Decimal("1")
+    cl.remaining = cl.opening + cl.accrued + cl.carry_forward - cl.used
+    db.commit()
+
+    with count_commits() as commits, count_queries() as statements:
+        balances = wallet.get_wallet_balances(db, employee.id, 2026, as_of_date=date(2026, 6, 10))
+    assert commits == [] and _writes(statements) == []
+    by_type = {b.leave_type: b for b in balances}
+    assert (by_type[LeaveType.CL].accrued, by_type[LeaveType.CL].remaining) == (Decimal("3.0"), Decimal("2.0"))
+
+    db.refresh(cl)
+    assert (cl.accrued, cl.accrued_as_of) == (Decimal("1.5"), date(2026, 3, 31))
+
+
+def test_missing_wallet_initialized_once(db: Session, employee):
+    with count_commits() as commits:
+        assert wallet.init_wallet_if_missing(db, employee.id, 2026) is True
+        assert wallet.init_wallet_if_missing(db, employee.id, 2026) is False
+    assert len(commits) == 1
+    assert db.query(LeaveBalance).filter(LeaveBalance.employee_id == employee.id).count() == len(WALLET_LEAVE_TYPES)
+    assert db.query(LeaveBalance).filter(LeaveBalance.accrued_as_of.is_(None)).count() == 0
+
+    # Reads of a year without rows fall back to the same lazy path
+    assert {b.leave_type for b in wallet.get_wallet_balances(db, employee.id, 2027)} == set(WALLET_LEAVE_TYPES)
+
+
+def test_apply_does_not_rewrite_existing_wallet(db: Session, employee):
+    wallet.ensure_wallet_for_employee(db, employee.id, 2026)
+    with count_queries() as statements:
+        apply_leave(db, employee.id, LeaveType.CL, date(2026, 11, 24), date(2026, 11, 24))
+    assert not [s for s in _writes(statements) if "leave_balances" in s]
@@ -0,0 +1,117 @@
+"""
+Tests for the precomputed work calendar
+"""
+import random
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.query_stats import count_queries
+from app.models.event import CompanyEvent
+from app.models.holiday import Holiday, RestrictedHoliday
+from app.services.attendance_daily_service import _working_days_back
+from app.services.holiday_service import create_holiday, update_holiday
+from app.services.leave_service import calculate_days_baseline, get_non_working_days_in_range
+from app.services.work_calendar import HOLIDAY, NON_WORKING, RH, work_calendar
+
+
+def _seed_calendar(db: Session, rng: random.Random, years=(2025, 2026)):
+    """Random active/inactive holidays, RHs and events; returns the active sets"""
+    holidays, events = set(), set()
+    for year in years:
+        days = [date(year, 1, 1) + timedelta(days=i) for i in range(365)]
+        for d in rng.sample(days, 15):
+            active = rng.random() > 0.2
+            db.add(Holiday(year=year, date=d, name=f"H {d}", active=active))
+            if active:
+                holidays.add(d)
+        for d in rng.sample(days, 5):
+            db.add(RestrictedHoliday(year=year, date=d, name=f"RH {d}", active=True))
+        for d in rng.sample(days, 6):
+            active = rng.random() > 0.2
+            db.add(CompanyEvent(year=year, date=d, name=f"E {d}", active=active))
+            if active:
+                events.add(d)
+    db.commit()
+    return holidays, events
+
+
+def _range(start: date, end: date):
+    d = start
+    while d <= end:
+        yield d
+        d += timedelta(days=1)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_range_queries_match_day_by_day(db: Session, seed: int):
+    rng = random.Random(seed)
+    holidays, events = _seed_calendar(db, rng)
+    for _ in range(40):
+        start = date(2025, 1, 1) + timedelta(days=rng.randrange(700))
+        end = start + timedelta(days=rng.randrange(60))
+        off = {d for d in _range(start, end) if d.weekday() == 6 or d in holidays}
+
+        expected_baseline = sum(1 for d in _range(start, end) if d not in off)
+        assert calculate_days_baseline(db, start, end) == expected_baseline
+        assert get_non_working_days_in_range(db, start, end, include_company_events=False) == off
+        assert get_non_working_days_in_range(db, start, end) == off | {
+            d for d in _range(start, end) if d in events
+        }
+
+
+def test_cached_year_answers_without_queries(db: Session):
+    _seed_calendar(db, random.Random(1), years=(2026,))
+    calculate_days_baseline(db, date(2026, 1, 1), date(2026, 12, 31))
+    with count_queries() as statements:
+        assert work_calendar.count(db, date(2026, 1, 1), date(2026, 12, 31), NON_WORKING) > 52
+        work_calendar.has(db, date(2026, 3, 1), RH)
+    assert statements == []
+
+
+def test_holiday_writes_invalidate(db: Session):
+    day = date(2026, 3, 4)  # Wednesday
+    assert calculate_days_baseline(db, day, day) == 1.0
+
+    holiday = create_holiday(db, 2026, day, "Holi")
+    assert work_calendar.has(db, day, HOLIDAY)
+    assert calculate_days_baseline(db, day, day) == 0.0
+
+    update_holiday(db, holiday.id, active=False)
+    assert calculate_days_baseline(db, day, day) == 1.0
+
+    # Direct ORM writes (seeds, scripts) invalidate too
+    db.add(CompanyEvent(year=2026, date=day, name="Offsite", active=True))
+    db.commit()
+    assert get_non_working_days_in_range(db, day, day) == {day}
+
+
+@pytest.mark.parametrize("model", [Holiday, CompanyEvent])
+def test_row_moved_to_another_year_invalidates_both(db: Session, model):
+    old_day, new_day = date(2025, 12, 31), date(2026, 1, 7)  # both Wednesdays
+    row = model(year=2025, date=old_day, name="Moved", active=True)
+    db.add(row)
+    db.commit()
+    assert get_non_working_days_in_range(db, old_day, new_day) == {old_day, date(2026, 1, 4)}
+
+    row.year, row.date = 2026, new_day
+    db.commit()
+    assert get_non_working_days_in_range(db, old_day, new_day) == {date(2026, 1, 4), new_day}
+
+
+def test_rolled_back_write_not_cached(db: Session):
+    day = date(2026, 3, 4)
+    db.add(Holiday(year=2026, date=day, name="Draft", active=True))
+    db.flush()
+    assert work_calendar.has(db, day, HOLIDAY)  # same transaction sees its own row
+    db.rollback()
+    assert not work_calendar.has(db, day, HOLIDAY)
+
+
+def test_working_days_back_across_year_boundary(db: Session):
+    db.add(Holiday(year=2026, date=date(2026, 1, 2), name="Day after", active=True))
+    db.commit()
+    days = _working_days_back(db, date(2026, 1, 3), 4)
+    # Jan 3 (Sat), Jan 2 holiday, Jan 1 (Thu), Dec 31 (Wed), Dec 30 (Tue)
+    assert days == [date(2025, 12, 30), date(2025, 12, 31), date(2026, 1, 1), date(2026, 1, 3)]
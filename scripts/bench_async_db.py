@@ -0,0 +1,104 @@
+"""
+Benchmark: p50/p95/p99 latency of hot read endpoints under concurrent load,
+blocking sync DB path (pre-port) vs AsyncSession path (get_async_db).
+
+Runs in-process against the configured DATABASE_URL (use a PostgreSQL copy for
+realistic network latency; SQLite shows the shape but little absolute difference).
+
+Usage:
+  python scripts/bench_async_db.py --emp-code ADM-001 --requests 500 --concurrency 50
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root so app is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.db.pool_metrics import percentile
+from app.core.deps import get_db, get_current_user
+from app.core.security import create_access_token
+from app.db.session import SessionLocal
+from app.models.employee import Employee
+from app.schemas.attendance import SessionDto
+from app.services.attendance_session_service import get_today_session
+
+# Pre-port implementation of GET /attendance/today: sync Session queried from an async def route
+legacy_router = APIRouter()
+
+
+@legacy_router.get("/bench/legacy/attendance/today")
+async def legacy_today(
+    db: Session = Depends(get_db),
+    current_user: Employee = Depends(get_current_user),
+):
+    session = get_today_session(db, current_user.id)
+    return SessionDto.model_validate(session) if session else None
+
+
+app.include_router(legacy_router)
+
+
+def _token(emp_code: str) -> str:
+    db = SessionLocal()
+    try:
+        emp = db.query(Employee).filter(Employee.emp_code == emp_code).first()
+        if not emp:
+            raise SystemExit(f"Employee {emp_code} not found")
+        return create_access_token({"sub": str(emp.id), "emp_code": emp.emp_code, "role": emp.role})
+    finally:
+        db.close()
+
+
+async def _run(path: str, token: str, total: int, concurrency: int):
+    latencies = []
+    sem = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with sem:
+                t0 = time.perf_counter()
+                resp = await client.get(path, headers={"Authorization": f"Bearer {token}"})
+                latencies.append((time.perf_counter() - t0) * 1000.0)
+                if resp.status_code >= 400:
+                    raise RuntimeError(f"{path} -> {resp.status_code}: {resp.text[:200]}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+    return latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync vs async DB path latency benchmark")
+    parser.add_argument("--emp-code", default="ADM-001", help="Employee to authenticate as")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent in-flight requests")
+    args = parser.parse_args()
+
+    token = _token(args.emp_code)
+    scenarios = [
+        ("before (sync Session)", "/bench/legacy/attendance/today"),
+        ("after  (AsyncSession)", "/api/v1/attendance/today"),
+    ]
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    for label, path in scenarios:
+        latencies, elapsed = asyncio.run(_run(path, token, args.requests, args.concurrency))
+        latencies.sort()
+        print(
+            f"{label}: p50={statistics.median(latencies):.1f}ms "
+            f"p95={percentile(latencies, 95):.1f}ms p99={percentile(latencies, 99):.1f}ms "
+            f"throughput={len(latencies) / elapsed:.0f} req/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
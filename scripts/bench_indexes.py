@@ -0,0 +1,254 @@
+"""
+Benchmark: plans and latency of hot query shapes with and without the
+composite index pack (migration 040_composite_indexes).
+
+Builds a synthetic dataset (10k employees by default) in a scratch SQLite file,
+runs each query with the composite indexes present, then drops them and runs
+again. Prints the plan (EXPLAIN QUERY PLAN) and the mean time per query for
+both, so the plan change (SCAN / single-column index -> composite index) is
+visible per shape.
+
+Usage:
+  python scripts/bench_indexes.py --employees 10000 --repeat 200
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root so app is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, text
+
+from app.db.base import Base
+import app.models  # noqa: F401  (register all tables)
+from app.models.attendance_session import AttendanceSession, SessionStatus
+from app.models.audit_log import AuditLog
+from app.models.compoff import CompoffLedger, CompoffLedgerType
+from app.models.department import Department
+from app.models.employee import Employee
+from app.models.holiday import Holiday
+from app.models.leave import LeaveRequest, LeaveStatus, LeaveType
+from app.models.notification_device import NotificationDevice
+from app.models.wfh import WFHRequest, WFHStatus
+
+COMPOSITE_INDEXES = [
+    ("ix_attendance_sessions_employee_date_status", "attendance_sessions"),
+    ("ix_leave_requests_status_applied_at", "leave_requests"),
+    ("ix_employees_manager_active", "employees"),
+    ("ix_holidays_active_date", "holidays"),
+    ("ix_compoff_ledger_employee_type_expires", "compoff_ledger"),
+    ("ix_wfh_requests_employee_status_date", "wfh_requests"),
+    ("ix_notification_devices_user_active", "notification_devices"),
+    ("ix_audit_logs_entity", "audit_logs"),
+]
+
+# (label, SQL, params factory) mirroring the service-layer filters
+QUERIES = [
+    (
+        "punch in/out open session",
+        "SELECT id FROM attendance_sessions WHERE employee_id = :emp AND work_date = :d AND status = 'OPEN'",
+        lambda r, n, today: {"emp": r.randint(1, n), "d": today - timedelta(days=r.randint(0, 29))},
+    ),
+    (
+        "pending approval queue",
+        "SELECT id FROM leave_requests WHERE status = 'PENDING' ORDER BY applied_at LIMIT 50",
+        lambda r, n, today: {},
+    ),
+    (
+        "direct reports",
+        "SELECT id FROM employees WHERE reporting_manager_id = :mgr AND active = 1",
+        lambda r, n, today: {"mgr": r.randint(1, n // 10)},
+    ),
+    (
+        "holidays in range",
+        "SELECT date FROM holidays WHERE active = 1 AND date >= :start AND date <= :end",
+        lambda r, n, today: {"start": today.replace(month=1, day=1), "end": today.replace(month=12, day=31)},
+    ),
+    (
+        "available comp-off credits",
+        "SELECT SUM(days) FROM compoff_ledger WHERE employee_id = :emp AND entry_type = 'CREDIT' AND expires_on >= :d",
+        lambda r, n, today: {"emp": r.randint(1, n), "d": today},
+    ),
+    (
+        "approved WFH in month",
+        "SELECT COUNT(*) FROM wfh_requests WHERE employee_id = :emp AND status = 'APPROVED' "
+        "AND request_date >= :start AND request_date <= :end",
+        lambda r, n, today: {"emp": r.randint(1, n), "start": today - timedelta(days=30), "end": today},
+    ),
+    (
+        "active devices of user",
+        "SELECT fcm_token FROM notification_devices WHERE user_id = :emp AND is_active = 1",
+        lambda r, n, today: {"emp": r.randint(1, n)},
+    ),
+    (
+        "audit history of entity",
+        "SELECT id FROM audit_logs WHERE entity_type = 'leave_request' AND entity_id = :eid ORDER BY created_at DESC",
+        lambda r, n, today: {"eid": r.randint(1, n * 5)},
+    ),
+]
+
+
+def _seed(engine, n: int, seed: int) -> None:
+    r = random.Random(seed)
+    today = date.today()
+    now = datetime.now(timezone.utc)
+    t0 = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(Department.__table__.insert(), [{"id": i, "name": f"Dept {i}"} for i in range(1, 21)])
+        conn.execute(
+            Employee.__table__.insert(),
+            [
+                {
+                    "id": i,
+                    "emp_code": f"E{i:06d}",
+                    "name": f"Employee {i}",
+                    "role": "EMPLOYEE" if i > n // 10 else "MANAGER",
+                    "department_id": 1 + i % 20,
+                    "reporting_manager_id": None if i == 1 else r.randint(1, max(1, min(i - 1, n // 10))),
+                    "join_date": date(2020, 1, 1),
+                    "active": r.random() > 0.05,
+                }
+                for i in range(1, n + 1)
+            ],
+        )
+        statuses = list(SessionStatus)
+        conn.execute(
+            AttendanceSession.__table__.insert(),
+            [
+                {
+                    "employee_id": emp,
+                    "work_date": today - timedelta(days=d),
+                    "punch_in_at": now - timedelta(days=d),
+                    "status": SessionStatus.OPEN if d == 0 else r.choice(statuses),
+                }
+                for emp in range(1, n + 1)
+                for d in range(30)
+            ],
+        )
+        leave_statuses = list(LeaveStatus)
+        leave_types = [LeaveType.CL, LeaveType.PL, LeaveType.SL]
+        conn.execute(
+            LeaveRequest.__table__.insert(),
+            [
+                {
+                    "employee_id": r.randint(1, n),
+                    "leave_type": r.choice(leave_types),
+                    "from_date": today + timedelta(days=k % 60),
+                    "to_date": today + timedelta(days=k % 60 + 1),
+                    "computed_days": 2,
+                    "status": LeaveStatus.PENDING if r.random() < 0.05 else r.choice(leave_statuses),
+                    "applied_at": now - timedelta(minutes=k),
+                }
+                for k in range(n * 5)
+            ],
+        )
+        conn.execute(
+            Holiday.__table__.insert(),
+            [
+                {"year": y, "date": date(y, 1, 1) + timedelta(days=k * 18), "name": f"Holiday {k}", "active": k % 7 != 0}
+                for y in range(today.year - 5, today.year + 1)
+                for k in range(20)
+            ],
+        )
+        conn.execute(
+            CompoffLedger.__table__.insert(),
+            [
+                {
+                    "employee_id": r.randint(1, n),
+                    "entry_type": CompoffLedgerType.CREDIT if k % 3 else CompoffLedgerType.DEBIT,
+                    "days": 1,
+                    "expires_on": today + timedelta(days=r.randint(-120, 60)) if k % 3 else None,
+                }
+                for k in range(n * 3)
+            ],
+        )
+        wfh_statuses = list(WFHStatus)
+        conn.execute(
+            WFHRequest.__table__.insert(),
+            [
+                {"employee_id": emp, "request_date": today - timedelta(days=d), "status": r.choice(wfh_statuses)}
+                for emp in range(1, n + 1)
+                for d in r.sample(range(120), 3)
+            ],
+        )
+        conn.execute(
+            NotificationDevice.__table__.insert(),
+            [
+                {"user_id": 1 + k % n, "fcm_token": f"token-{k}", "platform": "android", "is_active": k % 4 != 0}
+                for k in range(int(n * 1.2))
+            ],
+        )
+        entity_types = ["leave_request", "employee", "wfh_request", "attendance_session"]
+        conn.execute(
+            AuditLog.__table__.insert(),
+            [
+                {
+                    "actor_id": r.randint(1, n),
+                    "action": "UPDATE",
+                    "entity_type": entity_types[k % 4],
+                    "entity_id": r.randint(1, n * 5),
+                    "created_at": now - timedelta(minutes=k),
+                }
+                for k in range(n * 10)
+            ],
+        )
+        conn.execute(text("ANALYZE"))
+    print(f"Seeded {n} employees in {time.perf_counter() - t0:.1f}s")
+
+
+def _measure(engine, repeat: int, n: int, seed: int):
+    today = date.today()
+    results = {}
+    with engine.connect() as conn:
+        for label, sql, params in QUERIES:
+            r = random.Random(seed)
+            plan = [row[-1] for row in conn.execute(text("EXPLAIN QUERY PLAN " + sql), params(r, n, today))]
+            conn.execute(text(sql), params(r, n, today)).all()  # warm-up
+            t0 = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(text(sql), params(r, n, today)).all()
+            results[label] = ((time.perf_counter() - t0) * 1000.0 / repeat, plan)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Composite index pack benchmark (synthetic SQLite dataset)")
+    parser.add_argument("--employees", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=200, help="Executions per query shape")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(prefix="acs_hrms_bench_indexes_", suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(engine)
+        _seed(engine, args.employees, args.seed)
+
+        with_indexes = _measure(engine, args.repeat, args.employees, args.seed)
+        with engine.begin() as conn:
+            for name, _ in COMPOSITE_INDEXES:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            conn.execute(text("ANALYZE"))
+        without_indexes = _measure(engine, args.repeat, args.employees, args.seed)
+
+        print(f"\n{'query':32} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+        for label, _, _ in QUERIES:
+            before_ms, before_plan = without_indexes[label]
+            after_ms, after_plan = with_indexes[label]
+            print(f"{label:32} {before_ms:10.3f} {after_ms:10.3f} {before_ms / max(after_ms, 1e-9):7.1f}x")
+            print(f"    before: {' | '.join(before_plan)}")
+            print(f"    after:  {' | '.join(after_plan)}")
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
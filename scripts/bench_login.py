@@ -0,0 +1,77 @@
+"""
+Benchmark: POST /api/v1/auth/login throughput under concurrent load.
+
+Password verification runs on the bounded hashing pool (PASSWORD_HASH_WORKERS),
+so throughput should scale with cores instead of serialising on the event loop.
+Reports logins/sec and logins/sec per core. Tune ARGON2_* / BCRYPT_ROUNDS in .env
+to see the cost/throughput trade-off.
+
+Usage:
+  python scripts/bench_login.py --emp-code ADM-001 --password 'Secret@123' --requests 200 --concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root so app is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+
+from app.main import app
+from app.db.pool_metrics import percentile
+from app.core.config import settings
+
+
+async def _run(emp_code: str, password: str, total: int, concurrency: int):
+    latencies = []
+    sem = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with sem:
+                t0 = time.perf_counter()
+                resp = await client.post(
+                    "/api/v1/auth/login", json={"emp_code": emp_code, "password": password}
+                )
+                latencies.append((time.perf_counter() - t0) * 1000.0)
+                if resp.status_code != 200:
+                    raise RuntimeError(f"login -> {resp.status_code}: {resp.text[:200]}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+    return latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login throughput benchmark")
+    parser.add_argument("--emp-code", default="ADM-001", help="Employee to log in as")
+    parser.add_argument("--password", required=True, help="Password for --emp-code")
+    parser.add_argument("--requests", type=int, default=200, help="Total login requests")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent in-flight requests")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    workers = settings.PASSWORD_HASH_WORKERS or cores
+    print(
+        f"{args.requests} logins, concurrency {args.concurrency}, {cores} cores, {workers} hash workers "
+        f"(argon2 t={settings.ARGON2_TIME_COST} m={settings.ARGON2_MEMORY_COST_KIB}KiB "
+        f"p={settings.ARGON2_PARALLELISM}, bcrypt rounds={settings.BCRYPT_ROUNDS})"
+    )
+    latencies, elapsed = asyncio.run(_run(args.emp_code, args.password, args.requests, args.concurrency))
+    latencies.sort()
+    rate = len(latencies) / elapsed
+    print(
+        f"p50={statistics.median(latencies):.1f}ms p95={percentile(latencies, 95):.1f}ms "
+        f"p99={percentile(latencies, 99):.1f}ms"
+    )
+    print(f"throughput={rate:.1f} logins/s ({rate / cores:.1f} logins/s per core)")
+
+
+if __name__ == "__main__":
+    main()
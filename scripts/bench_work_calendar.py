@@ -0,0 +1,143 @@
+"""
+Benchmark: working-day range queries via the per-year WorkCalendar versus the
+previous per-call holiday/event queries and day-by-day timedelta loops.
+
+Seeds one year of holidays, restricted holidays and company events into a
+scratch SQLite file, then times random ranges inside the year plus the full
+year (Jan 1 - Dec 31) for:
+  - baseline leave days (Sundays + holidays excluded)
+  - non-working day set (Sundays + holidays + company events)
+Results of both paths are compared on every call.
+
+Usage:
+  python scripts/bench_work_calendar.py --year 2026 --repeat 2000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add project root so app is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+import app.models  # noqa: F401  (register all tables)
+from app.models.event import CompanyEvent
+from app.models.holiday import Holiday, RestrictedHoliday
+from app.services.leave_service import calculate_days_baseline, get_non_working_days_in_range
+from app.services.work_calendar import work_calendar
+
+
+# Previous implementations (one query per call + timedelta loop)
+
+def _holidays_in_range(db, from_date, to_date):
+    rows = db.query(Holiday.date).filter(
+        Holiday.active == True, Holiday.date >= from_date, Holiday.date <= to_date
+    ).all()
+    return {d for (d,) in rows}
+
+
+def _baseline_loop(db, from_date, to_date):
+    holidays = _holidays_in_range(db, from_date, to_date)
+    count, d = 0.0, from_date
+    while d <= to_date:
+        if d.weekday() != 6 and d not in holidays:
+            count += 1.0
+        d += timedelta(days=1)
+    return count
+
+
+def _non_working_loop(db, from_date, to_date):
+    off, d = set(), from_date
+    while d <= to_date:
+        if d.weekday() == 6:
+            off.add(d)
+        d += timedelta(days=1)
+    off |= _holidays_in_range(db, from_date, to_date)
+    events = db.query(CompanyEvent.date).filter(
+        CompanyEvent.year == from_date.year,
+        CompanyEvent.active == True,
+        CompanyEvent.date >= from_date,
+        CompanyEvent.date <= to_date,
+    ).all()
+    off |= {d for (d,) in events}
+    return off
+
+
+def _seed(db, year: int, r: random.Random) -> None:
+    days = [date(year, 1, 1) + timedelta(days=i) for i in range(365)]
+    for d in r.sample(days, 20):
+        db.add(Holiday(year=year, date=d, name=f"Holiday {d}", active=True))
+    for d in r.sample(days, 10):
+        db.add(RestrictedHoliday(year=year, date=d, name=f"RH {d}", active=True))
+    for d in r.sample(days, 12):
+        db.add(CompanyEvent(year=year, date=d, name=f"Event {d}", active=True))
+    db.commit()
+
+
+def _ranges(year: int, repeat: int, r: random.Random):
+    first, last = date(year, 1, 1), date(year, 12, 31)
+    out = [(first, last)]
+    for _ in range(repeat - 1):
+        start = first + timedelta(days=r.randrange(365))
+        out.append((start, min(last, start + timedelta(days=r.randrange(1, 90)))))
+    return out
+
+
+def _time(fn, db, ranges):
+    t0 = time.perf_counter()
+    results = [fn(db, a, b) for a, b in ranges]
+    return (time.perf_counter() - t0) * 1_000_000.0 / len(ranges), results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="WorkCalendar range query benchmark (synthetic SQLite dataset)")
+    parser.add_argument("--year", type=int, default=2026)
+    parser.add_argument("--repeat", type=int, default=2000, help="Ranges per shape (first is the full year)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(prefix="acs_hrms_bench_calendar_", suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        r = random.Random(args.seed)
+        _seed(db, args.year, r)
+        ranges = _ranges(args.year, args.repeat, r)
+
+        t0 = time.perf_counter()
+        work_calendar.invalidate()
+        work_calendar.year(db, args.year)
+        print(f"Built {args.year} calendar in {(time.perf_counter() - t0) * 1000:.2f} ms")
+
+        shapes = [
+            ("baseline leave days", _baseline_loop, calculate_days_baseline),
+            ("non-working day set", _non_working_loop, get_non_working_days_in_range),
+        ]
+        print(f"\n{'shape':24} {'before us':>10} {'after us':>10} {'speedup':>8}")
+        for label, before_fn, after_fn in shapes:
+            before_us, before = _time(before_fn, db, ranges)
+            after_us, after = _time(after_fn, db, ranges)
+            assert before == after, f"{label}: results differ"
+            print(f"{label:24} {before_us:10.1f} {after_us:10.1f} {before_us / max(after_us, 1e-9):7.1f}x")
+
+            full_before, _ = _time(before_fn, db, ranges[:1])
+            full_after, _ = _time(after_fn, db, ranges[:1])
+            print(f"{'  full year':24} {full_before:10.1f} {full_after:10.1f} {full_before / max(full_after, 1e-9):7.1f}x")
+        db.close()
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Rebuild employee_leave_balance_view for a year from leave_balances.
+
+The view is refreshed on every balance and employee write made through the
+application; run this after bulk imports or raw SQL edits of leave_balances,
+or to repair drift.
+
+Usage (from hrms-backend folder, with .env loaded):
+
+    python scripts/rebuild_balance_view.py 2026
+
+Safe to run multiple times (idempotent, single transaction).
+"""
+
+from pathlib import Path
+
+import sys
+import time
+
+
+# Ensure app package is importable when script is run directly
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.session import SessionLocal
+from app.services.balance_view_service import refresh_balance_view
+
+
+def main() -> None:
+    if len(sys.argv) != 2 or not sys.argv[1].isdigit():
+        print("Usage: python scripts/rebuild_balance_view.py <year>")
+        sys.exit(1)
+    year = int(sys.argv[1])
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        rows = refresh_balance_view(db, year)
+        db.commit()
+        print(f"employee_leave_balance_view {year} rebuilt: {rows} rows in {time.perf_counter() - started:.2f}s")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Rebuild employee_hierarchy_closure from employees.reporting_manager_id.
+
+The table is maintained on every employee write; run this after bulk imports
+or raw SQL edits of reporting_manager_id, or to repair drift.
+
+Usage (from hrms-backend folder, with .env loaded):
+
+    python scripts/rebuild_hierarchy_closure.py
+
+Safe to run multiple times (idempotent, single transaction).
+"""
+
+from pathlib import Path
+
+import sys
+import time
+
+
+# Ensure app package is importable when script is run directly
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.session import SessionLocal
+from app.services.hierarchy_service import rebuild_closure
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        rows = rebuild_closure(db)
+        db.commit()
+        print(f"employee_hierarchy_closure rebuilt: {rows} rows in {time.perf_counter() - started:.2f}s")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Rebuild leave_request_month_days from leave_requests.computed_days_by_month.
+
+The table is maintained on every leave write; run this after bulk imports
+or raw SQL edits of computed_days_by_month, or to repair drift.
+
+Usage (from hrms-backend folder, with .env loaded):
+
+    python scripts/rebuild_leave_month_days.py
+
+Safe to run multiple times (idempotent, single transaction).
+"""
+
+from pathlib import Path
+
+import sys
+import time
+
+
+# Ensure app package is importable when script is run directly
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.session import SessionLocal
+from app.services.leave_month_days import rebuild_month_days
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        rows = rebuild_month_days(db)
+        db.commit()
+        print(f"leave_request_month_days rebuilt: {rows} rows in {time.perf_counter() - started:.2f}s")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
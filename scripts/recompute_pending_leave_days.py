@@ -0,0 +1,51 @@
+"""
+Recompute computed_days of PENDING leaves against the current holiday calendar.
+
+Run after holidays or company events were added, deactivated or moved for a
+year that already has pending leave requests (approval uses computed_days).
+Same job as POST /api/v1/admin/leaves/recompute-days?year=YYYY.
+
+Usage (from hrms-backend folder, with .env loaded):
+
+    python scripts/recompute_pending_leave_days.py --year 2026
+
+Safe to run multiple times (rows already in step are left unchanged).
+"""
+
+from pathlib import Path
+
+import argparse
+import json
+import sys
+import time
+
+
+# Ensure app package is importable when script is run directly
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.session import SessionLocal
+from app.services.leave_service import recompute_pending_leave_days
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute computed_days of PENDING leaves for a year")
+    parser.add_argument("--year", type=int, required=True)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        summary = recompute_pending_leave_days(db, args.year)
+        print(json.dumps(summary, indent=2))
+        print(f"Done in {time.perf_counter() - started:.2f}s")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()